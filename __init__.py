@@ -7,8 +7,9 @@ if vendor_dir not in sys.path:
     sys.path.insert(0, vendor_dir)
 
 
-from .inaturalist import Inaturalist
-
-
 def classFactory(iface):
+    # Imported here so worker processes can import the pure modules of the
+    # package without loading Qt and QGIS.
+    from .inaturalist import Inaturalist
+
     return Inaturalist(iface)
@@ -0,0 +1,49 @@
+import threading
+from typing import Callable, List
+
+
+class CancellationToken:
+    """
+    Thread-safe cancellation flag shared by a fetch and everything it drives.
+
+    Waiting on the token returns as soon as it is cancelled, and registered
+    callbacks run immediately on cancellation so blocking work (open
+    connections, sleeps) can be interrupted from another thread.
+    """
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: List[Callable[[], None]] = []
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks = list(self._callbacks)
+            self._callbacks.clear()
+
+        for callback in callbacks:
+            callback()
+
+    def add_callback(self, callback: Callable[[], None]) -> None:
+        """Register a callback to run on cancellation, or run it now if cancelled."""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def remove_callback(self, callback: Callable[[], None]) -> None:
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def wait(self, timeout: float) -> bool:
+        """Block for up to timeout seconds; return True if cancelled meanwhile."""
+        return self._event.wait(timeout)
@@ -0,0 +1,120 @@
+import time
+from typing import Dict, List, Tuple
+
+from PyQt5.QtCore import QVariant
+from qgis.core import (
+    QgsFeature,
+    QgsField,
+    QgsGeometry,
+    QgsMarkerSymbol,
+    QgsPalLayerSettings,
+    QgsPointXY,
+    QgsProperty,
+    QgsRuleBasedRenderer,
+    QgsVectorLayer,
+    QgsVectorLayerSimpleLabeling,
+)
+
+from .cluster_pyramid import ClusterPyramid
+
+
+class ClusterLayer:
+    """
+    Memory layer drawing a cluster pyramid with one rule per zoom level.
+
+    Clusters are shown while zoomed out and the raw observation layer takes
+    over once the map is zoomed in past the deepest pyramid level.
+    """
+
+    def __init__(self, pyramid: ClusterPyramid) -> None:
+        self.pyramid = pyramid
+        self.feature_ids: Dict[Tuple[int, Tuple[int, int]], int] = {}
+
+        layer_name = "inat_clusters_" + time.strftime("%Y-%m-%d_%H:%M:%S")
+        self.layer = QgsVectorLayer("Point?crs=EPSG:4326", layer_name, "memory")
+        self.layer.dataProvider().addAttributes(
+            [
+                QgsField("level", QVariant.Int),
+                QgsField("count", QVariant.Int),
+            ]
+        )
+        self.layer.updateFields()
+        self.count_index = self.layer.fields().indexOf("count")
+        self.apply_renderer()
+
+    @property
+    def points_min_scale(self) -> float:
+        """Most zoomed-out scale at which raw points should be drawn."""
+        return ClusterPyramid.level_scale_range(self.pyramid.max_level)[1]
+
+    def apply_renderer(self) -> None:
+        root_rule = QgsRuleBasedRenderer.Rule(None)
+        for level in range(self.pyramid.max_level + 1):
+            zoomed_out_scale, zoomed_in_scale = ClusterPyramid.level_scale_range(level)
+            symbol = QgsMarkerSymbol.createSimple(
+                {
+                    "name": "circle",
+                    "color": "255,127,0,200",
+                    "outline_color": "255,255,255",
+                }
+            )
+            symbol.setDataDefinedSize(
+                QgsProperty.fromExpression('scale_exp("count", 1, 10000, 3, 14, 0.57)')
+            )
+            root_rule.appendChild(
+                QgsRuleBasedRenderer.Rule(
+                    symbol,
+                    zoomed_in_scale,
+                    zoomed_out_scale,
+                    f'"level" = {level}',
+                    f"Level {level}",
+                )
+            )
+        self.layer.setRenderer(QgsRuleBasedRenderer(root_rule))
+
+        label_settings = QgsPalLayerSettings()
+        label_settings.fieldName = "count"
+        label_settings.placement = QgsPalLayerSettings.OverPoint
+        self.layer.setLabeling(QgsVectorLayerSimpleLabeling(label_settings))
+        self.layer.setLabelsEnabled(True)
+
+    def hide_when_zoomed_out(self, points_layer: QgsVectorLayer) -> None:
+        """Only draw the raw observation layer once clusters stop being drawn."""
+        points_layer.setScaleBasedVisibility(True)
+        points_layer.setMinimumScale(self.points_min_scale)
+
+    def add_points(self, points: List[QgsPointXY]) -> None:
+        for point in points:
+            self.pyramid.add(point.x(), point.y())
+
+    def update(self) -> None:
+        """Write clusters changed since the last update to the layer."""
+        provider = self.layer.dataProvider()
+        new_features: List[QgsFeature] = []
+        new_keys: List[Tuple[int, Tuple[int, int]]] = []
+        attribute_changes: Dict[int, Dict[int, int]] = {}
+        geometry_changes: Dict[int, QgsGeometry] = {}
+
+        for cluster in self.pyramid.pop_dirty():
+            geometry = QgsGeometry.fromPointXY(QgsPointXY(cluster.x, cluster.y))
+            feature_id = self.feature_ids.get((cluster.level, cluster.key))
+            if feature_id is None:
+                feature = QgsFeature(self.layer.fields())
+                feature.setGeometry(geometry)
+                feature.setAttributes([cluster.level, cluster.count])
+                new_features.append(feature)
+                new_keys.append((cluster.level, cluster.key))
+            else:
+                attribute_changes[feature_id] = {self.count_index: cluster.count}
+                geometry_changes[feature_id] = geometry
+
+        if attribute_changes:
+            provider.changeAttributeValues(attribute_changes)
+            provider.changeGeometryValues(geometry_changes)
+        if new_features:
+            _, added_features = provider.addFeatures(new_features)
+            for key, feature in zip(new_keys, added_features):
+                self.feature_ids[key] = feature.id()
+
+        self.layer.updateExtents()
+        self.layer.triggerRepaint()
@@ -0,0 +1,113 @@
+import math
+from array import array
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Set, Tuple
+
+# Scale denominator of zoom level 0 in the usual web map tiling scheme.
+ZOOM_0_SCALE = 559082264.0
+
+
+@dataclass(frozen=True)
+class Cluster:
+    level: int
+    key: Tuple[int, int]
+    x: float
+    y: float
+    count: int
+
+
+class ClusterLevel:
+    """Per-cell counters and coordinate sums for a single pyramid level."""
+
+    def __init__(self) -> None:
+        self.index: Dict[Tuple[int, int], int] = {}
+        self.counts = array("I")
+        self.sum_x = array("d")
+        self.sum_y = array("d")
+
+    def add(self, key: Tuple[int, int], x: float, y: float) -> None:
+        position = self.index.get(key)
+        if position is None:
+            position = len(self.counts)
+            self.index[key] = position
+            self.counts.append(0)
+            self.sum_x.append(0.0)
+            self.sum_y.append(0.0)
+
+        self.counts[position] += 1
+        self.sum_x[position] += x
+        self.sum_y[position] += y
+
+
+class ClusterPyramid:
+    """
+    Grid-based multi-resolution cluster pyramid built incrementally from points.
+
+    Level ``z`` splits the world into ``2 ** z * cells_per_tile`` columns, so
+    each level matches a web map zoom level. Clusters are placed at the mean
+    position of their points.
+    """
+
+    def __init__(
+        self,
+        max_level: int = 12,
+        world_size: float = 360.0,
+        origin: Tuple[float, float] = (-180.0, -90.0),
+        cells_per_tile: int = 4,
+    ) -> None:
+        self.max_level = max_level
+        self.world_size = world_size
+        self.origin = origin
+        self.cells_per_tile = cells_per_tile
+        self.levels: List[ClusterLevel] = [ClusterLevel() for _ in range(max_level + 1)]
+        self._dirty: List[Set[Tuple[int, int]]] = [set() for _ in range(max_level + 1)]
+
+    def cell_size(self, level: int) -> float:
+        return self.world_size / (2**level * self.cells_per_tile)
+
+    def cell_key(self, level: int, x: float, y: float) -> Tuple[int, int]:
+        size = self.cell_size(level)
+        return (
+            math.floor((x - self.origin[0]) / size),
+            math.floor((y - self.origin[1]) / size),
+        )
+
+    def add(self, x: float, y: float) -> None:
+        """Add one point to every level of the pyramid."""
+        for level, cluster_level in enumerate(self.levels):
+            key = self.cell_key(level, x, y)
+            cluster_level.add(key, x, y)
+            self._dirty[level].add(key)
+
+    def cluster(self, level: int, key: Tuple[int, int]) -> Cluster:
+        cluster_level = self.levels[level]
+        position = cluster_level.index[key]
+        count = cluster_level.counts[position]
+        return Cluster(
+            level=level,
+            key=key,
+            x=cluster_level.sum_x[position] / count,
+            y=cluster_level.sum_y[position] / count,
+            count=count,
+        )
+
+    def clusters(self, level: int) -> Iterator[Cluster]:
+        """Yield every cluster of the given level."""
+        for key in self.levels[level].index:
+            yield self.cluster(level, key)
+
+    def pop_dirty(self) -> Iterator[Cluster]:
+        """Yield clusters changed since the last call and reset the change set."""
+        for level, keys in enumerate(self._dirty):
+            for key in keys:
+                yield self.cluster(level, key)
+            keys.clear()
+
+    @staticmethod
+    def level_scale_range(level: int) -> Tuple[float, float]:
+        """
+        Return the (zoomed-out, zoomed-in) scale denominators for a level.
+
+        A level is drawn while the map scale lies between both values.
+        """
+        return (ZOOM_0_SCALE / 2**level, ZOOM_0_SCALE / 2 ** (level + 1))
@@ -1,5 +1,96 @@
+API_ROOT_URL = "https://api.inaturalist.org"
 API_OBSERVATIONS_BASE_URL = "https://api.inaturalist.org/v1/observations"
+API_OBSERVATIONS_V2_URL = "https://api.inaturalist.org/v2/observations"
 API_PLACES_BASE_URL = "https://api.inaturalist.org/v1/places/autocomplete"
+API_SPECIES_COUNTS_URL = "https://api.inaturalist.org/v1/observations/species_counts"
 API_BATCH_SIZE = 200
 API_DEFAULT_TIMEOUT = 10
 API_MAX_TOTAL_RECORDS = 200000
+
+OUTPUT_MODE_POINTS = "Points"
+OUTPUT_MODE_HEX_GRID = "Hexagonal grid"
+OUTPUT_MODE_SQUARE_GRID = "Square grid"
+OUTPUT_MODE_SPECIES_COUNTS = "Species counts (table)"
+OUTPUT_MODE_HISTOGRAM = "Histogram (table)"
+GRID_DEFAULT_CELL_SIZE = 10000
+GRID_DEFAULT_CRS = "EPSG:3857"
+CLUSTER_MAX_LEVEL = 12
+API_MIN_REQUEST_INTERVAL = 1.1
+API_REQUEST_INTERVAL_JITTER = 0.4
+API_TAXA_AUTOCOMPLETE_URL = "https://api.inaturalist.org/v1/taxa/autocomplete"
+API_USERS_AUTOCOMPLETE_URL = "https://api.inaturalist.org/v1/users/autocomplete"
+CACHE_FILENAME = "inaturalist_cache.sqlite"
+RESOLVER_CACHE_TTL = 30 * 24 * 60 * 60
+LIVE_EXTENT_DEBOUNCE_MS = 600
+LIVE_EXTENT_MAX_TILES = 16
+LIVE_EXTENT_MAX_PAGES_PER_TILE = 5
+LIVE_EXTENT_TILE_CACHE_SIZE = 2048
+LIVE_EXTENT_MESSAGE_SECONDS = 8
+WAREHOUSE_FILENAME = "observations.gpkg"
+WAREHOUSE_FRESHNESS_SECONDS = 24 * 60 * 60
+WAREHOUSE_RETENTION_SECONDS = 90 * 24 * 60 * 60
+API_USER_AGENT = (
+    "qgis-inaturalist-api (+https://github.com/javikalsan/qgis-inaturalist-api)"
+)
+API_POOL_MAXSIZE = 10
+API_BASE_URL_ENV = "INATURALIST_API_URL"
+POLYGON_FILTER_MAX_BOXES = 16
+POLYGON_FILTER_MAX_DEPTH = 6
+QUALITY_GRADES = {
+    "Any": None,
+    "Research": "research",
+    "Needs ID": "needs_id",
+    "Verifiable": "research,needs_id",
+    "Casual": "casual",
+}
+GEOPRIVACY_OPTIONS = {
+    "Any": None,
+    "Open": "open",
+    "Obscured": "obscured",
+    "Open or obscured": "open,obscured",
+}
+ICONIC_TAXA = (
+    "Actinopterygii",
+    "Amphibia",
+    "Animalia",
+    "Arachnida",
+    "Aves",
+    "Chromista",
+    "Fungi",
+    "Insecta",
+    "Mammalia",
+    "Mollusca",
+    "Plantae",
+    "Protozoa",
+    "Reptilia",
+)
+API_SPECIES_COUNTS_BATCH_SIZE = 500
+RESPONSE_CACHE_TTL = 6 * 60 * 60
+PREVIEW_DEFAULT_SAMPLE_SIZE = 400
+PREVIEW_TIME_STRATA = 4
+API_MAX_IDS_PER_REQUEST = 200
+LIGHTWEIGHT_FIELDS = "id,geojson,observed_on,taxon.id,taxon.name"
+DETAILS_CACHE_TTL = 7 * 24 * 60 * 60
+API_TAXA_URL = "https://api.inaturalist.org/v1/taxa"
+API_MAX_TAXA_PER_REQUEST = 30
+TAXONOMY_CACHE_TTL = 90 * 24 * 60 * 60
+ID_LIST_FIELD_NAMES = ("observation_id", "id", "inat_id", "catalogNumber")
+MISSING_IDS_SHOWN = 20
+DECODE_POOL_WORKERS = 2
+SHARED_QUOTA_FILENAME = "inaturalist_quota.sqlite"
+SHARED_QUOTA_DIR_ENV = "INATURALIST_SHARED_QUOTA_DIR"
+SHARED_QUOTA_DIR_SETTING = "inaturalist/shared_quota_dir"
+SHARED_QUOTA_RATE = 1 / API_MIN_REQUEST_INTERVAL
+SHARED_QUOTA_BURST = 3
+API_RECORD_CASSETTE_ENV = "INATURALIST_RECORD_CASSETTE"
+API_REPLAY_CASSETTE_ENV = "INATURALIST_REPLAY_CASSETTE"
+API_REPLAY_LATENCY_ENV = "INATURALIST_REPLAY_LATENCY"
+API_MAX_IDS_PER_FILTER = 200
+LIST_CSV_COLUMNS = {
+    "species": ("species", "taxon", "taxon_name", "scientific_name", "scientificName"),
+    "users": ("user", "username", "user_login", "login"),
+    "places": ("place", "place_name", "place_id"),
+}
+API_HISTOGRAM_URL = "https://api.inaturalist.org/v1/observations/histogram"
+HISTOGRAM_DATE_FIELD = "observed"
+HISTOGRAM_INTERVALS = {"Year": "year", "Month": "month", "Week": "week", "Day": "day"}
@@ -0,0 +1,71 @@
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from .constants import DECODE_POOL_WORKERS
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def python_executable() -> Optional[str]:
+    """
+    Return a Python interpreter able to run the worker processes.
+
+    Inside QGIS, sys.executable is usually the QGIS binary rather than
+    Python, so the interpreter next to the embedded standard library is
+    looked up instead.
+    """
+    if os.path.basename(sys.executable).lower().startswith("python"):
+        return sys.executable
+
+    if sys.platform == "win32":
+        candidates = ("pythonw.exe", "python.exe", "python3.exe")
+    else:
+        candidates = (
+            os.path.join("bin", f"python{sys.version_info[0]}.{sys.version_info[1]}"),
+            os.path.join("bin", "python3"),
+            os.path.join("bin", "python"),
+        )
+    for candidate in candidates:
+        path = os.path.join(sys.exec_prefix, candidate)
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def get_decode_pool() -> ProcessPoolExecutor:
+    """
+    Return the shared pool of page decoding processes, starting it on first use.
+
+    Raises:
+        RuntimeError: If no Python interpreter is found for the workers
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            executable = python_executable()
+            if executable is None:
+                raise RuntimeError(
+                    "No Python interpreter found to start worker processes."
+                )
+            # Spawned workers start from a clean interpreter rather than a
+            # fork of the QGIS process.
+            context = multiprocessing.get_context("spawn")
+            context.set_executable(executable)
+            _pool = ProcessPoolExecutor(
+                max_workers=DECODE_POOL_WORKERS, mp_context=context
+            )
+        return _pool
+
+
+def shutdown_decode_pool() -> None:
+    """Stop the worker processes, e.g. when the plugin is unloaded."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
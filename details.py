@@ -0,0 +1,141 @@
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from PyQt5.QtCore import QObject, QThread, pyqtSignal
+from qgis.core import QgsFeatureRequest, QgsVectorLayer
+
+from .cancellation import CancellationToken
+from .details_fetcher import DetailsFetcher
+from .exceptions import FetchCancelledError
+from .http_client import HTTPClient
+from .persistent_cache import PersistentCache
+from .qgis_layer_helper import QgisLayerHelper
+from .rate_limiter import RateLimiter
+from .settings import api_rate_limiter
+
+
+class FetchDetailsThread(QThread):
+    details_fetched = pyqtSignal(dict)
+    fetch_failed = pyqtSignal(str)
+
+    def __init__(
+        self,
+        observation_ids: List[int],
+        cache: PersistentCache,
+        rate_limiter: RateLimiter,
+        cancellation_token: CancellationToken,
+    ) -> None:
+        super().__init__()
+        self.observation_ids = observation_ids
+        self.fetcher = DetailsFetcher(cache)
+        self.rate_limiter = rate_limiter
+        self.cancellation_token = cancellation_token
+
+    def run(self) -> None:
+        try:
+            with HTTPClient(cancellation_token=self.cancellation_token) as client:
+                self.fetcher.fetch(
+                    client,
+                    self.observation_ids,
+                    self.emit_details,
+                    before_request=self.wait_for_rate_limit,
+                )
+        except FetchCancelledError:
+            return
+        except Exception as e:
+            self.fetch_failed.emit(f"Error: {str(e)}")
+
+    def wait_for_rate_limit(self) -> None:
+        if not self.rate_limiter.wait(self.cancellation_token):
+            raise FetchCancelledError("Fetch cancelled.")
+
+    def emit_details(self, details: Dict[int, Dict[str, Any]]) -> None:
+        if self.cancellation_token.is_cancelled:
+            raise FetchCancelledError("Fetch cancelled.")
+        self.details_fetched.emit(details)
+
+
+class DetailLoader(QObject):
+    """
+    Fills the detail columns of a lightweight layer for selected features.
+
+    Details are fetched in id-list batches the size of the API limit and
+    kept in the persistent cache, so reselecting features is free.
+    """
+
+    def __init__(
+        self,
+        layer: QgsVectorLayer,
+        cache: PersistentCache,
+        layer_helper: QgisLayerHelper,
+        on_fetch_failed: Callable[[str], None],
+    ) -> None:
+        super().__init__()
+        self.layer = layer
+        self.cache = cache
+        self.layer_helper = layer_helper
+        self.on_fetch_failed = on_fetch_failed
+        self.rate_limiter = api_rate_limiter()
+        self.cancellation_token = CancellationToken()
+        self.thread: Optional[FetchDetailsThread] = None
+        self.pending_ids: Set[int] = set()
+        self.feature_ids: Dict[int, List[int]] = {}
+
+        self.layer.selectionChanged.connect(self.on_selection_changed)
+        self.layer.willBeDeleted.connect(self.stop)
+
+    def stop(self) -> None:
+        self.cancellation_token.cancel()
+        try:
+            self.layer.selectionChanged.disconnect(self.on_selection_changed)
+        except TypeError:
+            pass
+
+    @property
+    def is_stopped(self) -> bool:
+        return self.cancellation_token.is_cancelled
+
+    def on_selection_changed(self, selected: List[int], *_) -> None:
+        if not selected or self.cancellation_token.is_cancelled:
+            return
+
+        request = QgsFeatureRequest().setFilterFids(selected)
+        request.setSubsetOfAttributes(
+            ["observation_id", "photo_url"], self.layer.fields()
+        )
+        request.setFlags(QgsFeatureRequest.NoGeometry)
+        for feature in self.layer.getFeatures(request):
+            observation_id = feature["observation_id"]
+            # Loaded details are never NULL; missing values are stored as N/A.
+            if not observation_id or feature["photo_url"]:
+                continue
+            self.feature_ids.setdefault(observation_id, []).append(feature.id())
+            self.pending_ids.add(observation_id)
+
+        self.load_pending()
+
+    def load_pending(self) -> None:
+        if not self.pending_ids:
+            return
+        if self.thread is not None and self.thread.isRunning():
+            return
+
+        self.thread = FetchDetailsThread(
+            sorted(self.pending_ids),
+            self.cache,
+            self.rate_limiter,
+            self.cancellation_token,
+        )
+        self.pending_ids = set()
+        self.thread.details_fetched.connect(self.on_details_fetched)
+        self.thread.fetch_failed.connect(self.on_fetch_failed)
+        self.thread.finished.connect(self.load_pending)
+        self.thread.start()
+
+    def on_details_fetched(self, details: Dict[int, Dict[str, Any]]) -> None:
+        if self.cancellation_token.is_cancelled:
+            return
+        feature_ids = {
+            observation_id: self.feature_ids.pop(observation_id, [])
+            for observation_id in details
+        }
+        self.layer_helper.update_observation_details(self.layer, feature_ids, details)
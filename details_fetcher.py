@@ -0,0 +1,76 @@
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .batching import chunked
+from .constants import API_MAX_IDS_PER_REQUEST, API_OBSERVATIONS_BASE_URL
+from .http_client import HTTPClient
+from .observation_parser import ObservationParser
+from .persistent_cache import PersistentCache
+
+DETAILS_CACHE_NAMESPACE = "observation_details"
+
+
+class DetailsFetcher:
+    """
+    Looks up the detail columns of observations by id.
+
+    Cached details are returned first; the rest are fetched with one id-list
+    request per chunk of the API limit and cached, so each observation is
+    requested once across all runs.
+    """
+
+    def __init__(self, cache: PersistentCache) -> None:
+        self.cache = cache
+
+    def fetch(
+        self,
+        client: HTTPClient,
+        observation_ids: Iterable[int],
+        on_details_fetched: Callable[[Dict[int, Dict[str, Any]]], None],
+        before_request: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """
+        Pass the details of observation_ids to on_details_fetched.
+
+        Args:
+            client: HTTP client used for observations not in the cache
+            observation_ids: Ids of the observations to look up
+            on_details_fetched: Called with the cached details, then per chunk
+            before_request: Called before each request, e.g. to rate limit
+        """
+        observation_ids = sorted(set(observation_ids))
+        cached = self.cache.get_many(
+            DETAILS_CACHE_NAMESPACE, [str(id_) for id_ in observation_ids]
+        )
+        if cached:
+            on_details_fetched({int(key): value for key, value in cached.items()})
+
+        missing = [id_ for id_ in observation_ids if str(id_) not in cached]
+        for chunk in chunked(missing, API_MAX_IDS_PER_REQUEST):
+            if before_request is not None:
+                before_request()
+            details = self.fetch_details(client, chunk)
+            self.cache.set_many(
+                DETAILS_CACHE_NAMESPACE,
+                [(str(key), value) for key, value in details.items()],
+            )
+            on_details_fetched(details)
+
+    @staticmethod
+    def fetch_details(
+        client: HTTPClient, observation_ids: List[int]
+    ) -> Dict[int, Dict[str, Any]]:
+        response_data = client.get(
+            API_OBSERVATIONS_BASE_URL,
+            params={
+                "id": ",".join(str(id_) for id_ in observation_ids),
+                "per_page": len(observation_ids),
+            },
+        )
+        details = {
+            observation["id"]: ObservationParser.parse_details(observation)
+            for observation in response_data.get("results", [])
+        }
+        # Deleted or hidden observations still get a value so they are not retried.
+        for observation_id in observation_ids:
+            details.setdefault(observation_id, {})
+        return details
@@ -14,3 +14,9 @@ class PlacesFetchError(InaturalistAPIError):
     """Raised when fetching places fails."""
 
     pass
+
+
+class FetchCancelledError(InaturalistAPIError):
+    """Raised when a request is interrupted by cancellation."""
+
+    pass
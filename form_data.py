@@ -1,6 +1,7 @@
 from dataclasses import dataclass
 from datetime import date
-from typing import Any, Dict, Optional
+from itertools import product
+from typing import Any, Dict, List, Optional, Sequence
 
 
 @dataclass
@@ -12,23 +13,83 @@ class FormData:
     country_id: Optional[int]
     bbox: Optional[Dict[str, float]]
     positional_accuracy_below_meters: Optional[int] = None
+    taxon_id: Optional[int] = None
+    user_numeric_id: Optional[int] = None
+    quality_grade: Optional[str] = None
+    photos: Optional[bool] = None
+    iconic_taxa: Optional[List[str]] = None
+    captive: Optional[bool] = None
+    geoprivacy: Optional[str] = None
+    taxon_ids: Optional[List[int]] = None
+    user_ids: Optional[List[int]] = None
+    place_ids: Optional[List[int]] = None
 
     def build(self) -> Dict[str, Any]:
         """Build API parameters from form data, filtering out empty values."""
         api_params: Dict[str, Any] = {
             "d1": self.date_from,
             "d2": self.date_to,
+            # Observations without coordinates are never turned into features.
+            "geo": "true",
+            "quality_grade": self.quality_grade,
+            "geoprivacy": self.geoprivacy,
         }
-        if self.username != "":
-            api_params.update({"user_id": self.username})
-        if self.species != "":
-            api_params.update({"taxon_name": self.species})
-        if self.country_id:
+        if self.username != "" and not self.user_ids:
+            api_params.update({"user_id": self.user_numeric_id or self.username})
+        if self.species != "" and not self.taxon_ids:
+            if self.taxon_id:
+                api_params.update({"taxon_id": self.taxon_id})
+            else:
+                api_params.update({"taxon_name": self.species})
+        if self.country_id and not self.place_ids:
             api_params.update({"place_id": self.country_id})
         if self.bbox is not None:
             api_params.update(self.bbox)
         if self.positional_accuracy_below_meters is not None:
-            api_params.update(
-                {"acc_below": self.positional_accuracy_below_meters}
-            )
+            api_params.update({"acc_below": self.positional_accuracy_below_meters})
+        if self.photos is not None:
+            api_params.update({"photos": "true" if self.photos else "false"})
+        if self.captive is not None:
+            api_params.update({"captive": "true" if self.captive else "false"})
+        if self.iconic_taxa:
+            api_params.update({"iconic_taxa": ",".join(self.iconic_taxa)})
+        api_params.update(
+            {key: join_ids(ids) for key, ids in self.id_lists().items() if ids}
+        )
         return {key: value for key, value in api_params.items() if value is not None}
+
+    def build_queries(self, max_ids: int) -> List[Dict[str, Any]]:
+        """
+        Build the queries whose union is the form query.
+
+        Species, user and place lists are packed into comma-separated id
+        parameters of at most max_ids ids each; every combination of packed
+        lists is one query.
+        """
+        if max_ids < 1:
+            raise ValueError("At least one id per parameter is required.")
+        api_params = self.build()
+        packed = {
+            key: [
+                join_ids(ids[start : start + max_ids])
+                for start in range(0, len(ids), max_ids)
+            ]
+            for key, ids in self.id_lists().items()
+            if ids
+        }
+        return [
+            {**api_params, **dict(zip(packed, values))}
+            for values in product(*packed.values())
+        ]
+
+    def id_lists(self) -> Dict[str, Optional[List[int]]]:
+        """Return the id lists by the API parameter they replace."""
+        return {
+            "taxon_id": self.taxon_ids,
+            "user_id": self.user_ids,
+            "place_id": self.place_ids,
+        }
+
+
+def join_ids(ids: Sequence[int]) -> str:
+    return ",".join(str(id_) for id_ in ids)
@@ -0,0 +1,169 @@
+import math
+from array import array
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+SQRT3 = math.sqrt(3)
+
+
+@dataclass(frozen=True)
+class GridCell:
+    polygon: List[Tuple[float, float]]
+    count: int
+    species_count: int
+    date_from: Optional[str]
+    date_to: Optional[str]
+
+
+class GridAggregator:
+    """
+    Bins observations into a hexagonal or square grid while they stream in.
+
+    Only per-cell counters are kept, so memory grows with the number of
+    occupied cells instead of the number of observations.
+    """
+
+    SHAPES = ("hex", "square")
+
+    def __init__(self, cell_size: float, shape: str = "hex") -> None:
+        if cell_size <= 0:
+            raise ValueError("Grid cell size must be greater than zero.")
+        if shape not in self.SHAPES:
+            raise ValueError(f"Unsupported grid shape: {shape}")
+
+        self.cell_size = cell_size
+        self.shape = shape
+        # Hexagons are pointy-top; cell_size is the distance between the
+        # centers of two neighbouring cells.
+        self.hex_radius = cell_size / SQRT3
+
+        self.observation_count = 0
+        self._cell_index: Dict[Tuple[int, int], int] = {}
+        self._counts = array("I")
+        self._first_day = array("i")
+        self._last_day = array("i")
+        self._species: List[Set[int]] = []
+        self._species_index: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def add(
+        self,
+        x: float,
+        y: float,
+        species: Optional[str] = None,
+        observed_on: Optional[str] = None,
+    ) -> None:
+        """Count one observation located at (x, y) in the grid CRS."""
+        key = self.cell_key(x, y)
+        index = self._cell_index.get(key)
+        if index is None:
+            index = len(self._counts)
+            self._cell_index[key] = index
+            self._counts.append(0)
+            self._first_day.append(0)
+            self._last_day.append(0)
+            self._species.append(set())
+
+        self._counts[index] += 1
+        self.observation_count += 1
+
+        if species:
+            species_id = self._species_index.setdefault(
+                species, len(self._species_index)
+            )
+            self._species[index].add(species_id)
+
+        day = self.parse_day(observed_on)
+        if day:
+            if not self._first_day[index] or day < self._first_day[index]:
+                self._first_day[index] = day
+            if day > self._last_day[index]:
+                self._last_day[index] = day
+
+    def cell_key(self, x: float, y: float) -> Tuple[int, int]:
+        """Return the integer (column, row) key of the cell containing (x, y)."""
+        if self.shape == "square":
+            return (
+                math.floor(x / self.cell_size),
+                math.floor(y / self.cell_size),
+            )
+        return self.hex_round(
+            (SQRT3 / 3 * x - y / 3) / self.hex_radius,
+            (2 / 3 * y) / self.hex_radius,
+        )
+
+    def cell_polygon(self, key: Tuple[int, int]) -> List[Tuple[float, float]]:
+        """Return the closed ring of vertices outlining the cell."""
+        column, row = key
+        if self.shape == "square":
+            x_min = column * self.cell_size
+            y_min = row * self.cell_size
+            x_max = x_min + self.cell_size
+            y_max = y_min + self.cell_size
+            return [
+                (x_min, y_min),
+                (x_max, y_min),
+                (x_max, y_max),
+                (x_min, y_max),
+                (x_min, y_min),
+            ]
+
+        center_x = self.hex_radius * SQRT3 * (column + row / 2)
+        center_y = self.hex_radius * 1.5 * row
+        ring = []
+        for corner in range(6):
+            angle = math.radians(60 * corner - 30)
+            ring.append(
+                (
+                    center_x + self.hex_radius * math.cos(angle),
+                    center_y + self.hex_radius * math.sin(angle),
+                )
+            )
+        ring.append(ring[0])
+        return ring
+
+    def cells(self) -> Iterator[GridCell]:
+        """Yield every occupied cell with its aggregated counters."""
+        for key, index in self._cell_index.items():
+            yield GridCell(
+                polygon=self.cell_polygon(key),
+                count=self._counts[index],
+                species_count=len(self._species[index]),
+                date_from=self.format_day(self._first_day[index]),
+                date_to=self.format_day(self._last_day[index]),
+            )
+
+    @staticmethod
+    def hex_round(q: float, r: float) -> Tuple[int, int]:
+        """Round fractional axial hex coordinates to the nearest cell."""
+        s = -q - r
+        rounded_q, rounded_r, rounded_s = round(q), round(r), round(s)
+        q_diff = abs(rounded_q - q)
+        r_diff = abs(rounded_r - r)
+        s_diff = abs(rounded_s - s)
+
+        if q_diff > r_diff and q_diff > s_diff:
+            rounded_q = -rounded_r - rounded_s
+        elif r_diff > s_diff:
+            rounded_r = -rounded_q - rounded_s
+
+        return (int(rounded_q), int(rounded_r))
+
+    @staticmethod
+    def parse_day(observed_on: Optional[str]) -> int:
+        """Convert an ISO date string to a day ordinal, or 0 if unknown."""
+        if not observed_on:
+            return 0
+        try:
+            return date.fromisoformat(str(observed_on)[:10]).toordinal()
+        except ValueError:
+            return 0
+
+    @staticmethod
+    def format_day(day: int) -> Optional[str]:
+        if not day:
+            return None
+        return date.fromordinal(day).isoformat()
@@ -1,30 +1,125 @@
-from typing import Any, Dict, Optional
+import os
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
+from urllib.parse import urlencode
 
 import requests
 
-from .constants import API_DEFAULT_TIMEOUT
-from .exceptions import InaturalistAPIError
+from .cancellation import CancellationToken
+from .constants import (
+    API_BASE_URL_ENV,
+    API_DEFAULT_TIMEOUT,
+    API_POOL_MAXSIZE,
+    API_RECORD_CASSETTE_ENV,
+    API_REPLAY_CASSETTE_ENV,
+    API_REPLAY_LATENCY_ENV,
+    API_ROOT_URL,
+    API_USER_AGENT,
+)
+from .exceptions import FetchCancelledError, InaturalistAPIError
+from .transport import (
+    AnyTransport,
+    RecordingTransport,
+    ReplayTransport,
+    RequestHandle,
+    Transport,
+)
+
+if TYPE_CHECKING:
+    from .persistent_cache import PersistentCache
+
+RESPONSE_CACHE_NAMESPACE = "responses"
+
+_transport: Optional[AnyTransport] = None
+_transport_lock = threading.Lock()
+
+
+def create_transport() -> AnyTransport:
+    """
+    Build the transport configured by the environment.
+
+    A replay cassette serves recorded responses offline, optionally with
+    the recorded latency scaled by the latency variable; a record cassette
+    keeps every real response. Otherwise requests go to the live API.
+    """
+    replay_path = os.environ.get(API_REPLAY_CASSETTE_ENV)
+    if replay_path:
+        return ReplayTransport(
+            replay_path,
+            latency_scale=float(os.environ.get(API_REPLAY_LATENCY_ENV) or 0),
+        )
+
+    transport = Transport(
+        API_ROOT_URL,
+        base_url=os.environ.get(API_BASE_URL_ENV),
+        user_agent=API_USER_AGENT,
+        pool_maxsize=API_POOL_MAXSIZE,
+    )
+    record_path = os.environ.get(API_RECORD_CASSETTE_ENV)
+    if record_path:
+        return RecordingTransport(transport, record_path)
+    return transport
+
+
+def get_transport() -> AnyTransport:
+    """Return the process-wide transport, creating it on first use."""
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            _transport = create_transport()
+        return _transport
+
+
+def record_cassette(path: str) -> Optional[AnyTransport]:
+    """Record every following response to a cassette; return the old transport."""
+    return set_transport(RecordingTransport(get_transport(), path))
+
+
+def replay_cassette(path: str, latency_scale: float = 0.0) -> Optional[AnyTransport]:
+    """Serve following requests from a cassette; return the old transport."""
+    return set_transport(ReplayTransport(path, latency_scale=latency_scale))
+
+
+def set_transport(transport: Optional[AnyTransport]) -> Optional[AnyTransport]:
+    """Replace the process-wide transport and return the previous one."""
+    global _transport
+    with _transport_lock:
+        previous, _transport = _transport, transport
+    return previous
 
 
 class HTTPClient:
     """Handles HTTP requests with consistent error handling and timeout configuration."""
 
-    def __init__(self, timeout: int = API_DEFAULT_TIMEOUT) -> None:
+    def __init__(
+        self,
+        timeout: int = API_DEFAULT_TIMEOUT,
+        cancellation_token: Optional[CancellationToken] = None,
+        transport: Optional[AnyTransport] = None,
+        response_cache: Optional["PersistentCache"] = None,
+    ) -> None:
         self.timeout = timeout
-        self.session: Optional[requests.Session] = None
+        self.cancellation_token = cancellation_token
+        self.transport = transport or get_transport()
+        self.response_cache = response_cache
 
     def __enter__(self):
-        self.session = requests.Session()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            self.session.close()
+        # Connections stay in the shared transport pool for the next client.
+        pass
 
     def get(self, url: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Make a GET request to the specified URL.
 
+        When the client has a cancellation token, the request runs on a helper
+        thread so that cancelling the token returns control immediately and
+        aborts the connection the request is in flight on. When
+        it has a response cache, fresh cached responses are returned without
+        a request.
+
         Args:
             url: The URL to request
             params: Optional query parameters
@@ -34,11 +129,112 @@ class HTTPClient:
 
         Raises:
             InaturalistAPIError: If the request fails
+            FetchCancelledError: If the request is cancelled before it completes
+        """
+        cache_key = None
+        if self.response_cache is not None:
+            cache_key = self.cache_key(url, params)
+            cached = self.response_cache.get(RESPONSE_CACHE_NAMESPACE, cache_key)
+            if cached is not None:
+                return cached
+
+        if self.cancellation_token is None:
+            response_data = self._get(url, params, None)
+        else:
+            response_data = self._get_cancellable(
+                self._get, url, params, self.cancellation_token
+            )
+
+        if self.response_cache is not None and cache_key is not None:
+            self.response_cache.set(RESPONSE_CACHE_NAMESPACE, cache_key, response_data)
+        return response_data
+
+    def get_bytes(self, url: str, params: Optional[Dict[str, Any]] = None) -> bytes:
+        """
+        Make a GET request and return the undecoded response body.
+
+        Used when decoding happens elsewhere, e.g. in a worker process. The
+        response cache is not consulted.
+
+        Raises:
+            InaturalistAPIError: If the request fails
+            FetchCancelledError: If the request is cancelled before it completes
         """
+        if self.cancellation_token is None:
+            return self._get_content(url, params, None)
+        return self._get_cancellable(
+            self._get_content, url, params, self.cancellation_token
+        )
+
+    @staticmethod
+    def cache_key(url: str, params: Optional[Dict[str, Any]]) -> str:
+        query = sorted((key, str(value)) for key, value in (params or {}).items())
+        return f"{url}?{urlencode(query)}"
+
+    def _get(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        handle: Optional[RequestHandle],
+    ) -> Dict[str, Any]:
         try:
-            session = self.session or requests
-            response = session.get(url, params=params, timeout=self.timeout)
+            response = self.transport.get(
+                url, params=params, timeout=self.timeout, handle=handle
+            )
             response.raise_for_status()
             return response.json()
         except requests.RequestException as e:
             raise InaturalistAPIError(f"API request failed: {e}")
+
+    def _get_content(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        handle: Optional[RequestHandle],
+    ) -> bytes:
+        try:
+            response = self.transport.get(
+                url, params=params, timeout=self.timeout, handle=handle
+            )
+            response.raise_for_status()
+            return response.content
+        except requests.RequestException as e:
+            raise InaturalistAPIError(f"API request failed: {e}")
+
+    def _get_cancellable(
+        self,
+        get: Callable[[str, Optional[Dict[str, Any]], Optional[RequestHandle]], Any],
+        url: str,
+        params: Optional[Dict[str, Any]],
+        cancellation_token: CancellationToken,
+    ) -> Any:
+        if cancellation_token.is_cancelled:
+            raise FetchCancelledError("Request cancelled before it was sent.")
+
+        finished = threading.Event()
+        handle = RequestHandle()
+        outcome: Dict[str, Any] = {}
+
+        def request() -> None:
+            try:
+                outcome["response"] = get(url, params, handle)
+            except Exception as e:
+                outcome["error"] = e
+            finally:
+                finished.set()
+
+        cancellation_token.add_callback(finished.set)
+        try:
+            threading.Thread(target=request, daemon=True).start()
+            finished.wait()
+        finally:
+            cancellation_token.remove_callback(finished.set)
+
+        if cancellation_token.is_cancelled:
+            # Closing the socket makes the abandoned request fail at once, and
+            # its connection is discarded instead of returning to the pool.
+            handle.abort()
+            raise FetchCancelledError("Request cancelled.")
+        if "error" in outcome:
+            raise outcome["error"]
+        return outcome["response"]
@@ -0,0 +1,101 @@
+import csv
+import re
+from typing import Any, Iterable, List
+
+# Bare ids, or observation URLs such as .../observations/12345.
+OBSERVATION_ID_PATTERN = re.compile(r"(?:.*/observations/)?(\d+)(?:\.0*)?")
+VALUE_SEPARATOR_PATTERN = re.compile(r"[,;\n]")
+
+
+def parse_id(value: Any) -> int:
+    """
+    Read one observation id from a cell value.
+
+    Raises:
+        ValueError: If the value is neither an id nor an observation URL
+    """
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+
+    match = OBSERVATION_ID_PATTERN.fullmatch(str(value).strip().rstrip("/"))
+    if match is None:
+        raise ValueError(f"'{value}' is not an observation id.")
+    return int(match.group(1))
+
+
+def parse_ids(values: Iterable[Any]) -> List[int]:
+    """
+    Read observation ids from cell values, keeping the first occurrence.
+
+    Empty cells are skipped; any other value that is not an id raises
+    ValueError so a wrong column is not silently fetched as nothing.
+    """
+    ids: List[int] = []
+    seen = set()
+    for value in values:
+        if value is None or str(value).strip() in ("", "NULL"):
+            continue
+        observation_id = parse_id(value)
+        if observation_id not in seen:
+            seen.add(observation_id)
+            ids.append(observation_id)
+    return ids
+
+
+def parse_values(text: str) -> List[str]:
+    """
+    Split a list of names separated by commas, semicolons or line breaks.
+
+    Blank entries are skipped and repeated names, compared without case,
+    are kept once.
+    """
+    return unique_values(VALUE_SEPARATOR_PATTERN.split(text))
+
+
+def unique_values(values: Iterable[Any]) -> List[str]:
+    names: List[str] = []
+    seen = set()
+    for value in values:
+        if value is None:
+            continue
+        name = str(value).strip()
+        if name and name != "NULL" and name.lower() not in seen:
+            seen.add(name.lower())
+            names.append(name)
+    return names
+
+
+def csv_columns(path: str) -> List[str]:
+    """Return the header of a CSV file."""
+    with open(path, newline="", encoding="utf-8-sig") as csv_file:
+        return next(csv.reader(csv_file, sniff_dialect(csv_file)), [])
+
+
+def read_csv_ids(path: str, column: str) -> List[int]:
+    """Read the observation ids of one column of a CSV file with a header."""
+    with open(path, newline="", encoding="utf-8-sig") as csv_file:
+        reader = csv.DictReader(csv_file, dialect=sniff_dialect(csv_file))
+        if column not in (reader.fieldnames or []):
+            raise ValueError(f"Column '{column}' not found in {path}.")
+        return parse_ids(row[column] for row in reader)
+
+
+def read_csv_values(path: str, column: str) -> List[str]:
+    """Read the distinct names of one column of a CSV file with a header."""
+    with open(path, newline="", encoding="utf-8-sig") as csv_file:
+        reader = csv.DictReader(csv_file, dialect=sniff_dialect(csv_file))
+        if column not in (reader.fieldnames or []):
+            raise ValueError(f"Column '{column}' not found in {path}.")
+        return unique_values(row[column] for row in reader)
+
+
+def sniff_dialect(csv_file) -> Any:
+    """Detect comma, semicolon or tab separated files, then rewind."""
+    sample = csv_file.read(4096)
+    csv_file.seek(0)
+    try:
+        return csv.Sniffer().sniff(sample, delimiters=",;\t")
+    except csv.Error:
+        return csv.excel
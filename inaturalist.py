@@ -2,9 +2,12 @@ import os
 from typing import Optional
 
 from PyQt5.QtWidgets import QAction
+from qgis.core import QgsApplication
 from qgis.PyQt.QtGui import QIcon
 
+from .decode_pool import shutdown_decode_pool
 from .inaturalist_dialog import InaturalistDialog
+from .processing_provider import InaturalistProvider
 
 
 class Inaturalist:
@@ -12,8 +15,15 @@ class Inaturalist:
         self.iface = iface
         self.dialog: InaturalistDialog = InaturalistDialog()
         self.action: Optional[QAction] = None
+        self.provider: Optional[InaturalistProvider] = None
+
+    def initProcessing(self) -> None:
+        self.provider = InaturalistProvider()
+        QgsApplication.processingRegistry().addProvider(self.provider)
 
     def initGui(self) -> None:
+        self.initProcessing()
+
         icon: str = os.path.join(os.path.dirname(__file__), "icons", "iNaturalist.png")
         self.action = QAction(
             QIcon(icon), "iNaturalist Observations", self.iface.mainWindow()
@@ -29,6 +39,10 @@ class Inaturalist:
             self.iface.removeToolBarIcon(self.action)
             self.iface.removePluginMenu("iNaturalist", self.action)
             del self.action
+        if self.provider is not None:
+            QgsApplication.processingRegistry().removeProvider(self.provider)
+            self.provider = None
+        shutdown_decode_pool()
 
     def run(self) -> None:
         self.dialog.show()
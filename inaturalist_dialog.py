@@ -1,15 +1,79 @@
 import os
+from concurrent.futures import Executor
+from functools import partial
 from typing import Any, Dict, List, Optional
 
 from iso3166 import countries
 from PyQt5 import uic
 from PyQt5.QtCore import QDate
-from PyQt5.QtWidgets import QDialog, QMessageBox
+from PyQt5.QtWidgets import QDialog, QFileDialog, QMessageBox
+from qgis.core import (
+    Qgis,
+    QgsCoordinateReferenceSystem,
+    QgsFeatureRequest,
+    QgsPointXY,
+    QgsProject,
+    QgsVectorLayer,
+    QgsWkbTypes,
+)
+from qgis.utils import iface
 
+from .cancellation import CancellationToken
+from .cluster_layer import ClusterLayer
+from .cluster_pyramid import ClusterPyramid
+from .constants import (
+    API_BATCH_SIZE,
+    API_MAX_TOTAL_RECORDS,
+    CLUSTER_MAX_LEVEL,
+    DETAILS_CACHE_TTL,
+    GEOPRIVACY_OPTIONS,
+    GRID_DEFAULT_CELL_SIZE,
+    GRID_DEFAULT_CRS,
+    HISTOGRAM_INTERVALS,
+    ICONIC_TAXA,
+    ID_LIST_FIELD_NAMES,
+    LIST_CSV_COLUMNS,
+    LIVE_EXTENT_MAX_PAGES_PER_TILE,
+    LIVE_EXTENT_MESSAGE_SECONDS,
+    MISSING_IDS_SHOWN,
+    OUTPUT_MODE_HEX_GRID,
+    OUTPUT_MODE_HISTOGRAM,
+    OUTPUT_MODE_POINTS,
+    OUTPUT_MODE_SPECIES_COUNTS,
+    OUTPUT_MODE_SQUARE_GRID,
+    PREVIEW_DEFAULT_SAMPLE_SIZE,
+    QUALITY_GRADES,
+    RESOLVER_CACHE_TTL,
+    RESPONSE_CACHE_TTL,
+    TAXONOMY_CACHE_TTL,
+)
+from .decode_pool import get_decode_pool
+from .details import DetailLoader
 from .form_data import FormData
+from .grid_aggregator import GridAggregator
+from .id_list import (
+    csv_columns,
+    parse_ids,
+    parse_values,
+    read_csv_ids,
+    read_csv_values,
+)
+from .live_extent import LiveExtentLoader
+from .observation_parser import ObservationBatch, batch_values
+from .observation_warehouse import ObservationWarehouse, query_key
 from .observations import Observations
+from .persistent_cache import PersistentCache
 from .places import Places
+from .polygon_filter import PolygonFilter
+from .projection import PointProjector
 from .qgis_layer_helper import QgisLayerHelper
+from .resolver import IdResolver
+from .sampling import format_duration
+from .settings import cache_path, warehouse_path
+from .summaries import Summaries
+from .summary_parser import HistogramBin, SpeciesCount
+from .taxonomy import TaxonomyResolver
+from .value_lists import ValueLists
 
 
 class InaturalistDialog(QDialog):
@@ -22,26 +86,86 @@ class InaturalistDialog(QDialog):
         uic.loadUi(ui_path, self)
 
         self.populate_countries()
+        self.populate_server_filters()
+        self.spinBox_preview_size.setValue(PREVIEW_DEFAULT_SAMPLE_SIZE)
+        self.populate_output_modes()
+        self.comboBox_output_mode.currentIndexChanged.connect(
+            self.update_output_mode_widgets
+        )
         self.pushButton.clicked.connect(self.request_handler)
         self.pushButton_stop.clicked.connect(self.stop_handler)
+        self.pushButton_id_csv.clicked.connect(self.choose_id_csv)
+        self.pushButton_lists_csv.clicked.connect(self.choose_lists_csv)
+        self.comboBox_id_source.currentIndexChanged.connect(self.populate_id_fields)
 
         self.observations_api: Observations = Observations()
         self.places_api: Places = Places()
+        self.summaries_api: Summaries = Summaries()
+        self.id_resolver = IdResolver(PersistentCache(cache_path(), RESOLVER_CACHE_TTL))
+        self.response_cache = PersistentCache(cache_path(), RESPONSE_CACHE_TTL)
+        self.details_cache = PersistentCache(cache_path(), DETAILS_CACHE_TTL)
+        self.taxonomy_resolver = TaxonomyResolver(
+            PersistentCache(cache_path(), TAXONOMY_CACHE_TTL)
+        )
         self.qgis_layer_helper = QgisLayerHelper()
 
         self.layer = None
+        self.summary_layer: Optional[QgsVectorLayer] = None
+        self.virtual_url_fields = False
+        self.lightweight = False
+        self.taxonomy = False
+        self.source = False
+        self.project_crs: Optional[QgsCoordinateReferenceSystem] = None
+        self.detail_loaders: List[DetailLoader] = []
+        self.id_csv_path: Optional[str] = None
+        self.missing_ids: List[int] = []
+        self.cancellation_token: Optional[CancellationToken] = None
+        self.cluster_layer: Optional[ClusterLayer] = None
+        self.live_extent_loader: Optional[LiveExtentLoader] = None
+        self.warehouse: Optional[ObservationWarehouse] = None
+        self.warehouse_query_key: Optional[str] = None
+        self.grid_aggregator: Optional[GridAggregator] = None
+        self.grid_crs: Optional[QgsCoordinateReferenceSystem] = None
+        self.grid_transform = None
+
+    def showEvent(self, event) -> None:
+        self.populate_polygon_layers()
+        self.populate_id_sources()
+        super().showEvent(event)
 
     def request_handler(self) -> None:
         try:
+            if self.checkBox_id_list.isChecked():
+                self.prepare_output()
+                self.start_id_list()
+                return
+
+            polygon_filter = self.build_polygon_filter()
+            username = self.lineEdit_username.text().strip()
+            species = self.lineEdit_species.text().strip()
+            # Several names are resolved and packed on the fetch thread.
+            species_list = self.read_value_list(species)
+            user_list = self.read_value_list(username)
+            place_list = parse_values(self.lineEdit_places.text())
+            if species_list:
+                species = ""
+            if user_list:
+                username = ""
             form_data = FormData(
-                username=self.lineEdit_username.text().strip(),
-                species=self.lineEdit_species.text().strip(),
+                username=username,
+                species=species,
                 date_from=self.dateEdit_date_from.date().toString("yyyy-MM-dd"),
                 date_to=self.dateEdit_date_to.date().toString("yyyy-MM-dd"),
-                country_id=self.set_country_id(self.comboBox_countries.currentText()),
+                country_id=(
+                    None
+                    if place_list
+                    else self.set_country_id(self.comboBox_countries.currentText())
+                ),
                 bbox=(
                     self.qgis_layer_helper.get_bounding_box()
                     if self.checkBox_map_extent.isChecked()
+                    and not self.checkBox_live_extent.isChecked()
+                    and polygon_filter is None
                     else None
                 ),
                 positional_accuracy_below_meters=(
@@ -49,9 +173,129 @@ class InaturalistDialog(QDialog):
                     if self.checkBox_positional_accuracy.isChecked()
                     else None
                 ),
+                taxon_id=self.id_resolver.resolve_taxon(species) if species else None,
+                user_numeric_id=(
+                    self.id_resolver.resolve_user(username) if username else None
+                ),
+                quality_grade=QUALITY_GRADES.get(
+                    self.comboBox_quality_grade.currentText()
+                ),
+                photos=True if self.checkBox_photos.isChecked() else None,
+                iconic_taxa=self.parse_iconic_taxa(self.lineEdit_iconic_taxa.text()),
+                captive=False if self.checkBox_wild.isChecked() else None,
+                geoprivacy=GEOPRIVACY_OPTIONS.get(
+                    self.comboBox_geoprivacy.currentText()
+                ),
+            )
+
+            value_lists = (
+                ValueLists(
+                    form_data, self.id_resolver, species_list, user_list, place_list
+                )
+                if species_list or user_list or place_list
+                else None
             )
 
             api_params = self.set_api_params(form_data)
+            self.prepare_output()
+
+            if value_lists is not None:
+                if (
+                    self.comboBox_output_mode.currentText()
+                    in (OUTPUT_MODE_SPECIES_COUNTS, OUTPUT_MODE_HISTOGRAM)
+                    or self.checkBox_preview.isChecked()
+                    or self.checkBox_live_extent.isChecked()
+                    or self.checkBox_warehouse.isChecked()
+                ):
+                    raise ValueError(
+                        "Species, user and place lists cannot be combined with "
+                        "table outputs, preview, live extent or the local "
+                        "warehouse."
+                    )
+                self.source = True
+
+            if self.comboBox_output_mode.currentText() == OUTPUT_MODE_SPECIES_COUNTS:
+                if polygon_filter is not None:
+                    raise ValueError(
+                        "Species counts cannot be combined with the polygon filter."
+                    )
+                self.cancellation_token = CancellationToken()
+                self.summaries_api.fetch_species_counts(
+                    api_params,
+                    on_batch_fetched=self.add_species_counts_to_layer,
+                    on_progress_updated=self.progressBar.setValue,
+                    on_fetch_completed=self.on_fetch_completed,
+                    on_fetch_failed=self.on_fetch_failed,
+                    cancellation_token=self.cancellation_token,
+                    response_cache=self.response_cache,
+                )
+                return
+
+            if self.comboBox_output_mode.currentText() == OUTPUT_MODE_HISTOGRAM:
+                if polygon_filter is not None:
+                    raise ValueError(
+                        "The histogram cannot be combined with the polygon filter."
+                    )
+                self.cancellation_token = CancellationToken()
+                self.summaries_api.fetch_histogram(
+                    api_params,
+                    self.comboBox_histogram_interval.currentData(),
+                    on_batch_fetched=self.add_histogram_to_layer,
+                    on_progress_updated=self.progressBar.setValue,
+                    on_fetch_completed=self.on_fetch_completed,
+                    on_fetch_failed=self.on_fetch_failed,
+                    cancellation_token=self.cancellation_token,
+                    response_cache=self.response_cache,
+                )
+                return
+
+            if self.project_crs is not None and (
+                self.checkBox_preview.isChecked()
+                or self.checkBox_live_extent.isChecked()
+                or self.checkBox_warehouse.isChecked()
+            ):
+                raise ValueError(
+                    "Storing points in the project CRS cannot be combined with "
+                    "preview, live extent or the local warehouse."
+                )
+
+            if self.checkBox_preview.isChecked():
+                self.start_preview(api_params, polygon_filter)
+                return
+
+            if self.lightweight and (
+                self.checkBox_live_extent.isChecked()
+                or self.checkBox_warehouse.isChecked()
+            ):
+                raise ValueError(
+                    "Lightweight layers cannot be combined with live extent "
+                    "or the local warehouse."
+                )
+            if self.taxonomy and (
+                self.checkBox_live_extent.isChecked()
+                or self.checkBox_warehouse.isChecked()
+            ):
+                raise ValueError(
+                    "Taxonomy columns cannot be combined with live extent "
+                    "or the local warehouse."
+                )
+            if polygon_filter is not None and (
+                self.checkBox_live_extent.isChecked()
+                or self.checkBox_warehouse.isChecked()
+            ):
+                raise ValueError(
+                    "The polygon filter cannot be combined with live extent "
+                    "or the local warehouse."
+                )
+
+            if self.checkBox_live_extent.isChecked():
+                self.start_live_extent(api_params)
+                return
+            self.cancellation_token = CancellationToken()
+
+            if self.checkBox_warehouse.isChecked():
+                self.warehouse = ObservationWarehouse(warehouse_path())
+                self.warehouse_query_key = query_key(api_params)
 
             self.observations_api.fetch(
                 api_params,
@@ -59,11 +303,20 @@ class InaturalistDialog(QDialog):
                 on_progress_updated=self.progressBar.setValue,
                 on_fetch_completed=self.on_fetch_completed,
                 on_fetch_failed=self.on_fetch_failed,
+                cancellation_token=self.cancellation_token,
+                warehouse=self.warehouse,
+                polygon_filter=polygon_filter,
+                lightweight=self.lightweight,
+                taxonomy=self.taxonomy_resolver if self.taxonomy else None,
+                decode_pool=self.decode_pool(),
+                value_lists=value_lists,
+                projector=self.projector(),
             )
 
         except Exception as exc:
             QMessageBox.critical(self, "Error", str(exc))
             self.observations_api.stop_fetching()
+            self.summaries_api.stop_fetching()
             self.reset_form()
             self.close()
             return
@@ -75,25 +328,337 @@ class InaturalistDialog(QDialog):
         self.dateEdit_date_to.setDate(QDate(2200, 1, 1))
         self.checkBox_date_range.setChecked(False)
         self.checkBox_map_extent.setChecked(False)
+        self.checkBox_live_extent.setChecked(False)
+        self.checkBox_polygon_filter.setChecked(False)
+        self.checkBox_id_list.setChecked(False)
+        self.checkBox_preview.setChecked(False)
         self.layer = None
+        self.summary_layer = None
+        self.missing_ids = []
+        self.source = False
+        self.cancellation_token = None
+        self.cluster_layer = None
+        self.warehouse = None
+        self.warehouse_query_key = None
+        self.grid_aggregator = None
+        self.grid_crs = None
+        self.grid_transform = None
+        self.project_crs = None
+        self.detail_loaders = [
+            loader for loader in self.detail_loaders if not loader.is_stopped
+        ]
+
+    def prepare_output(self) -> None:
+        """Set up the grid aggregator when an aggregated output mode is selected."""
+        output_mode = self.comboBox_output_mode.currentText()
+        self.virtual_url_fields = self.checkBox_virtual_url_fields.isChecked()
+        self.lightweight = (
+            output_mode == OUTPUT_MODE_POINTS and self.checkBox_lightweight.isChecked()
+        )
+        self.taxonomy = (
+            output_mode == OUTPUT_MODE_POINTS and self.checkBox_taxonomy.isChecked()
+        )
+        project_crs = QgsProject.instance().crs()
+        self.project_crs = (
+            project_crs
+            if output_mode == OUTPUT_MODE_POINTS
+            and self.checkBox_project_crs.isChecked()
+            and project_crs.isValid()
+            and project_crs.authid() != "EPSG:4326"
+            else None
+        )
+        if output_mode not in (OUTPUT_MODE_HEX_GRID, OUTPUT_MODE_SQUARE_GRID):
+            return
+
+        crs = QgsCoordinateReferenceSystem(self.lineEdit_grid_crs.text().strip())
+        if not crs.isValid():
+            raise ValueError(
+                f"Invalid grid CRS: '{self.lineEdit_grid_crs.text().strip()}'"
+            )
+
+        self.grid_aggregator = GridAggregator(
+            cell_size=self.doubleSpinBox_cell_size.value(),
+            shape="hex" if output_mode == OUTPUT_MODE_HEX_GRID else "square",
+        )
+        self.grid_crs = crs
+        self.grid_transform = self.qgis_layer_helper.create_grid_transform(crs)
+
+    def start_live_extent(self, api_params: Dict[str, Any]) -> None:
+        """Load observations for the visible map tiles as the canvas moves."""
+        self.stop_live_extent()
+
+        layer, _ = self.qgis_layer_helper.create_layer_and_provider(
+            virtual_url_fields=self.virtual_url_fields
+        )
+        self.qgis_layer_helper.add_layer_to_project(layer)
+
+        self.live_extent_loader = LiveExtentLoader(
+            iface.mapCanvas(),
+            api_params,
+            layer,
+            self.qgis_layer_helper,
+            on_fetch_failed=self.on_live_extent_failed,
+            virtual_url_fields=self.virtual_url_fields,
+            on_tiles_truncated=self.on_live_extent_truncated,
+        )
+        self.live_extent_loader.start()
+        self.reset_form()
+        self.close()
+
+    def start_preview(
+        self, api_params: Dict[str, Any], polygon_filter: Optional[PolygonFilter]
+    ) -> None:
+        """Load a stratified sample of the query as a preview layer."""
+        if (
+            self.comboBox_output_mode.currentText() != OUTPUT_MODE_POINTS
+            or polygon_filter is not None
+            or self.checkBox_live_extent.isChecked()
+            or self.checkBox_warehouse.isChecked()
+        ):
+            raise ValueError(
+                "The preview sample only supports the points output without "
+                "polygon filter, live extent or local warehouse."
+            )
+
+        self.cancellation_token = CancellationToken()
+        self.observations_api.preview(
+            api_params,
+            self.spinBox_preview_size.value(),
+            on_batch_fetched=self.add_batch_to_layer,
+            on_progress_updated=self.progressBar.setValue,
+            on_preview_completed=self.on_preview_completed,
+            on_fetch_failed=self.on_fetch_failed,
+            cancellation_token=self.cancellation_token,
+            taxonomy=self.taxonomy_resolver if self.taxonomy else None,
+        )
+
+    def start_id_list(self) -> None:
+        """Load the observations listed in a layer field or CSV column."""
+        if (
+            self.comboBox_output_mode.currentText() != OUTPUT_MODE_POINTS
+            or self.checkBox_polygon_filter.isChecked()
+            or self.checkBox_live_extent.isChecked()
+            or self.checkBox_warehouse.isChecked()
+            or self.checkBox_preview.isChecked()
+        ):
+            raise ValueError(
+                "Id lists only support the points output without polygon "
+                "filter, live extent, local warehouse or preview."
+            )
+
+        observation_ids = self.read_id_list()
+        self.cancellation_token = CancellationToken()
+        self.observations_api.fetch_by_ids(
+            observation_ids,
+            on_batch_fetched=self.add_batch_to_layer,
+            on_progress_updated=self.progressBar.setValue,
+            on_fetch_completed=self.on_fetch_completed,
+            on_fetch_failed=self.on_fetch_failed,
+            on_ids_missing=self.on_ids_missing,
+            cancellation_token=self.cancellation_token,
+            lightweight=self.lightweight,
+            taxonomy=self.taxonomy_resolver if self.taxonomy else None,
+            decode_pool=self.decode_pool(),
+            projector=self.projector(),
+        )
+
+    def projector(self) -> Optional[PointProjector]:
+        if self.project_crs is None:
+            return None
+        return PointProjector(self.project_crs)
+
+    def decode_pool(self) -> Optional[Executor]:
+        if not self.checkBox_process_pool.isChecked():
+            return None
+        return get_decode_pool()
+
+    def read_id_list(self) -> List[int]:
+        field = self.comboBox_id_field.currentText()
+        if not field:
+            raise ValueError("Select the field holding the observation ids.")
+
+        if self.id_source_is_csv():
+            observation_ids = read_csv_ids(self.id_csv_path, field)
+        else:
+            layer = QgsProject.instance().mapLayer(
+                self.comboBox_id_source.currentData()
+            )
+            if layer is None:
+                raise ValueError("Select a layer or CSV file holding observation ids.")
+            request = QgsFeatureRequest().setFlags(QgsFeatureRequest.NoGeometry)
+            request.setSubsetOfAttributes([field], layer.fields())
+            observation_ids = parse_ids(
+                feature[field] for feature in layer.getFeatures(request)
+            )
+
+        if not observation_ids:
+            raise ValueError(f"No observation ids found in '{field}'.")
+        return observation_ids
+
+    def on_ids_missing(self, observation_ids: List[int]) -> None:
+        self.missing_ids = observation_ids
+
+    def on_preview_completed(
+        self, sample_size: int, total_results: int, estimated_seconds: float
+    ) -> None:
+        if self.layer is not None:
+            self.layer.setName(self.layer.name().replace("inat_", "inat_preview_", 1))
+
+        message = (
+            f"Showing a sample of {sample_size} of {total_results} observations.\n"
+            f"Downloading all of them would take about "
+            f"{format_duration(estimated_seconds)}."
+        )
+        if total_results >= API_MAX_TOTAL_RECORDS:
+            message += (
+                f"\n\nThe full query exceeds the maximum of {API_MAX_TOTAL_RECORDS} "
+                "records; refine the filters before downloading it."
+            )
+        QMessageBox.information(self, "Preview", message)
+        self.reset_form()
+        self.close()
+
+    def stop_live_extent(self) -> None:
+        if self.live_extent_loader is not None:
+            self.live_extent_loader.stop()
+            self.live_extent_loader = None
+
+    def on_live_extent_failed(self, error_message: str) -> None:
+        QMessageBox.critical(self, "Error", error_message)
+        self.stop_live_extent()
+
+    def on_live_extent_truncated(self, tile_count: int) -> None:
+        iface.messageBar().pushMessage(
+            "iNaturalist",
+            f"{tile_count} map tiles hold more than "
+            f"{LIVE_EXTENT_MAX_PAGES_PER_TILE * API_BATCH_SIZE} observations; "
+            "zoom in to load the rest.",
+            level=Qgis.Info,
+            duration=LIVE_EXTENT_MESSAGE_SECONDS,
+        )
 
     def on_fetch_completed(self):
+        if self.grid_aggregator is not None and len(self.grid_aggregator):
+            layer = self.qgis_layer_helper.create_grid_layer(
+                self.grid_aggregator, self.grid_crs
+            )
+            self.qgis_layer_helper.add_layer_to_project(layer)
+        if self.warehouse is not None and self.layer is not None:
+            self.qgis_layer_helper.refresh_layer(self.layer)
+        if self.missing_ids:
+            shown = ", ".join(str(id_) for id_ in self.missing_ids[:MISSING_IDS_SHOWN])
+            if len(self.missing_ids) > MISSING_IDS_SHOWN:
+                shown += ", ..."
+            QMessageBox.warning(
+                self,
+                "Missing observations",
+                f"{len(self.missing_ids)} of the listed observations no longer "
+                f"exist or are not public:\n{shown}",
+            )
         self.reset_form()
         self.close()
 
-    def add_batch_to_layer(self, batch_results: List[Dict[str, Any]]) -> None:
+    def add_batch_to_layer(self, batch_results: ObservationBatch) -> None:
+        # Batches queued before a stop was requested are dropped on arrival.
+        if self.cancellation_token is None or self.cancellation_token.is_cancelled:
+            return
+
+        if self.grid_aggregator is not None:
+            self.qgis_layer_helper.add_observations_to_grid(
+                batch_results, self.grid_aggregator, self.grid_transform
+            )
+            return
+
         if self.layer is None:
-            self.layer, _ = self.qgis_layer_helper.create_layer_and_provider()
+            if self.warehouse is not None:
+                self.layer = self.qgis_layer_helper.create_warehouse_layer(
+                    self.warehouse, self.warehouse_query_key
+                )
+            else:
+                self.layer, _ = self.qgis_layer_helper.create_layer_and_provider(
+                    virtual_url_fields=self.virtual_url_fields,
+                    lightweight=self.lightweight,
+                    taxonomy=self.taxonomy,
+                    source=self.source,
+                    crs=self.project_crs,
+                )
+            if self.lightweight:
+                detail_loader = DetailLoader(
+                    self.layer,
+                    self.details_cache,
+                    self.qgis_layer_helper,
+                    on_fetch_failed=self.on_details_failed,
+                )
+                detail_loader.layer.willBeDeleted.connect(
+                    partial(self.remove_detail_loader, detail_loader)
+                )
+                self.detail_loaders.append(detail_loader)
+            if self.checkBox_cluster_points.isChecked():
+                self.cluster_layer = ClusterLayer(
+                    ClusterPyramid(max_level=CLUSTER_MAX_LEVEL)
+                )
+                self.cluster_layer.hide_when_zoomed_out(self.layer)
+                self.qgis_layer_helper.add_layer_to_project(self.cluster_layer.layer)
             self.qgis_layer_helper.add_layer_to_project(self.layer)
+        elif self.warehouse is not None:
+            self.qgis_layer_helper.refresh_layer(self.layer)
 
-        provider = self.layer.dataProvider()  # type: ignore
-        self.qgis_layer_helper.add_observations_to_layer(
-            batch_results, self.layer, provider
-        )
+        if self.warehouse is None:
+            provider = self.layer.dataProvider()  # type: ignore
+            self.qgis_layer_helper.add_observations_to_layer(
+                batch_results,
+                self.layer,
+                provider,
+                virtual_url_fields=self.virtual_url_fields,
+                lightweight=self.lightweight,
+                taxonomy=self.taxonomy,
+                source=self.source,
+                projected=self.project_crs is not None,
+            )
+
+        if self.cluster_layer is not None and batch_results:
+            self.cluster_layer.add_points(
+                [
+                    QgsPointXY(lon, lat)
+                    for lon, lat in zip(
+                        batch_values(batch_results, "lon"),
+                        batch_values(batch_results, "lat"),
+                    )
+                ]
+            )
+            self.cluster_layer.update()
+
+    def add_species_counts_to_layer(self, counts: List[SpeciesCount]) -> None:
+        if self.cancellation_token is None or self.cancellation_token.is_cancelled:
+            return
+
+        if self.summary_layer is None:
+            self.summary_layer = self.qgis_layer_helper.create_species_counts_layer()
+            self.qgis_layer_helper.add_layer_to_project(self.summary_layer)
+        self.qgis_layer_helper.add_species_counts_to_layer(counts, self.summary_layer)
+
+    def add_histogram_to_layer(self, bins: List[HistogramBin]) -> None:
+        if self.cancellation_token is None or self.cancellation_token.is_cancelled:
+            return
+
+        if self.summary_layer is None:
+            self.summary_layer = self.qgis_layer_helper.create_histogram_layer()
+            self.qgis_layer_helper.add_layer_to_project(self.summary_layer)
+        self.qgis_layer_helper.add_histogram_to_layer(bins, self.summary_layer)
+
+    def remove_detail_loader(self, detail_loader: DetailLoader) -> None:
+        """Forget the detail loader of a layer removed from the project."""
+        detail_loader.stop()
+        if detail_loader in self.detail_loaders:
+            self.detail_loaders.remove(detail_loader)
+
+    def on_details_failed(self, error_message: str) -> None:
+        QMessageBox.critical(self, "Error", error_message)
 
     def on_fetch_failed(self, error_message):
         QMessageBox.critical(self, "Error", error_message)
         self.observations_api.stop_fetching()
+        self.summaries_api.stop_fetching()
         self.reset_form()
         self.close()
 
@@ -105,6 +670,197 @@ class InaturalistDialog(QDialog):
         self.comboBox_countries.addItem("Select a Country")
         self.comboBox_countries.addItems(country_names)
 
+    def populate_server_filters(self) -> None:
+        self.comboBox_quality_grade.clear()
+        self.comboBox_quality_grade.addItems(list(QUALITY_GRADES))
+        self.comboBox_geoprivacy.clear()
+        self.comboBox_geoprivacy.addItems(list(GEOPRIVACY_OPTIONS))
+
+    def parse_iconic_taxa(self, text: str) -> Optional[List[str]]:
+        """Match comma separated iconic taxa names case-insensitively."""
+        known = {name.lower(): name for name in ICONIC_TAXA}
+        iconic_taxa: List[str] = []
+        for name in filter(None, (part.strip() for part in text.split(","))):
+            if name.lower() not in known:
+                raise ValueError(
+                    f"Unknown iconic taxon '{name}'. "
+                    f"Choose from: {', '.join(ICONIC_TAXA)}"
+                )
+            iconic_taxa.append(known[name.lower()])
+        return iconic_taxa or None
+
+    def populate_polygon_layers(self) -> None:
+        current_layer_id = self.comboBox_polygon_layer.currentData()
+        self.comboBox_polygon_layer.clear()
+
+        for layer in QgsProject.instance().mapLayers().values():
+            if (
+                isinstance(layer, QgsVectorLayer)
+                and layer.geometryType() == QgsWkbTypes.PolygonGeometry
+            ):
+                self.comboBox_polygon_layer.addItem(layer.name(), layer.id())
+
+        index = self.comboBox_polygon_layer.findData(current_layer_id)
+        if index >= 0:
+            self.comboBox_polygon_layer.setCurrentIndex(index)
+
+    def populate_id_sources(self) -> None:
+        current_source = self.comboBox_id_source.currentData()
+        self.comboBox_id_source.blockSignals(True)
+        self.comboBox_id_source.clear()
+
+        # A chosen CSV file is always the first entry.
+        if self.id_csv_path is not None:
+            self.comboBox_id_source.addItem(
+                f"CSV: {os.path.basename(self.id_csv_path)}", self.id_csv_path
+            )
+        for layer in QgsProject.instance().mapLayers().values():
+            if isinstance(layer, QgsVectorLayer):
+                self.comboBox_id_source.addItem(layer.name(), layer.id())
+
+        index = self.comboBox_id_source.findData(current_source)
+        if index >= 0:
+            self.comboBox_id_source.setCurrentIndex(index)
+        self.comboBox_id_source.blockSignals(False)
+        self.populate_id_fields()
+
+    def choose_id_csv(self) -> None:
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Observation ids", "", "CSV files (*.csv *.txt);;All files (*)"
+        )
+        if not path:
+            return
+        self.id_csv_path = path
+        self.populate_id_sources()
+        self.comboBox_id_source.setCurrentIndex(0)
+
+    def read_value_list(self, text: str) -> List[str]:
+        """Return the names of a filter holding several, or [] for one name."""
+        names = parse_values(text)
+        return names if len(names) > 1 else []
+
+    def choose_lists_csv(self) -> None:
+        path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Species, user and place lists",
+            "",
+            "CSV files (*.csv *.txt);;All files (*)",
+        )
+        if not path:
+            return
+
+        line_edits = {
+            "species": self.lineEdit_species,
+            "users": self.lineEdit_username,
+            "places": self.lineEdit_places,
+        }
+        try:
+            columns = {name.lower(): name for name in csv_columns(path)}
+            filled = False
+            for kind, names in LIST_CSV_COLUMNS.items():
+                column = next(
+                    (
+                        columns[name.lower()]
+                        for name in names
+                        if name.lower() in columns
+                    ),
+                    None,
+                )
+                if column is not None:
+                    line_edits[kind].setText(", ".join(read_csv_values(path, column)))
+                    filled = True
+        except (OSError, UnicodeDecodeError, ValueError) as exc:
+            QMessageBox.critical(self, "Error", str(exc))
+            return
+
+        if not filled:
+            QMessageBox.warning(
+                self,
+                "Lists CSV",
+                "No species, user or place column found in "
+                f"{os.path.basename(path)}.",
+            )
+
+    def id_source_is_csv(self) -> bool:
+        return (
+            self.id_csv_path is not None and self.comboBox_id_source.currentIndex() == 0
+        )
+
+    def populate_id_fields(self) -> None:
+        self.comboBox_id_field.clear()
+        if self.id_source_is_csv():
+            try:
+                names = csv_columns(self.id_csv_path)
+            except (OSError, UnicodeDecodeError) as exc:
+                QMessageBox.critical(self, "Error", str(exc))
+                names = []
+        else:
+            layer = QgsProject.instance().mapLayer(
+                self.comboBox_id_source.currentData()
+            )
+            names = layer.fields().names() if layer is not None else []
+        self.comboBox_id_field.addItems(names)
+
+        for name in ID_LIST_FIELD_NAMES:
+            index = self.comboBox_id_field.findText(name)
+            if index >= 0:
+                self.comboBox_id_field.setCurrentIndex(index)
+                break
+
+    def build_polygon_filter(self) -> Optional[PolygonFilter]:
+        if not self.checkBox_polygon_filter.isChecked():
+            return None
+
+        layer = QgsProject.instance().mapLayer(
+            self.comboBox_polygon_layer.currentData()
+        )
+        if layer is None:
+            raise ValueError("Select a polygon layer to filter by.")
+        return PolygonFilter.from_layer(
+            layer, selected_only=self.checkBox_polygon_selected.isChecked()
+        )
+
+    def populate_output_modes(self) -> None:
+        self.comboBox_output_mode.clear()
+        self.comboBox_output_mode.addItems(
+            [
+                OUTPUT_MODE_POINTS,
+                OUTPUT_MODE_HEX_GRID,
+                OUTPUT_MODE_SQUARE_GRID,
+                OUTPUT_MODE_SPECIES_COUNTS,
+                OUTPUT_MODE_HISTOGRAM,
+            ]
+        )
+        self.comboBox_histogram_interval.clear()
+        for label, interval in HISTOGRAM_INTERVALS.items():
+            self.comboBox_histogram_interval.addItem(label, interval)
+        self.comboBox_histogram_interval.setCurrentIndex(
+            self.comboBox_histogram_interval.findData("month")
+        )
+        self.doubleSpinBox_cell_size.setValue(GRID_DEFAULT_CELL_SIZE)
+        self.lineEdit_grid_crs.setText(GRID_DEFAULT_CRS)
+        self.update_output_mode_widgets()
+
+    def update_output_mode_widgets(self) -> None:
+        output_mode = self.comboBox_output_mode.currentText()
+        is_grid = output_mode in (OUTPUT_MODE_HEX_GRID, OUTPUT_MODE_SQUARE_GRID)
+        is_points = output_mode == OUTPUT_MODE_POINTS
+        self.label_cell_size.setEnabled(is_grid)
+        self.doubleSpinBox_cell_size.setEnabled(is_grid)
+        self.label_grid_crs.setEnabled(is_grid)
+        self.lineEdit_grid_crs.setEnabled(is_grid)
+        self.label_histogram_interval.setEnabled(output_mode == OUTPUT_MODE_HISTOGRAM)
+        self.comboBox_histogram_interval.setEnabled(
+            output_mode == OUTPUT_MODE_HISTOGRAM
+        )
+        self.checkBox_cluster_points.setEnabled(is_points)
+        self.checkBox_virtual_url_fields.setEnabled(is_points)
+        self.checkBox_live_extent.setEnabled(is_points)
+        self.checkBox_warehouse.setEnabled(is_points)
+        self.checkBox_lightweight.setEnabled(is_points)
+        self.checkBox_taxonomy.setEnabled(is_points)
+        self.checkBox_project_crs.setEnabled(is_points)
+
     def set_country_id(self, country: str) -> Optional[int]:
         if country:
             return self.places_api.get_place_id(country)
@@ -116,4 +872,6 @@ class InaturalistDialog(QDialog):
 
     def stop_handler(self) -> None:
         self.observations_api.stop_fetching()
+        self.summaries_api.stop_fetching()
+        self.stop_live_extent()
         self.reset_form()
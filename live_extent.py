@@ -0,0 +1,204 @@
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from PyQt5.QtCore import QObject, QThread, QTimer, pyqtSignal
+from qgis.core import QgsVectorLayer
+
+from .cancellation import CancellationToken
+from .constants import (
+    API_BATCH_SIZE,
+    API_OBSERVATIONS_BASE_URL,
+    LIVE_EXTENT_DEBOUNCE_MS,
+    LIVE_EXTENT_MAX_PAGES_PER_TILE,
+    LIVE_EXTENT_MAX_TILES,
+    LIVE_EXTENT_TILE_CACHE_SIZE,
+)
+from .exceptions import FetchCancelledError, ObservationsFetchError
+from .http_client import HTTPClient
+from .observation_parser import ObservationParser, ObservationRecord, StringPool
+from .qgis_layer_helper import QgisLayerHelper
+from .rate_limiter import RateLimiter
+from .settings import api_rate_limiter
+from .tiles import Tile, TileCache, tiles_for_bbox, zoom_for_bbox
+
+
+class FetchTilesThread(QThread):
+    tile_fetched = pyqtSignal(object, list, bool)
+    fetch_failed = pyqtSignal(str)
+
+    def __init__(
+        self,
+        form_params: Dict[str, Any],
+        tiles: List[Tile],
+        rate_limiter: RateLimiter,
+        string_pool: StringPool,
+        cancellation_token: CancellationToken,
+    ) -> None:
+        super().__init__()
+        self.form_params = form_params
+        self.tiles = tiles
+        self.rate_limiter = rate_limiter
+        self.string_pool = string_pool
+        self.cancellation_token = cancellation_token
+
+    def run(self) -> None:
+        try:
+            with HTTPClient(cancellation_token=self.cancellation_token) as client:
+                for tile in self.tiles:
+                    records, complete = self.fetch_tile(client, tile)
+                    if self.cancellation_token.is_cancelled:
+                        return
+                    self.tile_fetched.emit(tile, records, complete)
+        except FetchCancelledError:
+            return
+        except Exception as e:
+            self.fetch_failed.emit(f"Error: {str(e)}")
+
+    def fetch_tile(
+        self, client: HTTPClient, tile: Tile
+    ) -> Tuple[List[ObservationRecord], bool]:
+        """
+        Fetch the observations of one tile, capped to a few pages.
+
+        Returns:
+            The observations, and whether the tile was fetched completely
+            before reaching the page limit
+        """
+        records: List[ObservationRecord] = []
+        for page in range(1, LIVE_EXTENT_MAX_PAGES_PER_TILE + 1):
+            if not self.rate_limiter.wait(self.cancellation_token):
+                raise FetchCancelledError("Fetch cancelled.")
+
+            params = {
+                **self.form_params,
+                **tile.bbox(),
+                "page": page,
+                "per_page": API_BATCH_SIZE,
+            }
+            try:
+                response_data = client.get(API_OBSERVATIONS_BASE_URL, params=params)
+            except FetchCancelledError:
+                raise
+            except Exception as e:
+                raise ObservationsFetchError(
+                    f"API request failed for tile {tile.z}/{tile.x}/{tile.y}: {e}"
+                )
+
+            results = response_data.get("results", [])
+            records.extend(ObservationParser.parse_records(results, self.string_pool))
+            if len(results) < API_BATCH_SIZE:
+                return records, True
+        return records, False
+
+
+class LiveExtentLoader(QObject):
+    """
+    Keeps one observations layer filled for whatever the map canvas shows.
+
+    The world is split into z/x/y tiles; after the canvas stops moving only
+    the visible tiles not loaded yet for the current filters are fetched,
+    and new observations are appended to the same growing layer.
+    """
+
+    def __init__(
+        self,
+        canvas,
+        form_params: Dict[str, Any],
+        layer: QgsVectorLayer,
+        layer_helper: QgisLayerHelper,
+        on_fetch_failed: Callable[[str], None],
+        virtual_url_fields: bool = False,
+        on_tiles_truncated: Optional[Callable[[int], None]] = None,
+    ) -> None:
+        super().__init__()
+        self.canvas = canvas
+        self.form_params = form_params
+        self.filters_key = tuple(sorted((k, str(v)) for k, v in form_params.items()))
+        self.layer = layer
+        self.layer_helper = layer_helper
+        self.on_fetch_failed = on_fetch_failed
+        self.virtual_url_fields = virtual_url_fields
+        self.on_tiles_truncated = on_tiles_truncated
+        self.truncated_tiles = 0
+
+        self.tile_cache = TileCache(LIVE_EXTENT_TILE_CACHE_SIZE)
+        self.loaded_ids: Set[int] = set()
+        self.rate_limiter = api_rate_limiter()
+        self.string_pool = StringPool()
+        self.cancellation_token = CancellationToken()
+        self.thread: Optional[FetchTilesThread] = None
+        self.reload_requested = False
+
+        self.debounce_timer = QTimer(self)
+        self.debounce_timer.setSingleShot(True)
+        self.debounce_timer.setInterval(LIVE_EXTENT_DEBOUNCE_MS)
+        self.debounce_timer.timeout.connect(self.load_visible_tiles)
+        self.layer.willBeDeleted.connect(self.stop)
+
+    def start(self) -> None:
+        self.canvas.extentsChanged.connect(self.debounce_timer.start)
+        self.load_visible_tiles()
+
+    def stop(self) -> None:
+        self.debounce_timer.stop()
+        try:
+            self.canvas.extentsChanged.disconnect(self.debounce_timer.start)
+        except TypeError:
+            pass
+        self.cancellation_token.cancel()
+
+    def load_visible_tiles(self) -> None:
+        if self.cancellation_token.is_cancelled:
+            return
+        if self.thread is not None and self.thread.isRunning():
+            # Only one tile fetch runs at a time; look again once it finishes.
+            self.reload_requested = True
+            return
+
+        bbox = self.layer_helper.get_bounding_box()
+        zoom = zoom_for_bbox(bbox, LIVE_EXTENT_MAX_TILES)
+        tiles = self.tile_cache.missing(self.filters_key, tiles_for_bbox(bbox, zoom))
+        if not tiles:
+            return
+
+        self.thread = FetchTilesThread(
+            self.form_params,
+            tiles,
+            self.rate_limiter,
+            self.string_pool,
+            self.cancellation_token,
+        )
+        self.thread.tile_fetched.connect(self.add_tile_to_layer)
+        self.thread.fetch_failed.connect(self.on_fetch_failed)
+        self.thread.finished.connect(self.on_thread_finished)
+        self.thread.start()
+
+    def add_tile_to_layer(
+        self, tile: Tile, records: List[ObservationRecord], complete: bool
+    ) -> None:
+        if self.cancellation_token.is_cancelled:
+            return
+
+        self.tile_cache.add(self.filters_key, tile, complete)
+        if not complete:
+            self.truncated_tiles += 1
+
+        # Tiles share edges and may be refetched after eviction.
+        new_records = [
+            record for record in records if record.observation_id not in self.loaded_ids
+        ]
+        self.loaded_ids.update(record.observation_id for record in new_records)
+        if new_records:
+            self.layer_helper.add_observations_to_layer(
+                new_records,
+                self.layer,
+                self.layer.dataProvider(),
+                virtual_url_fields=self.virtual_url_fields,
+            )
+
+    def on_thread_finished(self) -> None:
+        if self.truncated_tiles and self.on_tiles_truncated is not None:
+            self.on_tiles_truncated(self.truncated_tiles)
+        self.truncated_tiles = 0
+        if self.reload_requested:
+            self.reload_requested = False
+            self.load_visible_tiles()
@@ -1,4 +1,348 @@
-from typing import Any, Dict, Optional
+import json
+import math
+from array import array
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+INATURALIST_BASE_URL = "https://www.inaturalist.org"
+WIKIPEDIA_BASE_URL = "https://en.wikipedia.org/wiki/"
+
+
+@lru_cache(maxsize=4096)
+def wikipedia_article(url: Optional[str]) -> Optional[str]:
+    """
+    Return the article of a Wikipedia URL relative to WIKIPEDIA_BASE_URL.
+
+    Articles of other language editions keep their language as an
+    interwiki prefix, e.g. ``de:Waldkauz``. Anything that is not a
+    Wikipedia article URL gives None.
+    """
+    if not url:
+        return None
+    host, separator, title = url.partition("://")[2].partition("/wiki/")
+    if not separator or not title or not host.endswith("wikipedia.org"):
+        return None
+    language = host.split(".")[0]
+    return title if language in ("en", "wikipedia") else f"{language}:{title}"
+
+
+def observation_url(observation_id: Optional[int]) -> Optional[str]:
+    if observation_id is None:
+        return None
+    return f"{INATURALIST_BASE_URL}/observations/{observation_id}"
+
+
+def author_url(user_login: Optional[str]) -> Optional[str]:
+    if user_login is None:
+        return None
+    return f"{INATURALIST_BASE_URL}/people/{user_login}"
+
+
+class StringPool:
+    """Interns repeated strings so equal values share a single object."""
+
+    def __init__(self) -> None:
+        self._strings: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    def intern(self, value: Any) -> Optional[str]:
+        if value is None:
+            return None
+        value = str(value)
+        return self._strings.setdefault(value, value)
+
+
+class ObservationRecord:
+    """
+    Compact parsed observation.
+
+    Missing values are stored as None, repeated strings are interned and
+    the observation and author URLs are derived from ids on demand. The
+    lineage ranks stay None unless taxonomy enrichment fills them, the
+    source stays None unless the query fetched several species, users or
+    places at once, and x and y stay None unless the fetch projects the
+    coordinates to the layer CRS.
+    """
+
+    __slots__ = (
+        "observation_id",
+        "lat",
+        "lon",
+        "species",
+        "taxon_id",
+        "observed_on",
+        "photo_url",
+        "photo_id",
+        "wikipedia_url",
+        "user_login",
+        "location",
+        "positional_accuracy",
+        "updated_at",
+        "kingdom",
+        "order",
+        "family",
+        "genus",
+        "source",
+        "x",
+        "y",
+    )
+
+    def __init__(
+        self,
+        observation_id: Optional[int],
+        lat: float,
+        lon: float,
+        species: Optional[str] = None,
+        taxon_id: Optional[int] = None,
+        observed_on: Optional[str] = None,
+        photo_url: Optional[str] = None,
+        photo_id: Optional[int] = None,
+        wikipedia_url: Optional[str] = None,
+        user_login: Optional[str] = None,
+        location: Optional[str] = None,
+        positional_accuracy: Optional[float] = None,
+        updated_at: Optional[str] = None,
+        kingdom: Optional[str] = None,
+        order: Optional[str] = None,
+        family: Optional[str] = None,
+        genus: Optional[str] = None,
+        source: Optional[str] = None,
+        x: Optional[float] = None,
+        y: Optional[float] = None,
+    ) -> None:
+        self.observation_id = observation_id
+        self.lat = lat
+        self.lon = lon
+        self.species = species
+        self.taxon_id = taxon_id
+        self.observed_on = observed_on
+        self.photo_url = photo_url
+        self.photo_id = photo_id
+        self.wikipedia_url = wikipedia_url
+        self.user_login = user_login
+        self.location = location
+        self.positional_accuracy = positional_accuracy
+        self.updated_at = updated_at
+        self.kingdom = kingdom
+        self.order = order
+        self.family = family
+        self.genus = genus
+        self.source = source
+        self.x = x
+        self.y = y
+
+    @property
+    def observation_url(self) -> Optional[str]:
+        return observation_url(self.observation_id)
+
+    @property
+    def author_url(self) -> Optional[str]:
+        return author_url(self.user_login)
+
+    @property
+    def wikipedia_article(self) -> Optional[str]:
+        return wikipedia_article(self.wikipedia_url)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the record in the dictionary format of parse_observation."""
+        return {
+            "lat": self.lat,
+            "lon": self.lon,
+            "species": self.species or "Unknown",
+            "date": self.observed_on or "N/A",
+            "photo_url": self.photo_url or "N/A",
+            "wikipedia_url": self.wikipedia_url or "N/A",
+            "author_url": self.author_url or "N/A",
+            "location": self.location or "N/A",
+            "observation_url": self.observation_url or "N/A",
+            "positional_accuracy": (
+                "N/A" if self.positional_accuracy is None else self.positional_accuracy
+            ),
+        }
+
+
+class ObservationColumns:
+    """
+    Observation records of one page stored column by column.
+
+    Numbers are kept in typed arrays and strings as indexes into one table
+    of distinct values, so a page pickles to a small buffer when it is sent
+    back from a worker process. Missing ids are stored as -1, missing
+    accuracies as NaN and missing strings as index -1.
+    """
+
+    ID_COLUMNS = ("observation_id", "taxon_id", "photo_id")
+    STRING_COLUMNS = (
+        "species",
+        "observed_on",
+        "photo_url",
+        "wikipedia_url",
+        "user_login",
+        "location",
+        "updated_at",
+        "source",
+    )
+
+    def __init__(self) -> None:
+        self.lat = array("d")
+        self.lon = array("d")
+        self.positional_accuracy = array("d")
+        self.ids = {name: array("q") for name in self.ID_COLUMNS}
+        self.string_indexes = {name: array("i") for name in self.STRING_COLUMNS}
+        self.strings: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.lat)
+
+    @classmethod
+    def from_records(cls, records: Iterable[ObservationRecord]) -> "ObservationColumns":
+        columns = cls()
+        string_table: Dict[str, int] = {}
+        for record in records:
+            columns.lat.append(record.lat)
+            columns.lon.append(record.lon)
+            columns.positional_accuracy.append(
+                math.nan
+                if record.positional_accuracy is None
+                else float(record.positional_accuracy)
+            )
+            for name, column in columns.ids.items():
+                value = getattr(record, name)
+                column.append(-1 if value is None else value)
+            for name, column in columns.string_indexes.items():
+                value = getattr(record, name)
+                if value is None:
+                    column.append(-1)
+                    continue
+                index = string_table.get(value)
+                if index is None:
+                    index = string_table[value] = len(columns.strings)
+                    columns.strings.append(value)
+                column.append(index)
+        return columns
+
+    def values(self, name: str, string_pool: Optional[StringPool] = None) -> List[Any]:
+        """
+        Return one field of every record, with None for missing values.
+
+        Besides the stored columns this gives the derived observation_url,
+        author_url and wikipedia_article, and None for the fields only set
+        after parsing, such as lineage ranks and projected coordinates.
+        """
+        if name in ("lat", "lon"):
+            return list(getattr(self, name))
+        if name in self.ids:
+            return [None if value < 0 else value for value in self.ids[name]]
+        if name in self.string_indexes:
+            strings: Sequence[Optional[str]] = self.strings
+            if string_pool is not None:
+                strings = [string_pool.intern(value) for value in self.strings]
+            return [
+                None if index < 0 else strings[index]
+                for index in self.string_indexes[name]
+            ]
+        if name == "positional_accuracy":
+            return [
+                (
+                    None
+                    if math.isnan(value)
+                    else int(value) if value.is_integer() else value
+                )
+                for value in self.positional_accuracy
+            ]
+        if name == "observation_url":
+            return [observation_url(value) for value in self.values("observation_id")]
+        if name == "author_url":
+            return [author_url(value) for value in self.values("user_login")]
+        if name == "wikipedia_article":
+            return [wikipedia_article(value) for value in self.values("wikipedia_url")]
+        if name in ObservationRecord.__slots__:
+            return [None] * len(self)
+        raise AttributeError(name)
+
+    def records(
+        self, string_pool: Optional[StringPool] = None
+    ) -> List[ObservationRecord]:
+        """Rebuild the records, sharing strings through the pool."""
+        pool = StringPool() if string_pool is None else string_pool
+        names = [*self.ids, *self.string_indexes, "positional_accuracy"]
+        columns = [self.values(name, pool) for name in names]
+        return [
+            ObservationRecord(lat=lat, lon=lon, **dict(zip(names, values)))
+            for lat, lon, *values in zip(self.lat, self.lon, *columns)
+        ]
+
+
+# A batch of observations, as records or as the columns of a decoded page.
+ObservationBatch = Union[List[ObservationRecord], ObservationColumns]
+
+
+def batch_values(observations: ObservationBatch, name: str) -> List[Any]:
+    """Return one field of every observation of a batch, with None if missing."""
+    if isinstance(observations, ObservationColumns):
+        return observations.values(name)
+    return [getattr(observation, name) for observation in observations]
+
+
+class ObservationSources:
+    """
+    Labels observations with the list entries they were fetched for.
+
+    A query packing several species, users or places returns the union of
+    their observations; the label names the requested taxa the observation
+    belongs to (its own taxon or an ancestor), its observer and the
+    requested places it lies in, in that order.
+    """
+
+    # Fields the label is read from, for queries restricting the fields.
+    FIELDS = "taxon.ancestor_ids,user.id,place_ids"
+
+    def __init__(
+        self,
+        taxa: Optional[Dict[int, str]] = None,
+        users: Optional[Dict[int, str]] = None,
+        places: Optional[Dict[int, str]] = None,
+    ) -> None:
+        self.taxa = taxa or {}
+        self.users = users or {}
+        self.places = places or {}
+
+    def label(self, observation: Dict) -> Optional[str]:
+        taxon = observation.get("taxon") or {}
+        user = observation.get("user") or {}
+        labels: List[str] = []
+        if self.taxa:
+            taxon_ids: Tuple[Any, ...] = (
+                *(taxon.get("ancestor_ids") or ()),
+                taxon.get("id"),
+            )
+            labels.extend(self.labels(self.taxa, taxon_ids))
+        if self.users:
+            labels.extend(self.labels(self.users, (user.get("id"),)))
+        if self.places:
+            labels.extend(self.labels(self.places, observation.get("place_ids") or ()))
+        return ", ".join(labels) or None
+
+    @staticmethod
+    def labels(entries: Dict[int, str], ids: Iterable[Any]) -> List[str]:
+        labels: List[str] = []
+        for id_ in ids:
+            label = entries.get(id_)
+            if label is not None and label not in labels:
+                labels.append(label)
+        return labels
+
+
+class DecodedPage:
+    """Result ids and parsed columns of one decoded response page."""
+
+    __slots__ = ("result_ids", "columns")
+
+    def __init__(self, result_ids: array, columns: ObservationColumns) -> None:
+        self.result_ids = result_ids
+        self.columns = columns
 
 
 class ObservationParser:
@@ -17,23 +361,84 @@ class ObservationParser:
         Returns:
             Parsed observation with standardized fields, or None if coordinates are missing
         """
+        record = ObservationParser.parse_record(observation)
+        if record is None:
+            return None
+        return record.as_dict()
+
+    @staticmethod
+    def parse_record(
+        observation: Dict,
+        string_pool: Optional[StringPool] = None,
+        sources: Optional[ObservationSources] = None,
+    ) -> Optional[ObservationRecord]:
+        """
+        Parse a single observation into a compact record.
+
+        Args:
+            observation: Raw observation data from API
+            string_pool: Optional pool used to share repeated strings across records
+            sources: Optional list entries the observation is labelled with
+
+        Returns:
+            Compact observation record, or None if coordinates are missing
+        """
         coordinates = ObservationParser.extract_coordinates(observation)
         if not coordinates:
             return None
 
+        pool = StringPool() if string_pool is None else string_pool
+        taxon = observation.get("taxon") or {}
+        user = observation.get("user") or {}
+        photo_url = ObservationParser.extract_photo_url(observation)
+
+        return ObservationRecord(
+            observation_id=observation.get("id"),
+            lat=coordinates[0],
+            lon=coordinates[1],
+            species=pool.intern(taxon.get("name")),
+            taxon_id=taxon.get("id"),
+            observed_on=pool.intern(observation.get("observed_on")),
+            photo_url=None if photo_url == "N/A" else photo_url,
+            photo_id=ObservationParser.extract_photo_id(observation),
+            wikipedia_url=pool.intern(taxon.get("wikipedia_url")),
+            user_login=pool.intern(user.get("login")),
+            location=pool.intern(observation.get("place_guess")),
+            positional_accuracy=observation.get("positional_accuracy"),
+            updated_at=observation.get("updated_at"),
+            source=(
+                None if sources is None else pool.intern(sources.label(observation))
+            ),
+        )
+
+    @staticmethod
+    def parse_details(observation: Dict) -> Dict[str, Optional[str]]:
+        """Extract the detail fields loaded on demand for lightweight layers."""
+        taxon = observation.get("taxon") or {}
+        user = observation.get("user") or {}
+        photo_url = ObservationParser.extract_photo_url(observation)
         return {
-            "lat": coordinates[0],
-            "lon": coordinates[1],
-            "species": ObservationParser.extract_species(observation),
-            "date": observation.get("observed_on", "N/A"),
-            "photo_url": ObservationParser.extract_photo_url(observation),
-            "wikipedia_url": ObservationParser.extract_wikipedia_url(observation),
-            "author_url": ObservationParser.extract_author_url(observation),
-            "location": observation.get("place_guess", "N/A"),
-            "observation_url": observation.get("uri", "N/A"),
-            "positional_accuracy": observation.get("positional_accuracy", "N/A"),
+            "location": observation.get("place_guess"),
+            "user_login": user.get("login"),
+            "photo_url": None if photo_url == "N/A" else photo_url,
+            "wikipedia_url": taxon.get("wikipedia_url"),
         }
 
+    @staticmethod
+    def parse_records(
+        observations: Iterable[Dict],
+        string_pool: Optional[StringPool] = None,
+        sources: Optional[ObservationSources] = None,
+    ) -> List[ObservationRecord]:
+        """Parse a page of observations, skipping those without coordinates."""
+        pool = StringPool() if string_pool is None else string_pool
+        records = []
+        for observation in observations:
+            record = ObservationParser.parse_record(observation, pool, sources)
+            if record is not None:
+                records.append(record)
+        return records
+
     @staticmethod
     def extract_coordinates(observation: Dict) -> Optional[tuple[float, float]]:
         """Extract latitude and longitude from observation."""
@@ -72,6 +477,16 @@ class ObservationParser:
 
         return "N/A"
 
+    @staticmethod
+    def extract_photo_id(observation: Dict) -> Optional[int]:
+        """Extract the id of the first photo that has a URL."""
+        for photo_entry in observation.get("observation_photos", []):
+            photo = photo_entry.get("photo") or {}
+            if photo.get("url"):
+                return photo.get("id")
+
+        return None
+
     @staticmethod
     def extract_wikipedia_url(observation: Dict) -> str:
         """Extract Wikipedia URL from observation taxon."""
@@ -88,3 +503,23 @@ class ObservationParser:
             return f"https://www.inaturalist.org/people/{login}"
 
         return "N/A"
+
+
+def decode_page(
+    content: bytes, sources: Optional[ObservationSources] = None
+) -> DecodedPage:
+    """
+    Decode a raw observations response and parse it into columns.
+
+    Meant to run in a worker process: it only takes and returns picklable
+    buffers, so JSON decoding and parsing stay out of the GUI process.
+    """
+    results = json.loads(content).get("results", [])
+    return DecodedPage(
+        array(
+            "q", [result["id"] for result in results if result.get("id") is not None]
+        ),
+        ObservationColumns.from_records(
+            ObservationParser.parse_records(results, sources=sources)
+        ),
+    )
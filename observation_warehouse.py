@@ -0,0 +1,339 @@
+import hashlib
+import json
+import os
+import sqlite3
+import struct
+import time
+from contextlib import closing
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .observation_parser import ObservationRecord
+
+TABLE_NAME = "observations"
+GEOMETRY_COLUMN = "geom"
+RTREE_TABLE = f"rtree_{TABLE_NAME}_{GEOMETRY_COLUMN}"
+WGS84_SRS_ID = 4326
+
+# GeoPackage binary header: magic, version 0, little-endian without envelope.
+GPKG_HEADER = struct.pack("<2sBBi", b"GP", 0, 1, WGS84_SRS_ID)
+WKB_POINT = struct.Struct("<BIdd")
+
+
+@dataclass(frozen=True)
+class IdSegment:
+    """
+    Range of observation ids to request, bounds exclusive.
+
+    Segments already held by the warehouse carry ``updated_since`` so only
+    observations changed since they were stored are downloaded again.
+    """
+
+    id_above: int
+    id_below: Optional[int]
+    updated_since: Optional[str] = None
+
+
+def query_key(params: Dict[str, Any]) -> str:
+    """Return a stable key identifying a set of API filter parameters."""
+    encoded = json.dumps(params, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:32]
+
+
+def plan_segments(fresh_ranges: List[Tuple[int, int, float]]) -> List[IdSegment]:
+    """
+    Split the id space into gaps to download and held ranges to refresh.
+
+    Args:
+        fresh_ranges: Sorted, non-overlapping (id_min, id_max, fetched_at)
+            ranges already stored for the query
+    """
+    segments: List[IdSegment] = []
+    cursor = 0
+    for id_min, id_max, fetched_at in fresh_ranges:
+        if id_min > cursor + 1:
+            segments.append(IdSegment(cursor, id_min))
+        segments.append(
+            IdSegment(
+                id_min - 1,
+                id_max + 1,
+                datetime.fromtimestamp(fetched_at, timezone.utc).isoformat(),
+            )
+        )
+        cursor = id_max
+    segments.append(IdSegment(cursor, None))
+    return segments
+
+
+def merge_ranges(
+    ranges: Iterable[Tuple[int, int, float]],
+) -> List[Tuple[int, int, float]]:
+    """Merge overlapping or adjacent ranges, keeping the newest fetch time."""
+    merged: List[Tuple[int, int, float]] = []
+    for id_min, id_max, fetched_at in sorted(ranges):
+        if merged and id_min <= merged[-1][1] + 1:
+            last_min, last_max, last_fetched_at = merged[-1]
+            merged[-1] = (
+                last_min,
+                max(last_max, id_max),
+                max(last_fetched_at, fetched_at),
+            )
+        else:
+            merged.append((id_min, id_max, fetched_at))
+    return merged
+
+
+def encode_point(lon: float, lat: float) -> bytes:
+    """Encode a point as a GeoPackage geometry blob."""
+    return GPKG_HEADER + WKB_POINT.pack(1, 1, lon, lat)
+
+
+class ObservationWarehouse:
+    """
+    Local GeoPackage holding every fetched observation once, keyed by id.
+
+    Each query records which observations it returned and which id ranges
+    it has covered, so layers can be opened as filtered views and repeated
+    fetches can skip ranges that are already stored and fresh.
+    """
+
+    def __init__(self, path: str, clock: Callable[[], float] = time.time) -> None:
+        self.path = path
+        self.clock = clock
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with closing(self.connect()) as connection, connection:
+            self.create_schema(connection)
+
+    def connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.execute("PRAGMA journal_mode=WAL")
+        return connection
+
+    def create_schema(self, connection: sqlite3.Connection) -> None:
+        connection.execute("PRAGMA application_id = 1196444487")  # "GPKG"
+        connection.execute("PRAGMA user_version = 10200")
+        connection.executescript(
+            f"""
+            CREATE TABLE IF NOT EXISTS gpkg_spatial_ref_sys (
+                srs_name TEXT NOT NULL,
+                srs_id INTEGER PRIMARY KEY,
+                organization TEXT NOT NULL,
+                organization_coordsys_id INTEGER NOT NULL,
+                definition TEXT NOT NULL,
+                description TEXT
+            );
+            INSERT OR IGNORE INTO gpkg_spatial_ref_sys VALUES
+                ('Undefined cartesian SRS', -1, 'NONE', -1, 'undefined', NULL),
+                ('Undefined geographic SRS', 0, 'NONE', 0, 'undefined', NULL),
+                ('WGS 84 geodetic', {WGS84_SRS_ID}, 'EPSG', 4326,
+                 'GEOGCS["WGS 84",DATUM["WGS_1984",SPHEROID["WGS 84",6378137,'
+                 || '298.257223563,AUTHORITY["EPSG","7030"]],AUTHORITY["EPSG",'
+                 || '"6326"]],PRIMEM["Greenwich",0,AUTHORITY["EPSG","8901"]],'
+                 || 'UNIT["degree",0.0174532925199433,AUTHORITY["EPSG","9122"]],'
+                 || 'AUTHORITY["EPSG","4326"]]', NULL);
+            CREATE TABLE IF NOT EXISTS gpkg_contents (
+                table_name TEXT NOT NULL PRIMARY KEY,
+                data_type TEXT NOT NULL,
+                identifier TEXT UNIQUE,
+                description TEXT DEFAULT '',
+                last_change DATETIME NOT NULL
+                    DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now')),
+                min_x DOUBLE, min_y DOUBLE, max_x DOUBLE, max_y DOUBLE,
+                srs_id INTEGER
+            );
+            INSERT OR IGNORE INTO gpkg_contents
+                (table_name, data_type, identifier, min_x, min_y, max_x, max_y,
+                 srs_id)
+                VALUES ('{TABLE_NAME}', 'features', '{TABLE_NAME}',
+                        -180, -90, 180, 90, {WGS84_SRS_ID});
+            CREATE TABLE IF NOT EXISTS gpkg_geometry_columns (
+                table_name TEXT NOT NULL,
+                column_name TEXT NOT NULL,
+                geometry_type_name TEXT NOT NULL,
+                srs_id INTEGER NOT NULL,
+                z TINYINT NOT NULL,
+                m TINYINT NOT NULL,
+                PRIMARY KEY (table_name, column_name)
+            );
+            INSERT OR IGNORE INTO gpkg_geometry_columns VALUES
+                ('{TABLE_NAME}', '{GEOMETRY_COLUMN}', 'POINT',
+                 {WGS84_SRS_ID}, 0, 0);
+            CREATE TABLE IF NOT EXISTS gpkg_extensions (
+                table_name TEXT,
+                column_name TEXT,
+                extension_name TEXT NOT NULL,
+                definition TEXT NOT NULL,
+                scope TEXT NOT NULL,
+                UNIQUE (table_name, column_name, extension_name)
+            );
+            INSERT OR IGNORE INTO gpkg_extensions VALUES
+                ('{TABLE_NAME}', '{GEOMETRY_COLUMN}', 'gpkg_rtree_index',
+                 'http://www.geopackage.org/spec120/#extension_rtree',
+                 'write-only');
+            CREATE TABLE IF NOT EXISTS {TABLE_NAME} (
+                fid INTEGER PRIMARY KEY,
+                {GEOMETRY_COLUMN} POINT,
+                observation_id INTEGER,
+                species TEXT,
+                taxon_id INTEGER,
+                date TEXT,
+                location TEXT,
+                user_login TEXT,
+                photo_id INTEGER,
+                positional_accuracy TEXT,
+                updated_at TEXT,
+                wikipedia_article TEXT
+            );
+            CREATE VIRTUAL TABLE IF NOT EXISTS {RTREE_TABLE}
+                USING rtree(id, minx, maxx, miny, maxy);
+            CREATE TABLE IF NOT EXISTS query_members (
+                query_key TEXT NOT NULL,
+                observation_id INTEGER NOT NULL,
+                PRIMARY KEY (query_key, observation_id)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS query_coverage (
+                query_key TEXT NOT NULL,
+                id_min INTEGER NOT NULL,
+                id_max INTEGER NOT NULL,
+                fetched_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS query_coverage_key
+                ON query_coverage (query_key);
+            """  # nosec B608
+        )
+        columns = {
+            row[1]
+            for row in connection.execute(
+                f"PRAGMA table_info({TABLE_NAME})"  # nosec B608
+            )
+        }
+        if "wikipedia_article" not in columns:
+            # Warehouses created before the column existed show N/A links
+            # until their observations are fetched again.
+            connection.execute(
+                f"ALTER TABLE {TABLE_NAME} "  # nosec B608
+                "ADD COLUMN wikipedia_article TEXT"
+            )
+
+    def upsert(self, records: List["ObservationRecord"], key: str) -> None:
+        """Insert or update observations and attach them to a query."""
+        rows = [record for record in records if record.observation_id is not None]
+        if not rows:
+            return
+
+        with closing(self.connect()) as connection, connection:
+            connection.executemany(
+                f"INSERT OR REPLACE INTO {TABLE_NAME} "  # nosec B608
+                "(fid, geom, observation_id, species, taxon_id, date, location, "
+                "user_login, photo_id, positional_accuracy, updated_at, "
+                "wikipedia_article) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        record.observation_id,
+                        encode_point(record.lon, record.lat),
+                        record.observation_id,
+                        record.species,
+                        record.taxon_id,
+                        record.observed_on,
+                        record.location,
+                        record.user_login,
+                        record.photo_id,
+                        (
+                            None
+                            if record.positional_accuracy is None
+                            else str(record.positional_accuracy)
+                        ),
+                        record.updated_at,
+                        record.wikipedia_article,
+                    )
+                    for record in rows
+                ],
+            )
+            connection.executemany(
+                f"INSERT OR REPLACE INTO {RTREE_TABLE} "  # nosec B608
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (
+                        record.observation_id,
+                        record.lon,
+                        record.lon,
+                        record.lat,
+                        record.lat,
+                    )
+                    for record in rows
+                ],
+            )
+            connection.executemany(
+                "INSERT OR IGNORE INTO query_members VALUES (?, ?)",
+                [(key, record.observation_id) for record in rows],
+            )
+
+    def add_coverage(self, key: str, id_min: int, id_max: int) -> None:
+        """Record that every id in [id_min, id_max] has been fetched for a query."""
+        if id_max < id_min:
+            return
+        with closing(self.connect()) as connection, connection:
+            connection.execute(
+                "INSERT INTO query_coverage VALUES (?, ?, ?, ?)",
+                (key, id_min, id_max, self.clock()),
+            )
+
+    def fresh_ranges(self, key: str, max_age: float) -> List[Tuple[int, int, float]]:
+        """Return the merged id ranges fetched for a query within max_age seconds."""
+        with closing(self.connect()) as connection:
+            rows = connection.execute(
+                "SELECT id_min, id_max, fetched_at FROM query_coverage "
+                "WHERE query_key = ? AND fetched_at >= ?",
+                (key, self.clock() - max_age),
+            ).fetchall()
+        return merge_ranges(rows)
+
+    def prune(self, max_age: float) -> None:
+        """
+        Forget queries not fetched within max_age seconds.
+
+        Coverage older than max_age is dropped, queries left without
+        coverage lose their members, and observations no longer belonging
+        to any query are deleted, so the file does not grow with every
+        query ever run.
+        """
+        with closing(self.connect()) as connection, connection:
+            connection.execute(
+                "DELETE FROM query_coverage WHERE fetched_at < ?",
+                (self.clock() - max_age,),
+            )
+            connection.execute(
+                "DELETE FROM query_members WHERE query_key NOT IN "
+                "(SELECT query_key FROM query_coverage)"
+            )
+            connection.execute(
+                f"DELETE FROM {RTREE_TABLE} WHERE id NOT IN "  # nosec B608
+                "(SELECT observation_id FROM query_members)"
+            )
+            connection.execute(
+                f"DELETE FROM {TABLE_NAME} WHERE fid NOT IN "  # nosec B608
+                "(SELECT observation_id FROM query_members)"
+            )
+
+    def count(self, key: str) -> int:
+        with closing(self.connect()) as connection:
+            return connection.execute(
+                "SELECT COUNT(*) FROM query_members WHERE query_key = ?", (key,)
+            ).fetchone()[0]
+
+    @staticmethod
+    def subset_string(key: str) -> str:
+        """Return the layer filter showing only the observations of a query."""
+        # Keys are hex digests from query_key; quotes are escaped regardless.
+        escaped = key.replace("'", "''")
+        return (
+            '"fid" IN (SELECT observation_id FROM query_members '
+            f"WHERE query_key = '{escaped}')"  # nosec B608
+        )
@@ -1,92 +1,361 @@
-import random
 import time
-from typing import Any, Dict, List, Optional
+from concurrent.futures import Executor
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from PyQt5.QtCore import QThread, pyqtSignal
 
+from .batching import chunked
+from .cancellation import CancellationToken
 from .constants import (
     API_BATCH_SIZE,
+    API_MAX_IDS_PER_REQUEST,
     API_MAX_TOTAL_RECORDS,
+    API_MIN_REQUEST_INTERVAL,
     API_OBSERVATIONS_BASE_URL,
+    API_OBSERVATIONS_V2_URL,
+    API_REQUEST_INTERVAL_JITTER,
+    LIGHTWEIGHT_FIELDS,
+    PREVIEW_TIME_STRATA,
+    WAREHOUSE_FRESHNESS_SECONDS,
+    WAREHOUSE_RETENTION_SECONDS,
 )
-from .exceptions import ObservationsFetchError
+from .exceptions import FetchCancelledError, ObservationsFetchError
 from .http_client import HTTPClient
+from .observation_parser import (
+    ObservationBatch,
+    ObservationColumns,
+    ObservationParser,
+    ObservationRecord,
+    ObservationSources,
+    StringPool,
+    decode_page,
+)
+from .observation_warehouse import ObservationWarehouse, plan_segments, query_key
+from .polygon_cover import box_params, split_box
+from .polygon_filter import PolygonFilter
+from .projection import PointProjector
+from .sampling import estimate_fetch_seconds, plan_sample
+from .settings import api_rate_limiter
+from .taxonomy import TaxonomyResolver
+from .value_lists import ValueLists
+
+BBOX_KEYS = ("swlat", "swlng", "nelat", "nelng")
 
 
 class FetchObservationsThread(QThread):
     progress_updated = pyqtSignal(int)
-    fetch_completed = pyqtSignal(list)
+    fetch_completed = pyqtSignal(int)
     fetch_failed = pyqtSignal(str)
-    batch_fetched = pyqtSignal(list)
+    # Emits a list of records, or the columns of a page from the decode pool.
+    batch_fetched = pyqtSignal(object)
 
-    def __init__(self, form_params: Dict[str, Any]) -> None:
+    def __init__(
+        self,
+        form_params: Dict[str, Any],
+        cancellation_token: Optional[CancellationToken] = None,
+        warehouse: Optional[ObservationWarehouse] = None,
+        polygon_filter: Optional[PolygonFilter] = None,
+        lightweight: bool = False,
+        taxonomy: Optional[TaxonomyResolver] = None,
+        decode_pool: Optional[Executor] = None,
+        value_lists: Optional[ValueLists] = None,
+        projector: Optional[PointProjector] = None,
+    ) -> None:
         super().__init__()
         self.form_params: Dict[str, Any] = form_params
-        self._is_running = True
+        self.cancellation_token = cancellation_token or CancellationToken()
+        self.warehouse = warehouse
+        self.polygon_filter = polygon_filter
+        self.lightweight = lightweight
+        self.taxonomy = taxonomy
+        self.decode_pool = decode_pool
+        self.value_lists = value_lists
+        self.projector = projector
+        self.sources: Optional[ObservationSources] = None
+        self.queries: List[Dict[str, Any]] = self.split_queries([form_params])
+        self.rate_limiter = api_rate_limiter()
+
+    def split_queries(self, queries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Split each query into the boxes covering the polygon filter, if any."""
+        if self.polygon_filter is None:
+            return queries
+        return [
+            box_query
+            for query in queries
+            for box_query in self.polygon_filter.queries(query)
+        ]
 
     def run(self) -> None:
         try:
-            total_files: int = self.get_total_files(self.form_params)
-            if total_files == 0:
-                self.fetch_failed.emit("No observations found for the given criteria.")
-                return
-            if total_files >= API_MAX_TOTAL_RECORDS:
-                self.fetch_failed.emit(
-                    f"Total records exceed the maximum limit of {API_MAX_TOTAL_RECORDS}. "
-                    "Please refine your search criteria."
+            with HTTPClient(cancellation_token=self.cancellation_token) as client:
+                if self.value_lists is not None:
+                    packed_queries, self.sources = self.value_lists.resolve(
+                        self.wait_for_next_request
+                    )
+                    self.queries = self.split_queries(packed_queries)
+                query_totals: List[int] = [
+                    self.get_total_files(client, query) for query in self.queries
+                ]
+                total_files: int = sum(query_totals)
+                if total_files == 0:
+                    self.fetch_failed.emit(
+                        "No observations found for the given criteria."
+                    )
+                    return
+                if total_files >= API_MAX_TOTAL_RECORDS:
+                    self.fetch_failed.emit(
+                        f"Total records exceed the maximum limit of {API_MAX_TOTAL_RECORDS}. "
+                        "Please refine your search criteria."
+                    )
+                    return
+                # Shared across pages so repeated names and dates are stored once.
+                string_pool = StringPool()
+
+                if self.warehouse is not None:
+                    downloaded_size = self.fetch_into_warehouse(
+                        client, self.warehouse, total_files, string_pool
+                    )
+                else:
+                    downloaded_size = self.fetch_pages(
+                        client, query_totals, string_pool
+                    )
+
+                self.progress_updated.emit(100)
+                self.fetch_completed.emit(downloaded_size)
+
+        except FetchCancelledError:
+            self.fetch_failed.emit("You stopped the data fetch from the API.")
+        except Exception as e:
+            self.fetch_failed.emit(f"Error: {str(e)}")
+
+    def fetch_pages(
+        self, client: HTTPClient, query_totals: List[int], string_pool: StringPool
+    ) -> int:
+        """Fetch every page of each query and return the number of results kept."""
+        total_files: int = sum(query_totals)
+        downloaded_size: int = 0
+        kept_size: int = 0
+        # Covering boxes share edges, so the same observation may come twice.
+        seen_ids: Set[int] = set()
+
+        for query, query_total in zip(self.queries, query_totals):
+            for page in range(1, self.calculate_batches(query_total) + 1):
+                self.wait_for_next_request()
+
+                params = {
+                    **query,
+                    "page": page,
+                    "per_page": API_BATCH_SIZE,
+                }
+                if self.lightweight:
+                    params["fields"] = self.lightweight_fields()
+
+                result_ids, records = self.fetch_records(
+                    client,
+                    params,
+                    page,
+                    (
+                        API_OBSERVATIONS_V2_URL
+                        if self.lightweight
+                        else API_OBSERVATIONS_BASE_URL
+                    ),
+                    string_pool,
                 )
-                return
-            results: List[Dict[str, Any]] = []
-            total_pages: int = self.calculate_batches(total_files)
-            downloaded_size: int = 0
-
-            with HTTPClient() as client:
-                for page in range(1, total_pages + 1):
-                    if not self._is_running:
-                        self.fetch_failed.emit(
-                            "You stopped the data fetch from the API."
-                        )
-                        return
+                if self.cancellation_token.is_cancelled:
+                    raise FetchCancelledError("Fetch cancelled.")
 
-                    params = {
-                        **self.form_params,
-                        "page": page,
-                        "per_page": API_BATCH_SIZE,
-                    }
+                downloaded_size += len(result_ids)
+                self.update_progress(total_files, downloaded_size)
 
-                    chunk_results: List[Dict[str, Any]] = self.fetch_page(
-                        client, params, page
-                    )
-                    results.extend(chunk_results)
+                if not isinstance(records, ObservationColumns):
+                    if len(self.queries) > 1:
+                        records = self.drop_seen(records, seen_ids)
+                    if self.polygon_filter is not None:
+                        records = self.polygon_filter.clip(records)
+                    self.enrich(client, records)
+                    records = self.project(records)
+                kept_size += len(records)
+                self.batch_fetched.emit(records)
 
-                    downloaded_size += len(chunk_results)
-                    self.update_progress(total_files, downloaded_size)
-                    self.batch_fetched.emit(chunk_results)
+        return kept_size
 
-                    time.sleep(1.1 + (0.4 * random.random()))  # nosec B311
+    @staticmethod
+    def drop_seen(
+        records: List[ObservationRecord], seen_ids: Set[int]
+    ) -> List[ObservationRecord]:
+        new_records = [
+            record for record in records if record.observation_id not in seen_ids
+        ]
+        seen_ids.update(record.observation_id for record in new_records)
+        return new_records
 
-                self.progress_updated.emit(100)
-                self.fetch_completed.emit(results)
+    def enrich(self, client: HTTPClient, records: List[ObservationRecord]) -> None:
+        """Add lineage ranks to the records when taxonomy enrichment is on."""
+        if self.taxonomy is not None and records:
+            self.taxonomy.enrich(client, records, self.wait_for_next_request)
+
+    def project(self, records: List[ObservationRecord]) -> List[ObservationRecord]:
+        """
+        Add coordinates in the layer CRS when the layer is not in EPSG:4326.
+
+        Records the layer CRS cannot represent are left out.
+        """
+        if self.projector is None:
+            return records
+        return self.projector.project(records)
+
+    def fetch_into_warehouse(
+        self,
+        client: HTTPClient,
+        warehouse: ObservationWarehouse,
+        total_files: int,
+        string_pool: StringPool,
+    ) -> int:
+        """
+        Fetch the query in id order into the warehouse.
+
+        Id ranges the warehouse already holds for this query are only
+        re-requested for observations updated since they were stored.
+        """
+        warehouse.prune(WAREHOUSE_RETENTION_SECONDS)
+        key = query_key(self.form_params)
+        held_size = warehouse.count(key)
+        downloaded_size: int = 0
+        page: int = 0
+
+        segments = plan_segments(
+            warehouse.fresh_ranges(key, WAREHOUSE_FRESHNESS_SECONDS)
+        )
+        for segment in segments:
+            cursor = segment.id_above
+            while True:
+                self.wait_for_next_request()
+                page += 1
+
+                params: Dict[str, Any] = {
+                    **self.form_params,
+                    "order_by": "id",
+                    "order": "asc",
+                    "id_above": cursor,
+                    "per_page": API_BATCH_SIZE,
+                }
+                if segment.id_below is not None:
+                    params["id_below"] = segment.id_below
+                if segment.updated_since is not None:
+                    params["updated_since"] = segment.updated_since
+
+                chunk_results = self.fetch_page(client, params, page)
+                if self.cancellation_token.is_cancelled:
+                    raise FetchCancelledError("Fetch cancelled.")
 
+                records = ObservationParser.parse_records(chunk_results, string_pool)
+                warehouse.upsert(records, key)
+
+                exhausted = len(chunk_results) < API_BATCH_SIZE
+                if chunk_results:
+                    last_id = max(result.get("id", cursor) for result in chunk_results)
+                else:
+                    last_id = cursor
+                if exhausted and segment.id_below is not None:
+                    last_id = segment.id_below - 1
+                warehouse.add_coverage(key, segment.id_above + 1, last_id)
+
+                downloaded_size += len(chunk_results)
+                if segment.updated_since is None:
+                    held_size += len(chunk_results)
+                self.update_progress(total_files, held_size)
+                self.batch_fetched.emit(records)
+
+                if exhausted:
+                    break
+                cursor = last_id
+
+        return downloaded_size
+
+    def lightweight_fields(self) -> str:
+        if self.sources is None:
+            return LIGHTWEIGHT_FIELDS
+        return f"{LIGHTWEIGHT_FIELDS},{ObservationSources.FIELDS}"
+
+    def wait_for_next_request(self) -> None:
+        if not self.rate_limiter.wait(self.cancellation_token):
+            raise FetchCancelledError("Fetch cancelled.")
+
+    def fetch_records(
+        self,
+        client: HTTPClient,
+        params: Dict[str, Any],
+        page: int,
+        url: str,
+        string_pool: StringPool,
+    ) -> Tuple[List[int], ObservationBatch]:
+        """
+        Fetch and parse a single page, returning its result ids and records.
+
+        With a decode pool, the raw response is decoded and parsed in a worker
+        process and only the compact columns come back to this process. The
+        columns are returned as they are, to be turned straight into
+        features, unless the records are needed to drop duplicates, clip,
+        enrich or project them.
+        """
+        if self.decode_pool is None:
+            chunk_results = self.fetch_page(client, params, page, url)
+            records = ObservationParser.parse_records(
+                chunk_results, string_pool, self.sources
+            )
+            result_ids = [
+                result["id"] for result in chunk_results if result.get("id") is not None
+            ]
+            return result_ids, records
+
+        try:
+            content = client.get_bytes(url, params=params)
+            decoded = self.decode_pool.submit(
+                decode_page, content, self.sources
+            ).result()
+        except FetchCancelledError:
+            raise
         except Exception as e:
-            self.fetch_failed.emit(f"Error: {str(e)}")
+            raise ObservationsFetchError(f"API request failed on page {page}: {e}")
+        if self.needs_records():
+            return list(decoded.result_ids), decoded.columns.records(string_pool)
+        return list(decoded.result_ids), decoded.columns
+
+    def needs_records(self) -> bool:
+        """Return whether fetched pages are processed record by record."""
+        return (
+            len(self.queries) > 1
+            or self.polygon_filter is not None
+            or self.taxonomy is not None
+            or self.projector is not None
+        )
 
     def fetch_page(
-        self, client: HTTPClient, params: Dict[str, Any], page: int
+        self,
+        client: HTTPClient,
+        params: Dict[str, Any],
+        page: int,
+        url: str = API_OBSERVATIONS_BASE_URL,
     ) -> List[Dict[str, Any]]:
         """Fetch a single page of observations."""
         try:
-            response_data = client.get(API_OBSERVATIONS_BASE_URL, params=params)
+            response_data = client.get(url, params=params)
             return response_data.get("results", [])
+        except FetchCancelledError:
+            raise
         except Exception as e:
             raise ObservationsFetchError(f"API request failed on page {page}: {e}")
 
-    def get_total_files(self, params: Dict[str, Any]) -> int:
+    def get_total_files(self, client: HTTPClient, params: Dict[str, Any]) -> int:
         """Get the total number of observations available."""
+        self.wait_for_next_request()
         try:
-            with HTTPClient() as client:
-                response_data = client.get(API_OBSERVATIONS_BASE_URL, params=params)
-                return response_data.get("total_results", 0)
+            response_data = client.get(
+                API_OBSERVATIONS_BASE_URL, params={**params, "per_page": 0}
+            )
+            return response_data.get("total_results", 0)
+        except FetchCancelledError:
+            raise
         except Exception as e:
             raise ObservationsFetchError(
                 f"Failed to fetch total observation count: {e}"
@@ -103,7 +372,215 @@ class FetchObservationsThread(QThread):
         self.progress_updated.emit(min(progress, 100))
 
     def stop(self):
-        self._is_running = False
+        self.cancellation_token.cancel()
+
+
+class FetchPreviewThread(FetchObservationsThread):
+    """
+    Fetches a small stratified sample of a query instead of every page.
+
+    Emits the sample as one batch, then the full result count and an
+    estimate of how long the complete download would take.
+    """
+
+    preview_completed = pyqtSignal(int, int, float)
+
+    def __init__(
+        self,
+        form_params: Dict[str, Any],
+        sample_size: int,
+        cancellation_token: Optional[CancellationToken] = None,
+        taxonomy: Optional[TaxonomyResolver] = None,
+    ) -> None:
+        super().__init__(form_params, cancellation_token, taxonomy=taxonomy)
+        self.sample_size = sample_size
+        self.request_seconds: List[float] = []
+
+    def run(self) -> None:
+        try:
+            with HTTPClient(cancellation_token=self.cancellation_token) as client:
+                first = self.fetch_edge(client, "asc")
+                total_files: int = first.get("total_results", 0)
+                if total_files == 0:
+                    self.fetch_failed.emit(
+                        "No observations found for the given criteria."
+                    )
+                    return
+                last = self.fetch_edge(client, "desc")
+                min_id = first["results"][0]["id"]
+                max_id = last["results"][0]["id"]
+
+                strata = plan_sample(
+                    min_id,
+                    max_id,
+                    self.sample_size,
+                    self.sample_areas(),
+                    time_strata=PREVIEW_TIME_STRATA,
+                    max_per_page=API_BATCH_SIZE,
+                )
+                string_pool = StringPool()
+                seen_ids: Set[int] = set()
+                records: List[ObservationRecord] = []
+                for index, stratum in enumerate(strata, start=1):
+                    params: Dict[str, Any] = {
+                        **self.form_params,
+                        **stratum.bbox,
+                        "order_by": "id",
+                        "order": "asc",
+                        "id_above": stratum.id_above,
+                        "id_below": stratum.id_below,
+                        "per_page": stratum.per_page,
+                    }
+                    chunk_results = self.timed_fetch(client, params, index)
+                    records.extend(
+                        self.drop_seen(
+                            ObservationParser.parse_records(chunk_results, string_pool),
+                            seen_ids,
+                        )
+                    )
+                    self.progress_updated.emit(int(index / len(strata) * 100))
+
+                self.enrich(client, records)
+                if self.cancellation_token.is_cancelled:
+                    raise FetchCancelledError("Fetch cancelled.")
+                self.batch_fetched.emit(records)
+                self.preview_completed.emit(
+                    len(records), total_files, self.estimate_seconds(total_files)
+                )
+
+        except FetchCancelledError:
+            self.fetch_failed.emit("You stopped the data fetch from the API.")
+        except Exception as e:
+            self.fetch_failed.emit(f"Error: {str(e)}")
+
+    def sample_areas(self) -> List[Dict[str, float]]:
+        """Split the query bounding box, or the world, into quadrants."""
+        if all(key in self.form_params for key in BBOX_KEYS):
+            box = (
+                self.form_params["swlng"],
+                self.form_params["swlat"],
+                self.form_params["nelng"],
+                self.form_params["nelat"],
+            )
+        else:
+            box = (-180.0, -90.0, 180.0, 90.0)
+        return [box_params(quadrant) for quadrant in split_box(box)]
+
+    def fetch_edge(self, client: HTTPClient, order: str) -> Dict[str, Any]:
+        """Fetch the first observation in id order, ascending or descending."""
+        self.wait_for_next_request()
+        params = {**self.form_params, "order_by": "id", "order": order, "per_page": 1}
+        started_at = time.monotonic()
+        try:
+            response_data = client.get(API_OBSERVATIONS_BASE_URL, params=params)
+        except FetchCancelledError:
+            raise
+        except Exception as e:
+            raise ObservationsFetchError(f"Failed to fetch the id range: {e}")
+        self.request_seconds.append(time.monotonic() - started_at)
+        return response_data
+
+    def timed_fetch(
+        self, client: HTTPClient, params: Dict[str, Any], page: int
+    ) -> List[Dict[str, Any]]:
+        self.wait_for_next_request()
+        started_at = time.monotonic()
+        chunk_results = self.fetch_page(client, params, page)
+        self.request_seconds.append(time.monotonic() - started_at)
+        return chunk_results
+
+    def estimate_seconds(self, total_files: int) -> float:
+        mean_request_seconds = sum(self.request_seconds) / max(
+            len(self.request_seconds), 1
+        )
+        return estimate_fetch_seconds(
+            total_files,
+            API_BATCH_SIZE,
+            API_MIN_REQUEST_INTERVAL + API_REQUEST_INTERVAL_JITTER / 2,
+            mean_request_seconds,
+        )
+
+
+class FetchObservationsByIdThread(FetchObservationsThread):
+    """
+    Fetches a known list of observations by id.
+
+    Ids are sent as comma-separated id lists the size of the API limit, so
+    10,000 ids take 50 requests. Ids the API no longer returns are emitted
+    once the fetch is complete.
+    """
+
+    ids_missing = pyqtSignal(list)
+
+    def __init__(
+        self,
+        observation_ids: List[int],
+        cancellation_token: Optional[CancellationToken] = None,
+        lightweight: bool = False,
+        taxonomy: Optional[TaxonomyResolver] = None,
+        decode_pool: Optional[Executor] = None,
+        projector: Optional[PointProjector] = None,
+    ) -> None:
+        super().__init__(
+            {},
+            cancellation_token,
+            lightweight=lightweight,
+            taxonomy=taxonomy,
+            decode_pool=decode_pool,
+            projector=projector,
+        )
+        self.observation_ids = observation_ids
+
+    def run(self) -> None:
+        try:
+            with HTTPClient(cancellation_token=self.cancellation_token) as client:
+                string_pool = StringPool()
+                returned_ids: Set[int] = set()
+                kept_size: int = 0
+                chunks = list(chunked(self.observation_ids, API_MAX_IDS_PER_REQUEST))
+
+                for page, chunk in enumerate(chunks, start=1):
+                    self.wait_for_next_request()
+
+                    params: Dict[str, Any] = {
+                        "id": ",".join(str(id_) for id_ in chunk),
+                        "per_page": len(chunk),
+                    }
+                    if self.lightweight:
+                        params["fields"] = LIGHTWEIGHT_FIELDS
+
+                    result_ids, records = self.fetch_records(
+                        client,
+                        params,
+                        page,
+                        (
+                            API_OBSERVATIONS_V2_URL
+                            if self.lightweight
+                            else API_OBSERVATIONS_BASE_URL
+                        ),
+                        string_pool,
+                    )
+                    if self.cancellation_token.is_cancelled:
+                        raise FetchCancelledError("Fetch cancelled.")
+
+                    returned_ids.update(result_ids)
+                    if not isinstance(records, ObservationColumns):
+                        self.enrich(client, records)
+                        records = self.project(records)
+                    kept_size += len(records)
+                    self.update_progress(len(chunks), page)
+                    self.batch_fetched.emit(records)
+
+                self.ids_missing.emit(
+                    [id_ for id_ in self.observation_ids if id_ not in returned_ids]
+                )
+                self.progress_updated.emit(100)
+                self.fetch_completed.emit(kept_size)
+
+        except FetchCancelledError:
+            self.fetch_failed.emit("You stopped the data fetch from the API.")
+        except Exception as e:
+            self.fetch_failed.emit(f"Error: {str(e)}")
 
 
 class Observations:
@@ -117,6 +594,14 @@ class Observations:
         on_progress_updated,
         on_fetch_completed,
         on_fetch_failed,
+        cancellation_token: Optional[CancellationToken] = None,
+        warehouse: Optional[ObservationWarehouse] = None,
+        polygon_filter: Optional[PolygonFilter] = None,
+        lightweight: bool = False,
+        taxonomy: Optional[TaxonomyResolver] = None,
+        decode_pool: Optional[Executor] = None,
+        value_lists: Optional[ValueLists] = None,
+        projector: Optional[PointProjector] = None,
     ) -> None:
         """Fetch observations with provided callbacks.
 
@@ -126,10 +611,110 @@ class Observations:
             on_progress_updated: Callback for progress updates
             on_fetch_completed: Callback for when fetch completes
             on_fetch_failed: Callback for when fetch fails
+            cancellation_token: Token cancelled by stop_fetching, shared with
+                the caller so late batches can be discarded
+            warehouse: Optional local warehouse the observations are stored in
+            polygon_filter: Optional polygon the observations are clipped to
+            lightweight: Fetch only ids, coordinates, species and dates
+            taxonomy: Optional resolver adding lineage ranks to each batch
+            decode_pool: Optional process pool decoding and parsing pages
+            value_lists: Optional species, user and place lists whose union
+                is fetched, with each observation labelled by its source
+            projector: Optional projector adding coordinates in the layer CRS
+                to each batch
+        """
+        self.thread = FetchObservationsThread(
+            form_params,
+            cancellation_token,
+            warehouse,
+            polygon_filter,
+            lightweight,
+            taxonomy,
+            decode_pool,
+            value_lists,
+            projector,
+        )
+        self.thread.batch_fetched.connect(on_batch_fetched)
+        self.thread.progress_updated.connect(on_progress_updated)
+        self.thread.fetch_completed.connect(on_fetch_completed)
+        self.thread.fetch_failed.connect(on_fetch_failed)
+        self.thread.start()
+
+    def preview(
+        self,
+        form_params: Dict[str, Any],
+        sample_size: int,
+        on_batch_fetched,
+        on_progress_updated,
+        on_preview_completed,
+        on_fetch_failed,
+        cancellation_token: Optional[CancellationToken] = None,
+        taxonomy: Optional[TaxonomyResolver] = None,
+    ) -> None:
+        """Fetch a stratified sample of the query with provided callbacks.
+
+        Args:
+            form_params: Parameters for the API request
+            sample_size: Approximate number of observations to fetch
+            on_batch_fetched: Callback receiving the sampled observations
+            on_progress_updated: Callback for progress updates
+            on_preview_completed: Callback receiving the sample size, the full
+                result count and the estimated full download time in seconds
+            on_fetch_failed: Callback for when fetch fails
+            cancellation_token: Token cancelled by stop_fetching
+            taxonomy: Optional resolver adding lineage ranks to the sample
+        """
+        self.thread = FetchPreviewThread(
+            form_params, sample_size, cancellation_token, taxonomy
+        )
+        self.thread.batch_fetched.connect(on_batch_fetched)
+        self.thread.progress_updated.connect(on_progress_updated)
+        self.thread.preview_completed.connect(on_preview_completed)
+        self.thread.fetch_failed.connect(on_fetch_failed)
+        self.thread.start()
+
+    def fetch_by_ids(
+        self,
+        observation_ids: List[int],
+        on_batch_fetched,
+        on_progress_updated,
+        on_fetch_completed,
+        on_fetch_failed,
+        on_ids_missing,
+        cancellation_token: Optional[CancellationToken] = None,
+        lightweight: bool = False,
+        taxonomy: Optional[TaxonomyResolver] = None,
+        decode_pool: Optional[Executor] = None,
+        projector: Optional[PointProjector] = None,
+    ) -> None:
+        """Fetch a list of observations by id with provided callbacks.
+
+        Args:
+            observation_ids: Ids of the observations to fetch
+            on_batch_fetched: Callback for when a batch is fetched
+            on_progress_updated: Callback for progress updates
+            on_fetch_completed: Callback for when fetch completes
+            on_fetch_failed: Callback for when fetch fails
+            on_ids_missing: Callback receiving the ids the API did not return,
+                called before on_fetch_completed
+            cancellation_token: Token cancelled by stop_fetching
+            lightweight: Fetch only ids, coordinates, species and dates
+            taxonomy: Optional resolver adding lineage ranks to each batch
+            decode_pool: Optional process pool decoding and parsing pages
+            projector: Optional projector adding coordinates in the layer CRS
+                to each batch
         """
-        self.thread = FetchObservationsThread(form_params)
+        self.thread = FetchObservationsByIdThread(
+            observation_ids,
+            cancellation_token,
+            lightweight,
+            taxonomy,
+            decode_pool,
+            projector,
+        )
         self.thread.batch_fetched.connect(on_batch_fetched)
         self.thread.progress_updated.connect(on_progress_updated)
+        self.thread.ids_missing.connect(on_ids_missing)
         self.thread.fetch_completed.connect(on_fetch_completed)
         self.thread.fetch_failed.connect(on_fetch_failed)
         self.thread.start()
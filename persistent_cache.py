@@ -0,0 +1,97 @@
+import json
+import os
+import sqlite3
+import time
+from contextlib import closing
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+
+class PersistentCache:
+    """
+    SQLite-backed key/value cache whose entries expire after a time-to-live.
+
+    Values are stored as JSON under a namespace so several subsystems can
+    share one cache file. A new connection is opened per operation, which
+    keeps the cache safe to use from worker threads.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = path
+        self.ttl = ttl
+        self.clock = clock
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with closing(self.connect()) as connection, connection:
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS cache_entries (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    stored_at REAL NOT NULL,
+                    PRIMARY KEY (namespace, key)
+                )
+                """
+            )
+
+    def connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=10)
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        """Return the cached value, or None if it is missing or expired."""
+        return self.get_many(namespace, [key]).get(key)
+
+    def get_many(self, namespace: str, keys: Iterable[str]) -> Dict[str, Any]:
+        """Return the fresh cached values for the given keys."""
+        keys = list(keys)
+        if not keys:
+            return {}
+
+        oldest_fresh = self.clock() - self.ttl
+        values: Dict[str, Any] = {}
+        with closing(self.connect()) as connection:
+            # Stay well below SQLite's limit on bound parameters.
+            for start in range(0, len(keys), 500):
+                chunk = keys[start : start + 500]
+                placeholders = ", ".join("?" for _ in chunk)
+                rows = connection.execute(
+                    "SELECT key, value FROM cache_entries "
+                    f"WHERE namespace = ? AND key IN ({placeholders}) "  # nosec B608
+                    "AND stored_at >= ?",
+                    [namespace, *chunk, oldest_fresh],
+                )
+                for key, value in rows:
+                    values[key] = json.loads(value)
+        return values
+
+    def set(self, namespace: str, key: str, value: Any) -> None:
+        self.set_many(namespace, [(key, value)])
+
+    def set_many(self, namespace: str, items: Iterable[Tuple[str, Any]]) -> None:
+        stored_at = self.clock()
+        with closing(self.connect()) as connection, connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO cache_entries "
+                "(namespace, key, value, stored_at) VALUES (?, ?, ?, ?)",
+                [
+                    (namespace, key, json.dumps(value), stored_at)
+                    for key, value in items
+                ],
+            )
+
+    def delete_expired(self) -> int:
+        """Remove expired entries and return how many were deleted."""
+        with closing(self.connect()) as connection, connection:
+            cursor = connection.execute(
+                "DELETE FROM cache_entries WHERE stored_at < ?",
+                (self.clock() - self.ttl,),
+            )
+            return cursor.rowcount
@@ -1,9 +1,8 @@
 from typing import Optional
 
-import requests
-
-from .constants import API_DEFAULT_TIMEOUT, API_PLACES_BASE_URL
-from .exceptions import PlacesFetchError
+from .constants import API_PLACES_BASE_URL
+from .exceptions import InaturalistAPIError, PlacesFetchError
+from .http_client import HTTPClient
 
 
 class Places:
@@ -20,17 +19,17 @@ class Places:
         Raises:
             PlacesFetchError: If the API request fails
         """
-        url = f"{API_PLACES_BASE_URL}?q={country_name}"
-
         try:
-            response = requests.get(url, timeout=API_DEFAULT_TIMEOUT)
-            response.raise_for_status()
-        except requests.RequestException as e:
+            with HTTPClient() as client:
+                response_data = client.get(
+                    API_PLACES_BASE_URL, params={"q": country_name}
+                )
+        except InaturalistAPIError as e:
             raise PlacesFetchError(
                 f"Failed to fetch place ID for '{country_name}': {e}"
             )
 
-        data = response.json().get("results", [])
+        data = response_data.get("results", [])
 
         # Find first valid country-level place (admin_level=0)
         for place in data:
@@ -0,0 +1,84 @@
+import heapq
+from typing import Callable, Dict, List, Tuple
+
+# (min_x, min_y, max_x, max_y) in degrees.
+Box = Tuple[float, float, float, float]
+
+OUTSIDE = 0
+PARTIAL = 1
+INSIDE = 2
+
+
+def box_area(box: Box) -> float:
+    return (box[2] - box[0]) * (box[3] - box[1])
+
+
+def split_box(box: Box) -> List[Box]:
+    """Split a box into its four quadrants."""
+    min_x, min_y, max_x, max_y = box
+    mid_x = (min_x + max_x) / 2.0
+    mid_y = (min_y + max_y) / 2.0
+    return [
+        (min_x, min_y, mid_x, mid_y),
+        (mid_x, min_y, max_x, mid_y),
+        (min_x, mid_y, mid_x, max_y),
+        (mid_x, mid_y, max_x, max_y),
+    ]
+
+
+def cover_boxes(
+    extent: Box,
+    classify: Callable[[Box], int],
+    max_boxes: int = 16,
+    max_depth: int = 6,
+) -> List[Box]:
+    """
+    Cover a shape with a few non-overlapping boxes.
+
+    Starting from the shape extent, the largest box only partly inside the
+    shape is split into quadrants and quadrants outside the shape are
+    dropped, until splitting again would exceed max_boxes.
+
+    Args:
+        extent: Bounding box of the shape
+        classify: Returns OUTSIDE, PARTIAL or INSIDE for a box
+        max_boxes: Upper bound on the number of boxes returned
+        max_depth: Deepest quadrant subdivision level
+    """
+    done: List[Box] = []
+    # Max-heap of splittable boxes by area; the counter keeps ordering stable.
+    heap: List[Tuple[float, int, int, Box]] = [(-box_area(extent), 0, 0, extent)]
+    counter = 1
+
+    while heap:
+        _, _, depth, box = heap[0]
+        if depth >= max_depth:
+            heapq.heappop(heap)
+            done.append(box)
+            continue
+
+        children = [
+            (child, state)
+            for child in split_box(box)
+            for state in (classify(child),)
+            if state != OUTSIDE
+        ]
+        if len(done) + len(heap) - 1 + len(children) > max_boxes:
+            break
+
+        heapq.heappop(heap)
+        for child, state in children:
+            if state == INSIDE:
+                done.append(child)
+            else:
+                heapq.heappush(heap, (-box_area(child), counter, depth + 1, child))
+                counter += 1
+
+    done.extend(box for _, _, _, box in heap)
+    return sorted(done)
+
+
+def box_params(box: Box) -> Dict[str, float]:
+    """Return a box as iNaturalist bounding box parameters."""
+    min_x, min_y, max_x, max_y = box
+    return {"swlat": min_y, "swlng": min_x, "nelat": max_y, "nelng": max_x}
@@ -0,0 +1,83 @@
+from typing import Any, Dict, List
+
+from qgis.core import (
+    QgsCoordinateReferenceSystem,
+    QgsCoordinateTransform,
+    QgsGeometry,
+    QgsPoint,
+    QgsProject,
+    QgsRectangle,
+    QgsVectorLayer,
+)
+
+from .constants import POLYGON_FILTER_MAX_BOXES, POLYGON_FILTER_MAX_DEPTH
+from .observation_parser import ObservationRecord
+from .polygon_cover import INSIDE, OUTSIDE, PARTIAL, Box, box_params, cover_boxes
+
+
+class PolygonFilter:
+    """
+    Restricts a query to an arbitrary polygon.
+
+    The polygon is covered by a few bounding boxes, each fetched as its own
+    query, and observations outside the polygon are dropped against a
+    prepared geometry before any feature is built.
+    """
+
+    def __init__(self, geometry: QgsGeometry) -> None:
+        if geometry.isEmpty():
+            raise ValueError("The polygon filter has no geometry.")
+
+        self.geometry = geometry
+        self.engine = QgsGeometry.createGeometryEngine(geometry.constGet())
+        self.engine.prepareGeometry()
+
+        extent = geometry.boundingBox()
+        self.boxes: List[Box] = cover_boxes(
+            (
+                extent.xMinimum(),
+                extent.yMinimum(),
+                extent.xMaximum(),
+                extent.yMaximum(),
+            ),
+            self.classify,
+            max_boxes=POLYGON_FILTER_MAX_BOXES,
+            max_depth=POLYGON_FILTER_MAX_DEPTH,
+        )
+
+    @classmethod
+    def from_layer(
+        cls, layer: QgsVectorLayer, selected_only: bool = False
+    ) -> "PolygonFilter":
+        """Dissolve the (selected) polygons of a layer into one WGS84 filter."""
+        features = layer.selectedFeatures() if selected_only else layer.getFeatures()
+        geometry = QgsGeometry.unaryUnion(
+            [feature.geometry() for feature in features if feature.hasGeometry()]
+        )
+        if geometry.isNull() or geometry.isEmpty():
+            raise ValueError(f"Layer '{layer.name()}' has no polygons to filter by.")
+
+        wgs84 = QgsCoordinateReferenceSystem("EPSG:4326")
+        if layer.crs() != wgs84:
+            geometry.transform(
+                QgsCoordinateTransform(layer.crs(), wgs84, QgsProject.instance())
+            )
+        return cls(geometry)
+
+    def classify(self, box: Box) -> int:
+        rectangle = QgsGeometry.fromRect(QgsRectangle(*box))
+        if not self.engine.intersects(rectangle.constGet()):
+            return OUTSIDE
+        if self.engine.contains(rectangle.constGet()):
+            return INSIDE
+        return PARTIAL
+
+    def queries(self, form_params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Return one query per covering box, replacing any other bbox."""
+        return [{**form_params, **box_params(box)} for box in self.boxes]
+
+    def contains(self, record: ObservationRecord) -> bool:
+        return self.engine.intersects(QgsPoint(record.lon, record.lat))
+
+    def clip(self, records: List[ObservationRecord]) -> List[ObservationRecord]:
+        return [record for record in records if self.contains(record)]
@@ -0,0 +1,568 @@
+from typing import Any, Callable, Dict, List, Optional
+
+from PyQt5.QtCore import QDate, Qt
+from qgis.core import (
+    QgsCoordinateReferenceSystem,
+    QgsFeatureSink,
+    QgsFields,
+    QgsProcessing,
+    QgsProcessingAlgorithm,
+    QgsProcessingContext,
+    QgsProcessingException,
+    QgsProcessingFeedback,
+    QgsProcessingParameterBoolean,
+    QgsProcessingParameterCrs,
+    QgsProcessingParameterDateTime,
+    QgsProcessingParameterEnum,
+    QgsProcessingParameterExtent,
+    QgsProcessingParameterFeatureSink,
+    QgsProcessingParameterFeatureSource,
+    QgsProcessingParameterField,
+    QgsProcessingParameterNumber,
+    QgsProcessingParameterString,
+    QgsWkbTypes,
+)
+
+from .cancellation import CancellationToken
+from .constants import (
+    GEOPRIVACY_OPTIONS,
+    ICONIC_TAXA,
+    QUALITY_GRADES,
+    RESOLVER_CACHE_TTL,
+    RESPONSE_CACHE_TTL,
+    TAXONOMY_CACHE_TTL,
+)
+from .exceptions import FetchCancelledError
+from .form_data import FormData
+from .id_list import parse_ids, parse_values
+from .observation_parser import ObservationRecord
+from .observations import FetchObservationsByIdThread, FetchObservationsThread
+from .persistent_cache import PersistentCache
+from .projection import PointProjector
+from .qgis_layer_helper import QgisLayerHelper
+from .resolver import IdResolver
+from .settings import api_rate_limiter, cache_path
+from .summaries import FetchSpeciesCountsThread
+from .summary_parser import SpeciesCount
+from .taxonomy import TaxonomyResolver
+from .value_lists import ValueLists
+
+WGS84 = QgsCoordinateReferenceSystem("EPSG:4326")
+
+
+class InaturalistAlgorithm(QgsProcessingAlgorithm):
+    """
+    Base of the iNaturalist algorithms.
+
+    The fetch threads of the dialog do the work, but their run() is called
+    directly: Processing already runs algorithms off the GUI thread, so
+    batches are written to the sink in the Processing worker thread as
+    they arrive.
+    """
+
+    OUTPUT = "OUTPUT"
+    CRS = "CRS"
+
+    def group(self) -> str:
+        return "iNaturalist"
+
+    def groupId(self) -> str:
+        return "inaturalist"
+
+    def createInstance(self) -> "InaturalistAlgorithm":
+        return type(self)()
+
+    def add_crs_parameter(self) -> None:
+        self.addParameter(
+            QgsProcessingParameterCrs(self.CRS, "Output CRS", defaultValue="EPSG:4326")
+        )
+
+    def projector(
+        self, parameters: Dict[str, Any], context: QgsProcessingContext
+    ) -> Optional[PointProjector]:
+        """Return the projector to the output CRS, or None to keep EPSG:4326."""
+        crs = self.parameterAsCrs(parameters, self.CRS, context)
+        if not crs.isValid() or crs.authid() == WGS84.authid():
+            return None
+        return PointProjector(crs, context.transformContext())
+
+    def run_fetch(
+        self,
+        thread: Any,
+        on_batch_fetched: Callable[[list], None],
+        feedback: QgsProcessingFeedback,
+    ) -> int:
+        """
+        Run a fetch thread's work in the calling thread.
+
+        Returns:
+            The size reported by the fetch
+
+        Raises:
+            QgsProcessingException: If the fetch fails or is cancelled
+        """
+        outcome: Dict[str, Any] = {}
+
+        def fetch_completed(size: int) -> None:
+            outcome["size"] = size
+
+        def fetch_failed(message: str) -> None:
+            outcome["error"] = message
+
+        thread.batch_fetched.connect(on_batch_fetched, Qt.DirectConnection)
+        thread.progress_updated.connect(feedback.setProgress, Qt.DirectConnection)
+        thread.fetch_completed.connect(fetch_completed, Qt.DirectConnection)
+        thread.fetch_failed.connect(fetch_failed, Qt.DirectConnection)
+        feedback.canceled.connect(thread.stop, Qt.DirectConnection)
+        try:
+            if feedback.isCanceled():
+                thread.stop()
+            thread.run()
+        finally:
+            feedback.canceled.disconnect(thread.stop)
+
+        if "error" in outcome:
+            raise QgsProcessingException(outcome["error"])
+        return outcome.get("size", 0)
+
+
+class FilterAlgorithm(InaturalistAlgorithm):
+    """Base of the algorithms taking the filters of the dialog."""
+
+    TAXA = "TAXA"
+    USERS = "USERS"
+    PLACES = "PLACES"
+    DATE_FROM = "DATE_FROM"
+    DATE_TO = "DATE_TO"
+    EXTENT = "EXTENT"
+    ACCURACY = "ACCURACY"
+    QUALITY = "QUALITY"
+    PHOTOS = "PHOTOS"
+    ICONIC_TAXA = "ICONIC_TAXA"
+    WILD = "WILD"
+    GEOPRIVACY = "GEOPRIVACY"
+
+    def add_filter_parameters(self) -> None:
+        self.addParameter(
+            QgsProcessingParameterString(
+                self.TAXA,
+                "Taxon names or ids (separated by commas or semicolons)",
+                optional=True,
+            )
+        )
+        self.addParameter(
+            QgsProcessingParameterString(
+                self.USERS,
+                "Usernames or user ids (separated by commas or semicolons)",
+                optional=True,
+            )
+        )
+        self.addParameter(
+            QgsProcessingParameterString(
+                self.PLACES,
+                "Place names or ids (separated by commas or semicolons)",
+                optional=True,
+            )
+        )
+        for name, description in (
+            (self.DATE_FROM, "Observed from"),
+            (self.DATE_TO, "Observed until"),
+        ):
+            self.addParameter(
+                QgsProcessingParameterDateTime(
+                    name,
+                    description,
+                    type=QgsProcessingParameterDateTime.Date,
+                    optional=True,
+                )
+            )
+        self.addParameter(
+            QgsProcessingParameterExtent(self.EXTENT, "Extent", optional=True)
+        )
+        self.addParameter(
+            QgsProcessingParameterNumber(
+                self.ACCURACY,
+                "Positional accuracy below (meters)",
+                minValue=1,
+                optional=True,
+            )
+        )
+        self.addParameter(
+            QgsProcessingParameterEnum(
+                self.QUALITY,
+                "Quality grade",
+                options=list(QUALITY_GRADES),
+                defaultValue=0,
+            )
+        )
+        self.addParameter(
+            QgsProcessingParameterBoolean(
+                self.PHOTOS, "Only observations with photos", defaultValue=False
+            )
+        )
+        self.addParameter(
+            QgsProcessingParameterEnum(
+                self.ICONIC_TAXA,
+                "Iconic taxa",
+                options=list(ICONIC_TAXA),
+                allowMultiple=True,
+                optional=True,
+            )
+        )
+        self.addParameter(
+            QgsProcessingParameterBoolean(
+                self.WILD, "Exclude captive and cultivated", defaultValue=False
+            )
+        )
+        self.addParameter(
+            QgsProcessingParameterEnum(
+                self.GEOPRIVACY,
+                "Geoprivacy",
+                options=list(GEOPRIVACY_OPTIONS),
+                defaultValue=0,
+            )
+        )
+
+    def value_lists(
+        self, parameters: Dict[str, Any], context: QgsProcessingContext
+    ) -> ValueLists:
+        """
+        Read the filters into the form data and name lists of the query.
+
+        Every name goes through the resolver, so unknown names fail the
+        algorithm instead of silently matching nothing.
+        """
+        extent = self.parameterAsExtent(parameters, self.EXTENT, context, WGS84)
+        accuracy = (
+            self.parameterAsInt(parameters, self.ACCURACY, context)
+            if parameters.get(self.ACCURACY) is not None
+            else None
+        )
+        form_data = FormData(
+            username="",
+            species="",
+            date_from=self.date_parameter(parameters, self.DATE_FROM, context),
+            date_to=self.date_parameter(parameters, self.DATE_TO, context),
+            country_id=None,
+            bbox=(
+                None
+                if extent.isNull() or extent.isEmpty()
+                else {
+                    "swlat": extent.yMinimum(),
+                    "swlng": extent.xMinimum(),
+                    "nelat": extent.yMaximum(),
+                    "nelng": extent.xMaximum(),
+                }
+            ),
+            positional_accuracy_below_meters=accuracy,
+            quality_grade=list(QUALITY_GRADES.values())[
+                self.parameterAsEnum(parameters, self.QUALITY, context)
+            ],
+            photos=(
+                True
+                if self.parameterAsBoolean(parameters, self.PHOTOS, context)
+                else None
+            ),
+            iconic_taxa=[
+                ICONIC_TAXA[index]
+                for index in self.parameterAsEnums(
+                    parameters, self.ICONIC_TAXA, context
+                )
+            ]
+            or None,
+            captive=(
+                False
+                if self.parameterAsBoolean(parameters, self.WILD, context)
+                else None
+            ),
+            geoprivacy=list(GEOPRIVACY_OPTIONS.values())[
+                self.parameterAsEnum(parameters, self.GEOPRIVACY, context)
+            ],
+        )
+        return ValueLists(
+            form_data,
+            IdResolver(PersistentCache(cache_path(), RESOLVER_CACHE_TTL)),
+            parse_values(self.parameterAsString(parameters, self.TAXA, context)),
+            parse_values(self.parameterAsString(parameters, self.USERS, context)),
+            parse_values(self.parameterAsString(parameters, self.PLACES, context)),
+        )
+
+    def date_parameter(
+        self, parameters: Dict[str, Any], name: str, context: QgsProcessingContext
+    ) -> Optional[str]:
+        value: QDate = self.parameterAsDate(parameters, name, context)
+        if value.isNull() or not value.isValid():
+            return None
+        return value.toString("yyyy-MM-dd")
+
+
+class FetchObservationsAlgorithm(FilterAlgorithm):
+    TAXONOMY = "TAXONOMY"
+
+    def name(self) -> str:
+        return "fetchobservations"
+
+    def displayName(self) -> str:
+        return "Fetch observations"
+
+    def shortHelpString(self) -> str:
+        return (
+            "Loads the iNaturalist observations matching the filters as points. "
+            "Several taxa, users or places can be listed; their observations are "
+            "fetched together and a source column names the entries each one "
+            "matches. Points in another output CRS than EPSG:4326 keep their "
+            "latitude and longitude as columns."
+        )
+
+    def initAlgorithm(self, config=None) -> None:
+        self.add_filter_parameters()
+        self.addParameter(
+            QgsProcessingParameterBoolean(
+                self.TAXONOMY,
+                "Add taxonomy columns (kingdom, order, family, genus)",
+                defaultValue=False,
+            )
+        )
+        self.add_crs_parameter()
+        self.addParameter(
+            QgsProcessingParameterFeatureSink(
+                self.OUTPUT, "Observations", QgsProcessing.TypeVectorPoint
+            )
+        )
+
+    def processAlgorithm(
+        self,
+        parameters: Dict[str, Any],
+        context: QgsProcessingContext,
+        feedback: QgsProcessingFeedback,
+    ) -> Dict[str, Any]:
+        value_lists = self.value_lists(parameters, context)
+        taxonomy = self.parameterAsBoolean(parameters, self.TAXONOMY, context)
+        source = bool(value_lists.species or value_lists.users or value_lists.places)
+        projector = self.projector(parameters, context)
+
+        helper = QgisLayerHelper()
+        sink, dest_id = self.parameterAsSink(
+            parameters,
+            self.OUTPUT,
+            context,
+            helper.observation_fields(taxonomy, source, projector is not None),
+            QgsWkbTypes.Point,
+            WGS84 if projector is None else projector.crs,
+        )
+        if sink is None:
+            raise QgsProcessingException(self.invalidSinkError(parameters, self.OUTPUT))
+
+        def add_batch(records: List[ObservationRecord]) -> None:
+            if records:
+                sink.addFeatures(
+                    helper.observation_features(
+                        records,
+                        taxonomy=taxonomy,
+                        source=source,
+                        projected=projector is not None,
+                    ),
+                    QgsFeatureSink.FastInsert,
+                )
+
+        thread = FetchObservationsThread(
+            {},
+            CancellationToken(),
+            taxonomy=(
+                TaxonomyResolver(PersistentCache(cache_path(), TAXONOMY_CACHE_TTL))
+                if taxonomy
+                else None
+            ),
+            value_lists=value_lists,
+            projector=projector,
+        )
+        count = self.run_fetch(thread, add_batch, feedback)
+        feedback.pushInfo(f"Loaded {count} observations.")
+        return {self.OUTPUT: dest_id}
+
+
+class FetchByIdsAlgorithm(InaturalistAlgorithm):
+    INPUT = "INPUT"
+    FIELD = "FIELD"
+    TAXONOMY = "TAXONOMY"
+
+    def name(self) -> str:
+        return "fetchbyids"
+
+    def displayName(self) -> str:
+        return "Fetch observations by id list"
+
+    def shortHelpString(self) -> str:
+        return (
+            "Loads the observations whose ids or observation URLs are listed in a "
+            "field of the input table or layer. Ids the API no longer returns are "
+            "reported in the log. Points in another output CRS than EPSG:4326 keep "
+            "their latitude and longitude as columns."
+        )
+
+    def initAlgorithm(self, config=None) -> None:
+        self.addParameter(
+            QgsProcessingParameterFeatureSource(
+                self.INPUT, "Table or layer with ids", [QgsProcessing.TypeVector]
+            )
+        )
+        self.addParameter(
+            QgsProcessingParameterField(
+                self.FIELD, "Observation id field", parentLayerParameterName=self.INPUT
+            )
+        )
+        self.addParameter(
+            QgsProcessingParameterBoolean(
+                self.TAXONOMY,
+                "Add taxonomy columns (kingdom, order, family, genus)",
+                defaultValue=False,
+            )
+        )
+        self.add_crs_parameter()
+        self.addParameter(
+            QgsProcessingParameterFeatureSink(
+                self.OUTPUT, "Observations", QgsProcessing.TypeVectorPoint
+            )
+        )
+
+    def processAlgorithm(
+        self,
+        parameters: Dict[str, Any],
+        context: QgsProcessingContext,
+        feedback: QgsProcessingFeedback,
+    ) -> Dict[str, Any]:
+        source = self.parameterAsSource(parameters, self.INPUT, context)
+        if source is None:
+            raise QgsProcessingException(
+                self.invalidSourceError(parameters, self.INPUT)
+            )
+        field = self.parameterAsString(parameters, self.FIELD, context)
+        try:
+            observation_ids = parse_ids(
+                feature[field] for feature in source.getFeatures()
+            )
+        except ValueError as e:
+            raise QgsProcessingException(str(e))
+        if not observation_ids:
+            raise QgsProcessingException(f"No observation ids found in '{field}'.")
+        taxonomy = self.parameterAsBoolean(parameters, self.TAXONOMY, context)
+        projector = self.projector(parameters, context)
+
+        helper = QgisLayerHelper()
+        sink, dest_id = self.parameterAsSink(
+            parameters,
+            self.OUTPUT,
+            context,
+            helper.observation_fields(taxonomy, projected=projector is not None),
+            QgsWkbTypes.Point,
+            WGS84 if projector is None else projector.crs,
+        )
+        if sink is None:
+            raise QgsProcessingException(self.invalidSinkError(parameters, self.OUTPUT))
+
+        def add_batch(records: List[ObservationRecord]) -> None:
+            if records:
+                sink.addFeatures(
+                    helper.observation_features(
+                        records, taxonomy=taxonomy, projected=projector is not None
+                    ),
+                    QgsFeatureSink.FastInsert,
+                )
+
+        def report_missing(missing_ids: List[int]) -> None:
+            if missing_ids:
+                feedback.pushWarning(
+                    f"{len(missing_ids)} observations no longer exist or are not "
+                    f"public: {', '.join(str(id_) for id_ in missing_ids)}"
+                )
+
+        thread = FetchObservationsByIdThread(
+            observation_ids,
+            CancellationToken(),
+            taxonomy=(
+                TaxonomyResolver(PersistentCache(cache_path(), TAXONOMY_CACHE_TTL))
+                if taxonomy
+                else None
+            ),
+            projector=projector,
+        )
+        thread.ids_missing.connect(report_missing, Qt.DirectConnection)
+        count = self.run_fetch(thread, add_batch, feedback)
+        feedback.pushInfo(f"Loaded {count} observations.")
+        return {self.OUTPUT: dest_id}
+
+
+class SpeciesCountsAlgorithm(FilterAlgorithm):
+    def name(self) -> str:
+        return "speciescounts"
+
+    def displayName(self) -> str:
+        return "Species counts"
+
+    def shortHelpString(self) -> str:
+        return (
+            "Counts the observations matching the filters per taxon with the "
+            "server-side species counts endpoint and writes them to a table."
+        )
+
+    def initAlgorithm(self, config=None) -> None:
+        self.add_filter_parameters()
+        self.addParameter(
+            QgsProcessingParameterFeatureSink(
+                self.OUTPUT, "Species counts", QgsProcessing.TypeVector
+            )
+        )
+
+    def processAlgorithm(
+        self,
+        parameters: Dict[str, Any],
+        context: QgsProcessingContext,
+        feedback: QgsProcessingFeedback,
+    ) -> Dict[str, Any]:
+        cancellation_token = CancellationToken()
+        feedback.canceled.connect(cancellation_token.cancel, Qt.DirectConnection)
+        try:
+            rate_limiter = api_rate_limiter()
+
+            def before_request() -> None:
+                if not rate_limiter.wait(cancellation_token):
+                    raise FetchCancelledError("Fetch cancelled.")
+
+            queries, _ = self.value_lists(parameters, context).resolve(before_request)
+        except FetchCancelledError:
+            raise QgsProcessingException("You stopped the data fetch from the API.")
+        except ValueError as e:
+            raise QgsProcessingException(str(e))
+        finally:
+            feedback.canceled.disconnect(cancellation_token.cancel)
+        if len(queries) > 1:
+            # Counts of separate requests cannot be added up per taxon.
+            raise QgsProcessingException(
+                "Too many taxa, users or places listed for species counts."
+            )
+
+        fields: QgsFields = QgisLayerHelper.species_counts_fields()
+        sink, dest_id = self.parameterAsSink(
+            parameters,
+            self.OUTPUT,
+            context,
+            fields,
+            QgsWkbTypes.NoGeometry,
+            QgsCoordinateReferenceSystem(),
+        )
+        if sink is None:
+            raise QgsProcessingException(self.invalidSinkError(parameters, self.OUTPUT))
+
+        def add_batch(counts: List[SpeciesCount]) -> None:
+            sink.addFeatures(
+                QgisLayerHelper.species_counts_features(counts, fields),
+                QgsFeatureSink.FastInsert,
+            )
+
+        thread = FetchSpeciesCountsThread(
+            queries[0],
+            response_cache=PersistentCache(cache_path(), RESPONSE_CACHE_TTL),
+        )
+        count = self.run_fetch(thread, add_batch, feedback)
+        feedback.pushInfo(f"Counted {count} taxa.")
+        return {self.OUTPUT: dest_id}
@@ -0,0 +1,33 @@
+import os
+
+from qgis.core import QgsProcessingProvider
+from qgis.PyQt.QtGui import QIcon
+
+from .processing_algorithms import (
+    FetchByIdsAlgorithm,
+    FetchObservationsAlgorithm,
+    SpeciesCountsAlgorithm,
+)
+
+
+class InaturalistProvider(QgsProcessingProvider):
+    """Processing provider making the fetches usable in models and batches."""
+
+    def id(self) -> str:
+        return "inaturalist"
+
+    def name(self) -> str:
+        return "iNaturalist"
+
+    def icon(self) -> QIcon:
+        return QIcon(
+            os.path.join(os.path.dirname(__file__), "icons", "iNaturalist.png")
+        )
+
+    def loadAlgorithms(self) -> None:
+        for algorithm in (
+            FetchObservationsAlgorithm(),
+            FetchByIdsAlgorithm(),
+            SpeciesCountsAlgorithm(),
+        ):
+            self.addAlgorithm(algorithm)
@@ -0,0 +1,81 @@
+from typing import List, Optional
+
+from qgis.core import (
+    QgsCoordinateReferenceSystem,
+    QgsCoordinateTransform,
+    QgsCoordinateTransformContext,
+    QgsCsException,
+    QgsGeometry,
+    QgsPointXY,
+    QgsProject,
+)
+
+from .observation_parser import ObservationRecord
+from .wkb import decode_multipoint, encode_multipoint, pack_coordinates
+
+
+class PointProjector:
+    """
+    Projects observation coordinates from EPSG:4326 to the CRS of a layer.
+
+    Each batch is transformed as one multipoint geometry on the fetch
+    thread, so the layer can be stored in the project CRS and QGIS does
+    not reproject every point on every repaint. Points the target CRS
+    cannot represent are dropped.
+    """
+
+    def __init__(
+        self,
+        crs: QgsCoordinateReferenceSystem,
+        transform_context: Optional[QgsCoordinateTransformContext] = None,
+    ) -> None:
+        self.crs = crs
+        self.transform = QgsCoordinateTransform(
+            QgsCoordinateReferenceSystem("EPSG:4326"),
+            crs,
+            transform_context or QgsProject.instance().transformContext(),
+        )
+
+    def project(self, records: List[ObservationRecord]) -> List[ObservationRecord]:
+        """
+        Set x and y of each record to its coordinates in the target CRS.
+
+        When the batch fails to transform as a whole, e.g. because some
+        points lie outside the area of the CRS, the points are transformed
+        one by one instead.
+
+        Returns:
+            The records that could be projected
+        """
+        if not records:
+            return records
+        geometry = QgsGeometry()
+        geometry.fromWkb(
+            bytes(
+                encode_multipoint(
+                    pack_coordinates((record.lon, record.lat) for record in records)
+                )
+            )
+        )
+        try:
+            geometry.transform(self.transform)
+        except QgsCsException:
+            return self.project_each(records)
+        coordinates = decode_multipoint(bytes(geometry.asWkb()))
+        for record, x, y in zip(records, coordinates[0::2], coordinates[1::2]):
+            record.x = x
+            record.y = y
+        return records
+
+    def project_each(self, records: List[ObservationRecord]) -> List[ObservationRecord]:
+        """Project the records one at a time, leaving out those that fail."""
+        projected: List[ObservationRecord] = []
+        for record in records:
+            try:
+                point = self.transform.transform(QgsPointXY(record.lon, record.lat))
+            except QgsCsException:
+                continue
+            record.x = point.x()
+            record.y = point.y()
+            projected.append(record)
+        return projected
@@ -1,13 +1,14 @@
 import time
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
-from PyQt5.QtCore import QVariant
+from PyQt5.QtCore import QDate, Qt, QVariant
 from qgis.core import (
     QgsCoordinateReferenceSystem,
     QgsCoordinateTransform,
     QgsDataProvider,
     QgsFeature,
     QgsField,
+    QgsFields,
     QgsGeometry,
     QgsPointXY,
     QgsProject,
@@ -15,7 +16,42 @@ from qgis.core import (
 )
 from qgis.utils import iface
 
-from .observation_parser import ObservationParser
+from .grid_aggregator import GridAggregator
+from .observation_parser import (
+    INATURALIST_BASE_URL,
+    WIKIPEDIA_BASE_URL,
+    ObservationBatch,
+    batch_values,
+)
+from .observation_warehouse import TABLE_NAME, ObservationWarehouse
+from .summary_parser import HistogramBin, SpeciesCount
+from .taxonomy_parser import TAXONOMY_RANKS
+from .wkb import encode_point
+
+# Expressions deriving the URL columns from the compact keys stored per feature,
+# under the same names as the stored URL columns. The image URL depends on the
+# photo licence, so photo_url links to the photo's page here.
+VIRTUAL_URL_FIELDS = {
+    "photo_url": (
+        "if(\"photo_id\" IS NULL, 'N/A', "
+        f"'{INATURALIST_BASE_URL}/photos/' || \"photo_id\")"
+    ),
+    "observation_url": (
+        "if(\"observation_id\" IS NULL, 'N/A', "
+        f"'{INATURALIST_BASE_URL}/observations/' || \"observation_id\")"
+    ),
+    "wikipedia_url": (
+        "if(\"wikipedia_article\" IS NULL, 'N/A', "
+        f"'{WIKIPEDIA_BASE_URL}' || \"wikipedia_article\")"
+    ),
+    "author_url": (
+        "if(\"user_login\" IS NULL, 'N/A', "
+        f"'{INATURALIST_BASE_URL}/people/' || \"user_login\")"
+    ),
+}
+
+# Columns of lightweight layers left empty until the details are loaded.
+LIGHTWEIGHT_DETAIL_FIELDS = ("location", "user_login", "photo_url", "wikipedia_url")
 
 
 class QgisLayerHelper:
@@ -51,74 +87,461 @@ class QgisLayerHelper:
             "nelng": extent.xMaximum(),
         }
 
-    def create_layer_and_provider(self) -> Tuple[QgsVectorLayer, QgsDataProvider]:
+    def create_layer_and_provider(
+        self,
+        virtual_url_fields: bool = False,
+        lightweight: bool = False,
+        taxonomy: bool = False,
+        source: bool = False,
+        crs: Optional[QgsCoordinateReferenceSystem] = None,
+    ) -> Tuple[QgsVectorLayer, QgsDataProvider]:
+        """
+        Create the in-memory observations layer.
+
+        Args:
+            virtual_url_fields: Store compact keys (observation id, user login,
+                photo id, taxon id, Wikipedia article) and derive the URL
+                columns with expressions instead of storing full URLs per
+                feature; photo_url links to the photo page, not the image
+            lightweight: Store only id, species and date, with empty detail
+                columns filled in when features are selected
+            taxonomy: Add kingdom, order, family and genus columns
+            source: Add a column naming the listed species, users or places
+                each observation was fetched for
+            crs: Store the points in this CRS instead of EPSG:4326, from
+                coordinates projected by the fetch, with latitude and
+                longitude columns
+        """
+        projected = crs is not None
         layer_name = "inat_observations_" + time.strftime("%Y-%m-%d_%H:%M:%S")
-        layer = QgsVectorLayer("Point?crs=EPSG:4326", layer_name, "memory")
+        if crs is None:
+            layer = QgsVectorLayer("Point?crs=EPSG:4326", layer_name, "memory")
+        else:
+            # Custom CRSs have no authid to put in the layer URI.
+            layer = QgsVectorLayer("Point", layer_name, "memory")
+            layer.setCrs(crs)
         provider = layer.dataProvider()
+        extra_fields = self.extra_fields(taxonomy, source, projected)
+        if lightweight:
+            provider.addAttributes(
+                [
+                    QgsField("observation_id", QVariant.LongLong),
+                    QgsField("species", QVariant.String),
+                    QgsField("date", QVariant.String),
+                    QgsField("taxon_id", QVariant.LongLong),
+                ]
+                + [
+                    QgsField(name, QVariant.String)
+                    for name in LIGHTWEIGHT_DETAIL_FIELDS
+                ]
+                + extra_fields
+            )
+            layer.updateFields()
+            for name in ("observation_url", "author_url"):
+                layer.addExpressionField(
+                    VIRTUAL_URL_FIELDS[name], QgsField(name, QVariant.String)
+                )
+            return layer, provider
+        if virtual_url_fields:
+            provider.addAttributes(
+                [
+                    QgsField("species", QVariant.String),
+                    QgsField("date", QVariant.String),
+                    QgsField("location", QVariant.String),
+                    QgsField("observation_id", QVariant.LongLong),
+                    QgsField("user_login", QVariant.String),
+                    QgsField("photo_id", QVariant.LongLong),
+                    QgsField("taxon_id", QVariant.LongLong),
+                    QgsField("positional_accuracy", QVariant.String),
+                    QgsField("wikipedia_article", QVariant.String),
+                ]
+                + extra_fields
+            )
+            layer.updateFields()
+            for name, expression in VIRTUAL_URL_FIELDS.items():
+                layer.addExpressionField(expression, QgsField(name, QVariant.String))
+            return layer, provider
+
         provider.addAttributes(
-            [
-                QgsField("species", QVariant.String),
-                QgsField("date", QVariant.String),
-                QgsField("location", QVariant.String),
-                QgsField("photo_url", QVariant.String),
-                QgsField("observation_url", QVariant.String),
-                QgsField("wikipedia_url", QVariant.String),
-                QgsField("author_url", QVariant.String),
-                QgsField("positional_accuracy", QVariant.String),
-            ]
+            self.observation_fields(taxonomy, source, projected).toList()
         )
         layer.updateFields()
         return layer, provider
 
+    @staticmethod
+    def observation_fields(
+        taxonomy: bool = False, source: bool = False, projected: bool = False
+    ) -> QgsFields:
+        """Return the fields of an observations layer storing full URLs."""
+        fields = QgsFields()
+        for field in [
+            QgsField("species", QVariant.String),
+            QgsField("date", QVariant.String),
+            QgsField("location", QVariant.String),
+            QgsField("photo_url", QVariant.String),
+            QgsField("observation_url", QVariant.String),
+            QgsField("wikipedia_url", QVariant.String),
+            QgsField("author_url", QVariant.String),
+            QgsField("positional_accuracy", QVariant.String),
+        ] + QgisLayerHelper.extra_fields(taxonomy, source, projected):
+            fields.append(field)
+        return fields
+
+    @staticmethod
+    def extra_fields(
+        taxonomy: bool = False, source: bool = False, projected: bool = False
+    ) -> List[QgsField]:
+        """Return the optional lineage, source and coordinate fields, appended last."""
+        fields = (
+            [QgsField(rank, QVariant.String) for rank in TAXONOMY_RANKS]
+            if taxonomy
+            else []
+        )
+        if source:
+            fields.append(QgsField("source", QVariant.String))
+        if projected:
+            fields.append(QgsField("latitude", QVariant.Double))
+            fields.append(QgsField("longitude", QVariant.Double))
+        return fields
+
+    def create_warehouse_layer(
+        self, warehouse: ObservationWarehouse, query_key: str
+    ) -> QgsVectorLayer:
+        """Open the warehouse as a layer filtered to the observations of a query."""
+        layer_name = "inat_observations_" + time.strftime("%Y-%m-%d_%H:%M:%S")
+        layer = QgsVectorLayer(
+            f"{warehouse.path}|layername={TABLE_NAME}", layer_name, "ogr"
+        )
+        layer.setSubsetString(ObservationWarehouse.subset_string(query_key))
+        for name, expression in VIRTUAL_URL_FIELDS.items():
+            layer.addExpressionField(expression, QgsField(name, QVariant.String))
+        return layer
+
+    def update_observation_details(
+        self,
+        layer: QgsVectorLayer,
+        feature_ids: Dict[int, List[int]],
+        details: Dict[int, Dict[str, Optional[str]]],
+    ) -> None:
+        """
+        Fill the detail columns of a lightweight layer.
+
+        Args:
+            layer: Lightweight observations layer
+            feature_ids: Feature ids of the layer for each observation id
+            details: Detail values for each observation id
+        """
+        fields = layer.fields()
+        indexes = {name: fields.indexOf(name) for name in LIGHTWEIGHT_DETAIL_FIELDS}
+        changes: Dict[int, Dict[int, str]] = {}
+        for observation_id, values in details.items():
+            attributes = {
+                indexes[name]: values.get(name) or "N/A"
+                for name in LIGHTWEIGHT_DETAIL_FIELDS
+            }
+            for feature_id in feature_ids.get(observation_id, []):
+                changes[feature_id] = attributes
+        if changes:
+            layer.dataProvider().changeAttributeValues(changes)
+            layer.triggerRepaint()
+
+    def refresh_layer(self, layer: QgsVectorLayer) -> None:
+        """Reload a file-backed layer after its data changed on disk."""
+        layer.dataProvider().reloadData()
+        layer.updateExtents()
+        layer.triggerRepaint()
+
     def add_layer_to_project(self, layer: QgsVectorLayer) -> None:
         QgsProject.instance().addMapLayer(layer)
 
     def add_observations_to_layer(
         self,
-        observations: List[Dict],
+        observations: ObservationBatch,
         layer: QgsVectorLayer,
         provider: QgsDataProvider,
+        virtual_url_fields: bool = False,
+        lightweight: bool = False,
+        taxonomy: bool = False,
+        source: bool = False,
+        projected: bool = False,
     ) -> Optional[List[QgsFeature]]:
         """
         Add observations to the layer and return the features.
 
+        Points are encoded as WKB and attribute rows are built up front, so
+        the per-feature work is reduced to wrapping prepared values before a
+        single addFeatures.
+
         Args:
-            observations: List of raw observation dictionaries from API
+            observations: Parsed observation records, or the columns of a
+                decoded page
             layer: QGIS vector layer to add features to
             provider: Data provider for the layer
+            virtual_url_fields: Whether the layer was created with compact keys
+                in place of stored URL columns
+            lightweight: Whether the layer was created in lightweight mode
+            taxonomy: Whether the layer was created with taxonomy columns
+            source: Whether the layer was created with a source column
+            projected: Whether the layer was created in another CRS than
+                EPSG:4326, with the records holding projected coordinates
 
         Returns:
             List of added features, or None if no valid observations
         """
-        features: List[QgsFeature] = []
+        if not observations:
+            return None
+
+        features = self.observation_features(
+            observations, virtual_url_fields, lightweight, taxonomy, source, projected
+        )
+        provider.addFeatures(features)
+        layer.updateExtents()
+        layer.triggerRepaint()
+        return features
+
+    def observation_features(
+        self,
+        observations: ObservationBatch,
+        virtual_url_fields: bool = False,
+        lightweight: bool = False,
+        taxonomy: bool = False,
+        source: bool = False,
+        projected: bool = False,
+    ) -> List[QgsFeature]:
+        """Build point features for a batch of observations, e.g. for a sink."""
+        blobs = [
+            encode_point(x, y)
+            for x, y in zip(
+                batch_values(observations, "x" if projected else "lon"),
+                batch_values(observations, "y" if projected else "lat"),
+            )
+        ]
+        rows = self.attribute_rows(
+            observations, virtual_url_fields, lightweight, taxonomy, source, projected
+        )
+
+        features: List[QgsFeature] = [QgsFeature() for _ in blobs]
+        for feature, blob, attributes in zip(features, blobs, rows):
+            geometry = QgsGeometry()
+            geometry.fromWkb(blob)
+            feature.setGeometry(geometry)
+            feature.setAttributes(attributes)
+        return features
+
+    @staticmethod
+    def attribute_rows(
+        observations: ObservationBatch,
+        virtual_url_fields: bool = False,
+        lightweight: bool = False,
+        taxonomy: bool = False,
+        source: bool = False,
+        projected: bool = False,
+    ) -> List[list]:
+        """
+        Return the attribute values of each observation in layer field order.
+
+        Values are gathered field by field, so the columns of a decoded page
+        become rows without building a record per observation.
+        """
 
-        for observation in observations:
-            parsed = ObservationParser.parse_observation(observation)
-            if parsed is None:
-                continue
+        def values(name: str, default: Any = None) -> List[Any]:
+            column = batch_values(observations, name)
+            if default is None:
+                return column
+            return [value or default for value in column]
 
+        def accuracies() -> List[Any]:
+            return [
+                "N/A" if value is None else value
+                for value in batch_values(observations, "positional_accuracy")
+            ]
+
+        if lightweight:
+            columns = [
+                values("observation_id"),
+                values("species", "Unknown"),
+                values("observed_on", "N/A"),
+                values("taxon_id"),
+                *([None] * len(observations) for _ in LIGHTWEIGHT_DETAIL_FIELDS),
+            ]
+        elif virtual_url_fields:
+            columns = [
+                values("species", "Unknown"),
+                values("observed_on", "N/A"),
+                values("location", "N/A"),
+                values("observation_id"),
+                values("user_login"),
+                values("photo_id"),
+                values("taxon_id"),
+                accuracies(),
+                values("wikipedia_article"),
+            ]
+        else:
+            columns = [
+                values("species", "Unknown"),
+                values("observed_on", "N/A"),
+                values("location", "N/A"),
+                values("photo_url", "N/A"),
+                values("observation_url", "N/A"),
+                values("wikipedia_url", "N/A"),
+                values("author_url", "N/A"),
+                accuracies(),
+            ]
+
+        if taxonomy:
+            columns.extend(values(rank) for rank in TAXONOMY_RANKS)
+        if source:
+            columns.append(values("source"))
+        if projected:
+            columns.extend((values("lat"), values("lon")))
+        return [list(row) for row in zip(*columns)]
+
+    def create_grid_transform(
+        self, crs: QgsCoordinateReferenceSystem
+    ) -> Optional[QgsCoordinateTransform]:
+        """Return the transform from observation coordinates to the grid CRS."""
+        if crs.authid() == "EPSG:4326":
+            return None
+        return QgsCoordinateTransform(
+            QgsCoordinateReferenceSystem("EPSG:4326"), crs, QgsProject.instance()
+        )
+
+    def add_observations_to_grid(
+        self,
+        observations: ObservationBatch,
+        aggregator: GridAggregator,
+        transform: Optional[QgsCoordinateTransform] = None,
+    ) -> None:
+        """
+        Bin observations into the grid aggregator without keeping them.
+
+        Args:
+            observations: Parsed observation records, or the columns of a
+                decoded page
+            aggregator: Grid aggregator accumulating per-cell counters
+            transform: Optional transform from EPSG:4326 to the grid CRS
+        """
+        for lon, lat, species, observed_on in zip(
+            batch_values(observations, "lon"),
+            batch_values(observations, "lat"),
+            batch_values(observations, "species"),
+            batch_values(observations, "observed_on"),
+        ):
+            point = QgsPointXY(lon, lat)
+            if transform is not None:
+                point = transform.transform(point)
+
+            aggregator.add(point.x(), point.y(), species, observed_on)
+
+    def create_grid_layer(
+        self, aggregator: GridAggregator, crs: QgsCoordinateReferenceSystem
+    ) -> QgsVectorLayer:
+        """Build a polygon layer with one feature per occupied grid cell."""
+        layer_name = "inat_grid_" + time.strftime("%Y-%m-%d_%H:%M:%S")
+        # Custom CRSs have no authid to put in the layer URI.
+        layer = QgsVectorLayer("Polygon", layer_name, "memory")
+        layer.setCrs(crs)
+        provider = layer.dataProvider()
+        provider.addAttributes(
+            [
+                QgsField("count", QVariant.Int),
+                QgsField("species_count", QVariant.Int),
+                QgsField("date_from", QVariant.String),
+                QgsField("date_to", QVariant.String),
+            ]
+        )
+        layer.updateFields()
+
+        features: List[QgsFeature] = []
+        for cell in aggregator.cells():
             feature = QgsFeature()
             feature.setGeometry(
-                QgsGeometry.fromPointXY(QgsPointXY(parsed["lon"], parsed["lat"]))
+                QgsGeometry.fromPolygonXY([[QgsPointXY(x, y) for x, y in cell.polygon]])
+            )
+            feature.setAttributes(
+                [cell.count, cell.species_count, cell.date_from, cell.date_to]
             )
+            features.append(feature)
+
+        provider.addFeatures(features)
+        layer.updateExtents()
+        return layer
+
+    def create_species_counts_layer(self) -> QgsVectorLayer:
+        """Create the non-spatial table layer holding observation counts per taxon."""
+        layer_name = "inat_species_counts_" + time.strftime("%Y-%m-%d_%H:%M:%S")
+        layer = QgsVectorLayer("None", layer_name, "memory")
+        layer.dataProvider().addAttributes(self.species_counts_fields().toList())
+        layer.updateFields()
+        return layer
+
+    @staticmethod
+    def species_counts_fields() -> QgsFields:
+        fields = QgsFields()
+        for field in [
+            QgsField("taxon_id", QVariant.LongLong),
+            QgsField("name", QVariant.String),
+            QgsField("common_name", QVariant.String),
+            QgsField("rank", QVariant.String),
+            QgsField("iconic_taxon", QVariant.String),
+            QgsField("count", QVariant.Int),
+        ]:
+            fields.append(field)
+        return fields
+
+    def add_species_counts_to_layer(
+        self, counts: List[SpeciesCount], layer: QgsVectorLayer
+    ) -> None:
+        layer.dataProvider().addFeatures(
+            self.species_counts_features(counts, layer.fields())
+        )
+
+    @staticmethod
+    def species_counts_features(
+        counts: List[SpeciesCount], fields: QgsFields
+    ) -> List[QgsFeature]:
+        features: List[QgsFeature] = []
+        for species_count in counts:
+            feature = QgsFeature(fields)
             feature.setAttributes(
                 [
-                    parsed["species"],
-                    parsed["date"],
-                    parsed["location"],
-                    parsed["photo_url"],
-                    parsed["observation_url"],
-                    parsed["wikipedia_url"],
-                    parsed["author_url"],
-                    parsed["positional_accuracy"],
+                    species_count.taxon_id,
+                    species_count.name,
+                    species_count.common_name,
+                    species_count.rank,
+                    species_count.iconic_taxon,
+                    species_count.count,
                 ]
             )
             features.append(feature)
+        return features
 
-        if features:
-            provider.addFeatures(features)
-            layer.updateExtents()
-            layer.triggerRepaint()
-            return features
+    def create_histogram_layer(self) -> QgsVectorLayer:
+        """Create the non-spatial table layer holding observation counts per period."""
+        layer_name = "inat_histogram_" + time.strftime("%Y-%m-%d_%H:%M:%S")
+        layer = QgsVectorLayer("None", layer_name, "memory")
+        layer.dataProvider().addAttributes(
+            [
+                QgsField("interval", QVariant.String),
+                QgsField("period_start", QVariant.Date),
+                QgsField("count", QVariant.Int),
+            ]
+        )
+        layer.updateFields()
+        return layer
 
-        return None
+    def add_histogram_to_layer(
+        self, bins: List[HistogramBin], layer: QgsVectorLayer
+    ) -> None:
+        features: List[QgsFeature] = []
+        for histogram_bin in bins:
+            feature = QgsFeature(layer.fields())
+            feature.setAttributes(
+                [
+                    histogram_bin.interval,
+                    QDate.fromString(histogram_bin.period_start[:10], Qt.ISODate),
+                    histogram_bin.count,
+                ]
+            )
+            features.append(feature)
+        layer.dataProvider().addFeatures(features)
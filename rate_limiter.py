@@ -0,0 +1,215 @@
+import os
+import random
+import socket
+import sqlite3
+import time
+from contextlib import closing
+from typing import TYPE_CHECKING, Callable, Optional
+
+if TYPE_CHECKING:
+    from .cancellation import CancellationToken
+
+
+class SharedQuota:
+    """
+    Token bucket shared by every process using the same SQLite file.
+
+    Each request takes one token; tokens refill at a fixed rate up to a
+    small burst. The bucket state is read and updated in one exclusive
+    transaction, so QGIS sessions and headless jobs pointing at the same
+    shared directory together stay within the rate. Wall-clock time is
+    used because monotonic clocks are not comparable across processes.
+
+    Clocks of different hosts may disagree, so the stamp of the last
+    update is only compared directly with the clock of the host that
+    wrote it. A stamp from another host is corrected by the smallest
+    difference seen so far between the two clocks, which never counts a
+    clock offset as elapsed time and never leaves a host waiting for
+    another host's clock.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        rate: float,
+        burst: float = 1.0,
+        name: str = "api",
+        clock: Callable[[], float] = time.time,
+        writer: Optional[str] = None,
+    ) -> None:
+        if rate <= 0 or burst < 1:
+            raise ValueError(
+                "The quota needs a positive rate and a burst of at least 1."
+            )
+        self.path = path
+        self.rate = rate
+        self.burst = burst
+        self.name = name
+        self.clock = clock
+        # Processes of one host share its clock, so the host names the writer.
+        self.writer = writer or socket.gethostname()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with closing(self.connect()) as connection:
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS quota_buckets (
+                    name TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    writer TEXT NOT NULL DEFAULT ''
+                )
+                """
+            )
+            columns = {
+                row[1] for row in connection.execute("PRAGMA table_info(quota_buckets)")
+            }
+            if "writer" not in columns:
+                connection.execute(
+                    "ALTER TABLE quota_buckets ADD COLUMN writer TEXT NOT NULL DEFAULT ''"
+                )
+            # Smallest difference seen between the clock of reader and the
+            # stamps written by writer.
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS quota_clock_offsets (
+                    name TEXT NOT NULL,
+                    reader TEXT NOT NULL,
+                    writer TEXT NOT NULL,
+                    offset_seconds REAL NOT NULL,
+                    PRIMARY KEY (name, reader, writer)
+                )
+                """
+            )
+
+    def connect(self) -> sqlite3.Connection:
+        # Autocommit mode, so acquire controls its own exclusive transaction.
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def acquire(self) -> float:
+        """
+        Take a token if one is available.
+
+        Returns:
+            0.0 if a token was taken, otherwise the seconds until one is due
+        """
+        with closing(self.connect()) as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                now = self.clock()
+                row = connection.execute(
+                    "SELECT tokens, updated_at, writer FROM quota_buckets "
+                    "WHERE name = ?",
+                    (self.name,),
+                ).fetchone()
+                if row is None:
+                    tokens = self.burst
+                else:
+                    elapsed = self.elapsed(connection, now, row[1], row[2])
+                    tokens = min(self.burst, row[0] + elapsed * self.rate)
+
+                if tokens >= 1:
+                    tokens -= 1
+                    delay = 0.0
+                else:
+                    delay = (1 - tokens) / self.rate
+
+                connection.execute(
+                    "INSERT OR REPLACE INTO quota_buckets "
+                    "(name, tokens, updated_at, writer) VALUES (?, ?, ?, ?)",
+                    (self.name, tokens, now, self.writer),
+                )
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+        return delay
+
+    def elapsed(
+        self,
+        connection: sqlite3.Connection,
+        now: float,
+        updated_at: float,
+        writer: str,
+    ) -> float:
+        """Return the seconds since the last update, measured on this clock."""
+        if writer == self.writer:
+            # Never refill backwards if the clock was set back.
+            return max(0.0, now - updated_at)
+
+        difference = now - updated_at
+        row = connection.execute(
+            "SELECT offset_seconds FROM quota_clock_offsets "
+            "WHERE name = ? AND reader = ? AND writer = ?",
+            (self.name, self.writer, writer),
+        ).fetchone()
+        offset = difference if row is None else min(row[0], difference)
+        connection.execute(
+            "INSERT OR REPLACE INTO quota_clock_offsets "
+            "(name, reader, writer, offset_seconds) VALUES (?, ?, ?, ?)",
+            (self.name, self.writer, writer, offset),
+        )
+        return difference - offset
+
+
+class RateLimiter:
+    """
+    Spaces consecutive API requests by a minimum, randomly jittered interval.
+
+    With a shared quota, each request additionally waits for a token of
+    the quota, so limiters in other threads and processes are accounted for.
+    """
+
+    def __init__(
+        self,
+        min_interval: float,
+        jitter: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+        quota: Optional[SharedQuota] = None,
+    ) -> None:
+        self.min_interval = min_interval
+        self.jitter = jitter
+        self.clock = clock
+        self.quota = quota
+        self._last_request_at: Optional[float] = None
+
+    def next_delay(self) -> float:
+        """Return how long to wait before the next request may start."""
+        if self._last_request_at is None:
+            return 0.0
+        interval = self.min_interval + self.jitter * random.random()  # nosec B311
+        return max(0.0, self._last_request_at + interval - self.clock())
+
+    def wait(self, cancellation_token: Optional["CancellationToken"] = None) -> bool:
+        """
+        Block until the next request may start.
+
+        Returns:
+            False if the wait was interrupted by cancellation, True otherwise
+        """
+        if not self.sleep(self.next_delay(), cancellation_token):
+            return False
+
+        if self.quota is not None:
+            delay = self.quota.acquire()
+            while delay:
+                if not self.sleep(delay, cancellation_token):
+                    return False
+                delay = self.quota.acquire()
+
+        self._last_request_at = self.clock()
+        return True
+
+    @staticmethod
+    def sleep(
+        delay: float, cancellation_token: Optional["CancellationToken"] = None
+    ) -> bool:
+        """Sleep for delay seconds, returning False if cancelled meanwhile."""
+        if cancellation_token is not None:
+            return not cancellation_token.wait(delay)
+        if delay:
+            time.sleep(delay)
+        return True
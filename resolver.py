@@ -0,0 +1,169 @@
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .constants import (
+    API_PLACES_BASE_URL,
+    API_TAXA_AUTOCOMPLETE_URL,
+    API_USERS_AUTOCOMPLETE_URL,
+)
+from .exceptions import InaturalistAPIError
+from .http_client import HTTPClient
+from .persistent_cache import PersistentCache
+
+# Cached for names without an exact match, so they are not looked up again.
+NO_MATCH = 0
+
+
+class IdResolver:
+    """
+    Resolves taxon names, usernames and place names to numeric iNaturalist ids.
+
+    Lookups go through the autocomplete endpoints once and are kept in a
+    persistent cache, so later queries can filter by id without the server
+    resolving the name again on every page.
+    """
+
+    TAXA_NAMESPACE = "taxon_ids"
+    USERS_NAMESPACE = "user_ids"
+    PLACES_NAMESPACE = "place_ids"
+
+    def __init__(
+        self,
+        cache: PersistentCache,
+        client_factory: Callable[[], HTTPClient] = HTTPClient,
+    ) -> None:
+        self.cache = cache
+        self.client_factory = client_factory
+
+    def resolve_taxon(
+        self, name: str, before_request: Optional[Callable[[], None]] = None
+    ) -> Optional[int]:
+        """
+        Get the taxon id for a scientific or common name.
+
+        Returns:
+            Taxon id if a taxon has exactly that name, None otherwise
+        """
+        return self.resolve(
+            self.TAXA_NAMESPACE,
+            name,
+            API_TAXA_AUTOCOMPLETE_URL,
+            self.select_taxon,
+            before_request,
+        )
+
+    def resolve_user(
+        self, login: str, before_request: Optional[Callable[[], None]] = None
+    ) -> Optional[int]:
+        """
+        Get the numeric user id for a login.
+
+        Returns:
+            User id if a user with that exact login exists, None otherwise
+        """
+        return self.resolve(
+            self.USERS_NAMESPACE,
+            login,
+            API_USERS_AUTOCOMPLETE_URL,
+            self.select_user,
+            before_request,
+        )
+
+    def resolve_place(
+        self, name: str, before_request: Optional[Callable[[], None]] = None
+    ) -> Optional[int]:
+        """
+        Get the place id for a place name.
+
+        Returns:
+            Place id if a place has exactly that name, None otherwise
+        """
+        return self.resolve(
+            self.PLACES_NAMESPACE,
+            name,
+            API_PLACES_BASE_URL,
+            self.select_place,
+            before_request,
+        )
+
+    @staticmethod
+    def resolve_list(
+        values: Iterable[str],
+        resolve: Callable[[str, Optional[Callable[[], None]]], Optional[int]],
+        before_request: Optional[Callable[[], None]] = None,
+    ) -> Tuple[Dict[int, str], List[str]]:
+        """
+        Resolve a list of names, taking numeric entries as ids.
+
+        Returns:
+            The entry of each resolved id, and the names that were not found
+        """
+        resolved: Dict[int, str] = {}
+        unresolved: List[str] = []
+        for value in values:
+            resolved_id = (
+                int(value) if value.isdigit() else resolve(value, before_request)
+            )
+            if resolved_id is None:
+                unresolved.append(value)
+            else:
+                resolved.setdefault(resolved_id, value)
+        return resolved, unresolved
+
+    def resolve(
+        self,
+        namespace: str,
+        query: str,
+        url: str,
+        select: Callable[[str, List[Dict[str, Any]]], Optional[int]],
+        before_request: Optional[Callable[[], None]] = None,
+    ) -> Optional[int]:
+        key = query.strip().lower()
+        if not key:
+            return None
+
+        cached = self.cache.get(namespace, key)
+        if cached is not None:
+            return None if cached == NO_MATCH else cached
+
+        if before_request is not None:
+            before_request()
+        try:
+            with self.client_factory() as client:
+                response_data = client.get(url, params={"q": query.strip()})
+        except InaturalistAPIError:
+            # Fall back to the raw text filter rather than failing the query.
+            return None
+
+        resolved_id = select(key, response_data.get("results", []))
+        self.cache.set(namespace, key, NO_MATCH if resolved_id is None else resolved_id)
+        return resolved_id
+
+    @staticmethod
+    def select_taxon(key: str, results: List[Dict[str, Any]]) -> Optional[int]:
+        """
+        Return the taxon whose scientific or matched common name is the key.
+
+        Autocomplete also returns prefix matches, so a typo or partial name
+        gives None rather than some other taxon.
+        """
+        for taxon in results:
+            names = (taxon.get("name"), taxon.get("matched_term"))
+            if any(name and name.lower() == key for name in names):
+                return taxon.get("id")
+        return None
+
+    @staticmethod
+    def select_user(key: str, results: List[Dict[str, Any]]) -> Optional[int]:
+        for user in results:
+            if (user.get("login") or "").lower() == key:
+                return user.get("id")
+        return None
+
+    @staticmethod
+    def select_place(key: str, results: List[Dict[str, Any]]) -> Optional[int]:
+        """Return the place whose name or display name is the key."""
+        for place in results:
+            names = (place.get("name"), place.get("display_name"))
+            if any(name and name.lower() == key for name in names):
+                return place.get("id")
+        return None
@@ -0,0 +1,85 @@
+import math
+import random
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+
+@dataclass(frozen=True)
+class SampleStratum:
+    """
+    One request of a preview sample: an id window within an area.
+
+    id_above is a random offset into the id range of the stratum, so the
+    ascending page starts somewhere inside the range instead of at the
+    earliest uploads.
+    """
+
+    id_above: int
+    id_below: int
+    bbox: Dict[str, float]
+    per_page: int
+
+
+def plan_sample(
+    min_id: int,
+    max_id: int,
+    sample_size: int,
+    areas: List[Dict[str, float]],
+    time_strata: int = 4,
+    max_per_page: int = 200,
+    rng: Optional[random.Random] = None,
+) -> List[SampleStratum]:
+    """
+    Spread a sample over id ranges and areas of the query.
+
+    Observation ids grow with upload time, so equal id ranges stand in for
+    time slices; crossing them with a few areas keeps the sample from
+    clustering in one place or period. Each request starts at its own
+    random id within its range, so the picks of a range are not all its
+    first uploads.
+
+    Args:
+        min_id: Lowest observation id matching the query
+        max_id: Highest observation id matching the query
+        sample_size: Approximate number of observations wanted
+        areas: Bounding box parameters splitting the query area
+        time_strata: Number of id ranges
+        max_per_page: Largest page size the API accepts
+        rng: Random source for the window offsets
+    """
+    if max_id < min_id or sample_size <= 0 or not areas:
+        return []
+
+    time_strata = max(1, min(time_strata, max_id - min_id + 1))
+    strata_count = time_strata * len(areas)
+    per_page = max(1, min(max_per_page, math.ceil(sample_size / strata_count)))
+
+    rng = rng or random.Random()  # nosec B311
+    step = (max_id - min_id + 1) / time_strata
+    strata: List[SampleStratum] = []
+    for index in range(time_strata):
+        range_above = min_id - 1 + round(index * step)
+        id_below = min_id + round((index + 1) * step)
+        for area in areas:
+            id_above = rng.randrange(range_above, id_below - 1)
+            strata.append(SampleStratum(id_above, id_below, area, per_page))
+    return strata
+
+
+def estimate_fetch_seconds(
+    total_results: int,
+    batch_size: int,
+    request_interval: float,
+    request_seconds: float,
+) -> float:
+    """Estimate how long a full paged download takes."""
+    pages = math.ceil(total_results / batch_size)
+    return pages * max(request_interval, request_seconds)
+
+
+def format_duration(seconds: float) -> str:
+    minutes = int(math.ceil(seconds / 60))
+    if minutes < 60:
+        return f"{minutes} min"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours} h {minutes} min"
@@ -0,0 +1,58 @@
+import os
+from typing import Optional
+
+from qgis.core import QgsApplication, QgsSettings
+
+from .constants import (
+    API_MIN_REQUEST_INTERVAL,
+    API_REQUEST_INTERVAL_JITTER,
+    CACHE_FILENAME,
+    SHARED_QUOTA_BURST,
+    SHARED_QUOTA_DIR_ENV,
+    SHARED_QUOTA_DIR_SETTING,
+    SHARED_QUOTA_FILENAME,
+    SHARED_QUOTA_RATE,
+    WAREHOUSE_FILENAME,
+)
+from .rate_limiter import RateLimiter, SharedQuota
+
+
+def cache_path(filename: str = CACHE_FILENAME) -> str:
+    """Return the path of a plugin cache file inside the QGIS profile."""
+    return os.path.join(
+        QgsApplication.qgisSettingsDirPath(), "inaturalist", "cache", filename
+    )
+
+
+def warehouse_path(filename: str = WAREHOUSE_FILENAME) -> str:
+    """Return the path of the local observation warehouse GeoPackage."""
+    return os.path.join(QgsApplication.qgisSettingsDirPath(), "inaturalist", filename)
+
+
+def shared_quota_path(filename: str = SHARED_QUOTA_FILENAME) -> Optional[str]:
+    """
+    Return the path of the request quota shared with other processes.
+
+    The directory comes from the environment, for headless jobs, or from
+    the plugin settings; None means requests are only paced per fetch.
+    """
+    directory = os.environ.get(SHARED_QUOTA_DIR_ENV) or QgsSettings().value(
+        SHARED_QUOTA_DIR_SETTING, ""
+    )
+    if not directory:
+        return None
+    return os.path.join(directory, filename)
+
+
+def api_rate_limiter() -> RateLimiter:
+    """Return a limiter for one fetch, drawing from the shared quota if set."""
+    path = shared_quota_path()
+    return RateLimiter(
+        API_MIN_REQUEST_INTERVAL,
+        API_REQUEST_INTERVAL_JITTER,
+        quota=(
+            SharedQuota(path, SHARED_QUOTA_RATE, SHARED_QUOTA_BURST)
+            if path is not None
+            else None
+        ),
+    )
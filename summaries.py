@@ -0,0 +1,269 @@
+from typing import Any, Dict, List, Optional
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from .cancellation import CancellationToken
+from .constants import (
+    API_HISTOGRAM_URL,
+    API_SPECIES_COUNTS_BATCH_SIZE,
+    API_SPECIES_COUNTS_URL,
+    HISTOGRAM_DATE_FIELD,
+)
+from .exceptions import FetchCancelledError, ObservationsFetchError
+from .http_client import HTTPClient
+from .persistent_cache import PersistentCache
+from .settings import api_rate_limiter
+from .summary_parser import (
+    HistogramBin,
+    SummaryParser,
+    year_windows,
+    years_with_observations,
+)
+
+
+class FetchSpeciesCountsThread(QThread):
+    progress_updated = pyqtSignal(int)
+    fetch_completed = pyqtSignal(int)
+    fetch_failed = pyqtSignal(str)
+    batch_fetched = pyqtSignal(list)
+
+    def __init__(
+        self,
+        form_params: Dict[str, Any],
+        cancellation_token: Optional[CancellationToken] = None,
+        response_cache: Optional[PersistentCache] = None,
+    ) -> None:
+        super().__init__()
+        self.form_params = form_params
+        self.cancellation_token = cancellation_token or CancellationToken()
+        self.response_cache = response_cache
+        self.rate_limiter = api_rate_limiter()
+
+    def run(self) -> None:
+        try:
+            with HTTPClient(
+                cancellation_token=self.cancellation_token,
+                response_cache=self.response_cache,
+            ) as client:
+                fetched_size = self.fetch_species_counts(client)
+                if fetched_size == 0:
+                    self.fetch_failed.emit(
+                        "No observations found for the given criteria."
+                    )
+                    return
+                self.progress_updated.emit(100)
+                self.fetch_completed.emit(fetched_size)
+
+        except FetchCancelledError:
+            self.fetch_failed.emit("You stopped the data fetch from the API.")
+        except Exception as e:
+            self.fetch_failed.emit(f"Error: {str(e)}")
+
+    def fetch_species_counts(self, client: HTTPClient) -> int:
+        """Fetch every page of species counts and return the number of taxa."""
+        fetched_size: int = 0
+        page: int = 0
+
+        while True:
+            page += 1
+            params = {
+                **self.form_params,
+                "page": page,
+                "per_page": API_SPECIES_COUNTS_BATCH_SIZE,
+            }
+            if not self.rate_limiter.wait(self.cancellation_token):
+                raise FetchCancelledError("Fetch cancelled.")
+            try:
+                response_data = client.get(API_SPECIES_COUNTS_URL, params=params)
+            except FetchCancelledError:
+                raise
+            except Exception as e:
+                raise ObservationsFetchError(
+                    f"Species counts request failed on page {page}: {e}"
+                )
+
+            results: List[Dict[str, Any]] = response_data.get("results", [])
+            total_results: int = response_data.get("total_results", 0)
+            fetched_size += len(results)
+            if total_results:
+                self.progress_updated.emit(
+                    min(int(fetched_size / total_results * 100), 100)
+                )
+            self.batch_fetched.emit(SummaryParser.parse_species_counts(results))
+
+            if len(results) < API_SPECIES_COUNTS_BATCH_SIZE:
+                break
+            if fetched_size >= total_results:
+                break
+
+        return fetched_size
+
+    def stop(self):
+        self.cancellation_token.cancel()
+
+
+class FetchHistogramThread(QThread):
+    """
+    Fetches observation counts per time interval from the histogram endpoint.
+
+    Year, month and week histograms take one request. Day histograms are
+    requested one year at a time, only for the years a month histogram
+    shows observations in.
+    """
+
+    progress_updated = pyqtSignal(int)
+    fetch_completed = pyqtSignal(int)
+    fetch_failed = pyqtSignal(str)
+    batch_fetched = pyqtSignal(list)
+
+    def __init__(
+        self,
+        form_params: Dict[str, Any],
+        interval: str,
+        cancellation_token: Optional[CancellationToken] = None,
+        response_cache: Optional[PersistentCache] = None,
+    ) -> None:
+        super().__init__()
+        self.form_params = form_params
+        self.interval = interval
+        self.cancellation_token = cancellation_token or CancellationToken()
+        self.response_cache = response_cache
+        self.rate_limiter = api_rate_limiter()
+
+    def run(self) -> None:
+        try:
+            with HTTPClient(
+                cancellation_token=self.cancellation_token,
+                response_cache=self.response_cache,
+            ) as client:
+                observation_count = self.fetch_histogram(client)
+                if observation_count == 0:
+                    self.fetch_failed.emit(
+                        "No observations found for the given criteria."
+                    )
+                    return
+                self.progress_updated.emit(100)
+                self.fetch_completed.emit(observation_count)
+
+        except FetchCancelledError:
+            self.fetch_failed.emit("You stopped the data fetch from the API.")
+        except Exception as e:
+            self.fetch_failed.emit(f"Error: {str(e)}")
+
+    def fetch_histogram(self, client: HTTPClient) -> int:
+        """Fetch the histogram bins and return the number of observations counted."""
+        if self.interval != "day":
+            bins = self.fetch_bins(client, self.form_params, self.interval)
+            self.batch_fetched.emit(bins)
+            return sum(histogram_bin.count for histogram_bin in bins)
+
+        years = years_with_observations(
+            self.fetch_bins(client, self.form_params, "month")
+        )
+        date_from, date_to = self.form_params.get("d1"), self.form_params.get("d2")
+        windows = year_windows(
+            years,
+            str(date_from) if date_from else None,
+            str(date_to) if date_to else None,
+        )
+        observation_count = 0
+        for index, (window_from, window_to) in enumerate(windows, start=1):
+            bins = self.fetch_bins(
+                client, {**self.form_params, "d1": window_from, "d2": window_to}, "day"
+            )
+            observation_count += sum(histogram_bin.count for histogram_bin in bins)
+            self.batch_fetched.emit(bins)
+            self.progress_updated.emit(int(index / len(windows) * 100))
+        return observation_count
+
+    def fetch_bins(
+        self, client: HTTPClient, form_params: Dict[str, Any], interval: str
+    ) -> List[HistogramBin]:
+        if not self.rate_limiter.wait(self.cancellation_token):
+            raise FetchCancelledError("Fetch cancelled.")
+        params = {
+            **form_params,
+            "date_field": HISTOGRAM_DATE_FIELD,
+            "interval": interval,
+        }
+        try:
+            response_data = client.get(API_HISTOGRAM_URL, params=params)
+        except FetchCancelledError:
+            raise
+        except Exception as e:
+            raise ObservationsFetchError(f"Histogram request failed: {e}")
+        return SummaryParser.parse_histogram(response_data.get("results"), interval)
+
+    def stop(self):
+        self.cancellation_token.cancel()
+
+
+class Summaries:
+    def __init__(self) -> None:
+        self.thread: Optional[QThread] = None
+
+    def fetch_species_counts(
+        self,
+        form_params: Dict[str, Any],
+        on_batch_fetched,
+        on_progress_updated,
+        on_fetch_completed,
+        on_fetch_failed,
+        cancellation_token: Optional[CancellationToken] = None,
+        response_cache: Optional[PersistentCache] = None,
+    ) -> None:
+        """Fetch per-taxon observation counts with provided callbacks.
+
+        Args:
+            form_params: Parameters for the API request
+            on_batch_fetched: Callback for each page of species counts
+            on_progress_updated: Callback for progress updates
+            on_fetch_completed: Callback for when fetch completes
+            on_fetch_failed: Callback for when fetch fails
+            cancellation_token: Token cancelled by stop_fetching
+            response_cache: Optional cache answering repeated identical requests
+        """
+        self.thread = FetchSpeciesCountsThread(
+            form_params, cancellation_token, response_cache
+        )
+        self.thread.batch_fetched.connect(on_batch_fetched)
+        self.thread.progress_updated.connect(on_progress_updated)
+        self.thread.fetch_completed.connect(on_fetch_completed)
+        self.thread.fetch_failed.connect(on_fetch_failed)
+        self.thread.start()
+
+    def fetch_histogram(
+        self,
+        form_params: Dict[str, Any],
+        interval: str,
+        on_batch_fetched,
+        on_progress_updated,
+        on_fetch_completed,
+        on_fetch_failed,
+        cancellation_token: Optional[CancellationToken] = None,
+        response_cache: Optional[PersistentCache] = None,
+    ) -> None:
+        """Fetch observation counts per time interval with provided callbacks.
+
+        Args:
+            form_params: Parameters for the API request
+            interval: One of year, month, week or day
+            on_batch_fetched: Callback for each list of histogram bins
+            on_progress_updated: Callback for progress updates
+            on_fetch_completed: Callback receiving the number of observations
+            on_fetch_failed: Callback for when fetch fails
+            cancellation_token: Token cancelled by stop_fetching
+            response_cache: Optional cache answering repeated identical requests
+        """
+        self.thread = FetchHistogramThread(
+            form_params, interval, cancellation_token, response_cache
+        )
+        self.thread.batch_fetched.connect(on_batch_fetched)
+        self.thread.progress_updated.connect(on_progress_updated)
+        self.thread.fetch_completed.connect(on_fetch_completed)
+        self.thread.fetch_failed.connect(on_fetch_failed)
+        self.thread.start()
+
+    def stop_fetching(self) -> None:
+        if self.thread:
+            self.thread.stop()
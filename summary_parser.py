@@ -0,0 +1,82 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class SpeciesCount:
+    taxon_id: Optional[int]
+    name: Optional[str]
+    common_name: Optional[str]
+    rank: Optional[str]
+    iconic_taxon: Optional[str]
+    count: int
+
+
+@dataclass(frozen=True)
+class HistogramBin:
+    interval: str
+    period_start: str
+    count: int
+
+
+class SummaryParser:
+    """Parses the aggregate responses of the observations endpoints."""
+
+    @staticmethod
+    def parse_species_counts(results: Iterable[Dict[str, Any]]) -> List[SpeciesCount]:
+        counts: List[SpeciesCount] = []
+        for result in results:
+            taxon = result.get("taxon") or {}
+            counts.append(
+                SpeciesCount(
+                    taxon_id=taxon.get("id"),
+                    name=taxon.get("name"),
+                    common_name=taxon.get("preferred_common_name"),
+                    rank=taxon.get("rank"),
+                    iconic_taxon=taxon.get("iconic_taxon_name"),
+                    count=result.get("count", 0),
+                )
+            )
+        return counts
+
+    @staticmethod
+    def parse_histogram(
+        results: Optional[Dict[str, Any]], interval: str
+    ) -> List[HistogramBin]:
+        """Return the bins of one histogram interval ordered by period."""
+        bins = (results or {}).get(interval) or {}
+        return [
+            HistogramBin(interval, period_start, count or 0)
+            for period_start, count in sorted(bins.items())
+        ]
+
+
+def years_with_observations(bins: Iterable[HistogramBin]) -> List[int]:
+    """Return the years of the bins holding at least one observation."""
+    return sorted(
+        {
+            int(histogram_bin.period_start[:4])
+            for histogram_bin in bins
+            if histogram_bin.count
+        }
+    )
+
+
+def year_windows(
+    years: Iterable[int], date_from: Optional[str] = None, date_to: Optional[str] = None
+) -> List[Tuple[str, str]]:
+    """
+    Return one (d1, d2) date window per year, clipped to the query range.
+
+    Dates are ISO strings, so clipping compares them as text.
+    """
+    windows: List[Tuple[str, str]] = []
+    for year in years:
+        start, end = f"{year:04d}-01-01", f"{year:04d}-12-31"
+        if date_from and date_from > start:
+            start = date_from
+        if date_to and date_to < end:
+            end = date_to
+        if start <= end:
+            windows.append((start, end))
+    return windows
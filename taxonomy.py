@@ -0,0 +1,85 @@
+from typing import Callable, Dict, Iterable, List, Optional
+
+from .batching import chunked
+from .constants import API_MAX_TAXA_PER_REQUEST, API_TAXA_URL
+from .http_client import HTTPClient
+from .observation_parser import ObservationRecord
+from .persistent_cache import PersistentCache
+from .taxonomy_parser import TAXONOMY_RANKS, TaxonomyParser
+
+TAXONOMY_CACHE_NAMESPACE = "taxon_lineages"
+
+
+class TaxonomyResolver:
+    """
+    Adds kingdom, order, family and genus to observation records.
+
+    The distinct taxon ids of a batch are looked up in the persistent cache
+    first; the rest are fetched with one /taxa/{id,id,...} request per
+    chunk and cached, so each taxon is requested once across all runs.
+    """
+
+    def __init__(self, cache: PersistentCache) -> None:
+        self.cache = cache
+
+    def enrich(
+        self,
+        client: HTTPClient,
+        records: List[ObservationRecord],
+        before_request: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """
+        Set the lineage attributes of records in place.
+
+        Args:
+            client: HTTP client used for taxa not in the cache
+            records: Parsed observation records of one batch
+            before_request: Called before each request, e.g. to rate limit
+        """
+        lineages = self.resolve(
+            client,
+            {record.taxon_id for record in records if record.taxon_id is not None},
+            before_request,
+        )
+        for record in records:
+            lineage = lineages.get(record.taxon_id) or {}
+            for rank in TAXONOMY_RANKS:
+                setattr(record, rank, lineage.get(rank))
+
+    def resolve(
+        self,
+        client: HTTPClient,
+        taxon_ids: Iterable[int],
+        before_request: Optional[Callable[[], None]] = None,
+    ) -> Dict[int, Dict[str, Optional[str]]]:
+        """Return the lineage of each taxon id, fetching uncached ones."""
+        taxon_ids = sorted(set(taxon_ids))
+        cached = self.cache.get_many(
+            TAXONOMY_CACHE_NAMESPACE, [str(taxon_id) for taxon_id in taxon_ids]
+        )
+        lineages = {int(key): value for key, value in cached.items()}
+
+        missing = [taxon_id for taxon_id in taxon_ids if taxon_id not in lineages]
+        for chunk in chunked(missing, API_MAX_TAXA_PER_REQUEST):
+            if before_request is not None:
+                before_request()
+            fetched = self.fetch_lineages(client, chunk)
+            self.cache.set_many(
+                TAXONOMY_CACHE_NAMESPACE,
+                [(str(key), value) for key, value in fetched.items()],
+            )
+            lineages.update(fetched)
+        return lineages
+
+    @staticmethod
+    def fetch_lineages(
+        client: HTTPClient, taxon_ids: List[int]
+    ) -> Dict[int, Dict[str, Optional[str]]]:
+        response_data = client.get(
+            f"{API_TAXA_URL}/{','.join(str(taxon_id) for taxon_id in taxon_ids)}"
+        )
+        lineages = TaxonomyParser.parse_lineages(response_data.get("results", []))
+        # Unknown or inactive taxa are cached empty so they are not retried.
+        for taxon_id in taxon_ids:
+            lineages.setdefault(taxon_id, dict.fromkeys(TAXONOMY_RANKS))
+        return lineages
@@ -0,0 +1,42 @@
+from typing import Any, Dict, Iterable, Optional
+
+# Ranks kept from a taxon's ancestry, in layer column order.
+TAXONOMY_RANKS = ("kingdom", "order", "family", "genus")
+
+
+class TaxonomyParser:
+    """
+    Parses taxa returned by the iNaturalist taxa endpoint.
+    """
+
+    @staticmethod
+    def parse_lineage(taxon: Dict[str, Any]) -> Dict[str, Optional[str]]:
+        """
+        Extract the names of the kept ranks from a taxon and its ancestors.
+
+        A taxon that is itself of a kept rank, such as a genus, fills that
+        rank with its own name.
+
+        Args:
+            taxon: Raw taxon data including its ancestors
+
+        Returns:
+            Name per kept rank, None where the lineage lacks that rank
+        """
+        lineage: Dict[str, Optional[str]] = dict.fromkeys(TAXONOMY_RANKS)
+        for node in [*(taxon.get("ancestors") or []), taxon]:
+            rank = node.get("rank")
+            if rank in lineage and node.get("name"):
+                lineage[rank] = node["name"]
+        return lineage
+
+    @staticmethod
+    def parse_lineages(
+        taxa: Iterable[Dict[str, Any]],
+    ) -> Dict[int, Dict[str, Optional[str]]]:
+        """Return the lineage of each taxon keyed by taxon id."""
+        return {
+            taxon["id"]: TaxonomyParser.parse_lineage(taxon)
+            for taxon in taxa
+            if taxon.get("id") is not None
+        }
@@ -0,0 +1,327 @@
+"""
+Measure how much fetching observations freezes the QGIS event loop.
+
+Each scenario runs the full Observations.fetch -> add_batch_to_layer path
+of the dialog against a local stub API under an offscreen Qt event loop,
+in its own process so peak memory is per scenario. Run from the plugin
+directory with a Python that can import qgis:
+
+    python tests/benchmarks/benchmark_gui_responsiveness.py \\
+        [--scenarios 50x5 200x25 ...] [--latency MS] [--process-pool] \\
+        [--update-baselines]
+
+A scenario PAGExBATCHES serves BATCHES pages of PAGE observations. For
+each one the harness reports the event-loop latency (maximum and 99th
+percentile delay of a 5 ms timer), the time to the first feature, the
+features added per second and the peak RSS. Results are compared with
+tests/benchmarks/baselines/gui_responsiveness.json, and the run fails
+when latency, throughput or memory regress beyond the tolerance, or
+when a scenario has no baseline to compare with; --update-baselines
+stores the current results instead. Requests are not paced during the
+benchmark, so only the client is measured.
+"""
+
+import argparse
+import importlib
+import json
+import os
+import resource
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+PLUGIN_DIR = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+BASELINES_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "baselines", "gui_responsiveness.json"
+)
+DEFAULT_SCENARIOS = ("50x5", "200x5", "200x25")
+TICK_INTERVAL_MS = 5
+# Allowed regression before a result fails against its baseline.
+TOLERANCE = 1.5
+API_BATCH_SIZE = 200
+
+
+def load_plugin_module(name):
+    """Import a plugin module as part of its package so relative imports work."""
+    sys.path.insert(0, os.path.dirname(PLUGIN_DIR))
+    return importlib.import_module(f"{os.path.basename(PLUGIN_DIR)}.{name}")
+
+
+def make_observation(observation_id):
+    return {
+        "id": observation_id,
+        "geojson": {
+            "type": "Point",
+            "coordinates": [
+                -180 + (observation_id * 7.31) % 360,
+                -90 + (observation_id * 3.17) % 180,
+            ],
+        },
+        "observed_on": f"2024-{observation_id % 12 + 1:02d}-01",
+        "place_guess": "Somewhere",
+        "positional_accuracy": 10,
+        "updated_at": "2024-06-01T00:00:00+00:00",
+        "taxon": {
+            "id": 19898 + observation_id % 50,
+            "name": f"Species {observation_id % 50}",
+            "wikipedia_url": "https://en.wikipedia.org/wiki/Strix_aluco",
+        },
+        "user": {"id": 1, "login": "observer"},
+        "observation_photos": [
+            {
+                "photo": {
+                    "id": observation_id,
+                    "url": "https://static.inaturalist.org/photos/1/square.jpg",
+                }
+            }
+        ],
+    }
+
+
+class StubApi(ThreadingHTTPServer):
+    """
+    Local stand-in for the observations endpoint.
+
+    Count requests report enough results for the plugin to request the
+    given number of pages; every page holds page_size observations.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, page_size, batches, latency):
+        super().__init__(("127.0.0.1", 0), StubApiHandler)
+        self.page_size = page_size
+        self.batches = batches
+        self.latency = latency
+
+    def page(self, number):
+        first_id = (number - 1) * self.page_size + 1
+        results = [
+            make_observation(observation_id)
+            for observation_id in range(first_id, first_id + self.page_size)
+        ]
+        return {"total_results": self.total_results, "results": results}
+
+    @property
+    def total_results(self):
+        return self.batches * API_BATCH_SIZE
+
+
+class StubApiHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        params = parse_qs(urlparse(self.path).query)
+        if params.get("per_page") == ["0"]:
+            data = {"total_results": self.server.total_results, "results": []}
+        else:
+            time.sleep(self.server.latency)
+            data = self.server.page(int(params.get("page", ["1"])[0]))
+
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def percentile(values, share):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * share), len(ordered) - 1)]
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS.
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def run_scenario(page_size, batches, latency, process_pool):
+    """Fetch one scenario in this process and return its measurements."""
+    server = StubApi(page_size, batches, latency)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ["INATURALIST_API_URL"] = f"http://127.0.0.1:{server.server_port}"
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    from PyQt5.QtCore import QEventLoop, QTimer
+    from qgis.core import QgsApplication
+
+    application = QgsApplication([], False)
+    application.initQgis()
+
+    rate_limiter = load_plugin_module("rate_limiter")
+    observations = load_plugin_module("observations")
+    dialog_module = load_plugin_module("inaturalist_dialog")
+    cancellation = load_plugin_module("cancellation")
+    # The benchmark measures the client, not the API request pacing.
+    observations.api_rate_limiter = lambda: rate_limiter.RateLimiter(0.0)
+
+    dialog = dialog_module.InaturalistDialog()
+    dialog.cancellation_token = cancellation.CancellationToken()
+    ticks = []
+    timer = QTimer()
+    timer.setInterval(TICK_INTERVAL_MS)
+    timer.timeout.connect(lambda: ticks.append(time.perf_counter()))
+
+    loop = QEventLoop()
+    outcome = {"first_feature_at": None, "features": 0}
+
+    def on_batch_fetched(records):
+        dialog.add_batch_to_layer(records)
+        if records and outcome["first_feature_at"] is None:
+            outcome["first_feature_at"] = time.perf_counter()
+        outcome["features"] += len(records)
+
+    def on_fetch_completed(_size):
+        outcome["finished_at"] = time.perf_counter()
+        loop.quit()
+
+    def on_fetch_failed(message):
+        outcome["error"] = message
+        loop.quit()
+
+    timer.start()
+    started_at = time.perf_counter()
+    ticks.append(started_at)
+    dialog.observations_api.fetch(
+        {"geo": "true"},
+        on_batch_fetched=on_batch_fetched,
+        on_progress_updated=lambda _value: None,
+        on_fetch_completed=on_fetch_completed,
+        on_fetch_failed=on_fetch_failed,
+        cancellation_token=dialog.cancellation_token,
+        decode_pool=dialog_module.get_decode_pool() if process_pool else None,
+    )
+    loop.exec_()
+    timer.stop()
+    dialog.observations_api.thread.wait()
+    server.shutdown()
+    application.exitQgis()
+
+    if "error" in outcome:
+        raise RuntimeError(outcome["error"])
+
+    delays_ms = [
+        max((later - earlier) * 1000 - TICK_INTERVAL_MS, 0.0)
+        for earlier, later in zip(ticks, ticks[1:])
+    ]
+    elapsed = outcome["finished_at"] - started_at
+    return {
+        "page_size": page_size,
+        "batches": batches,
+        "features": outcome["features"],
+        "max_latency_ms": max(delays_ms, default=0.0),
+        "p99_latency_ms": percentile(delays_ms, 0.99),
+        "first_feature_s": (outcome["first_feature_at"] or outcome["finished_at"])
+        - started_at,
+        "features_per_s": outcome["features"] / elapsed if elapsed else 0.0,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def run_in_subprocess(scenario, latency, process_pool):
+    command = [
+        sys.executable,
+        os.path.abspath(__file__),
+        "--child",
+        scenario,
+        "--latency",
+        str(latency),
+    ]
+    if process_pool:
+        command.append("--process-pool")
+    output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def regressions(result, baseline):
+    """Describe the measurements worse than the baseline beyond the tolerance."""
+    found = []
+    for name in ("max_latency_ms", "p99_latency_ms", "first_feature_s", "peak_rss_mb"):
+        # Sub-millisecond latencies are noise, not regressions.
+        limit = max(baseline[name] * TOLERANCE, baseline[name] + 1.0)
+        if result[name] > limit:
+            found.append(f"{name} {result[name]:.2f} > {limit:.2f}")
+    if result["features_per_s"] < baseline["features_per_s"] / TOLERANCE:
+        found.append(
+            f"features_per_s {result['features_per_s']:.0f} < "
+            f"{baseline['features_per_s'] / TOLERANCE:.0f}"
+        )
+    return found
+
+
+def baseline_key(scenario, latency, process_pool):
+    key = f"{scenario}@{latency * 1000:g}ms"
+    return key + "+pool" if process_pool else key
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scenarios", nargs="+", default=list(DEFAULT_SCENARIOS))
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="stub response delay in ms"
+    )
+    parser.add_argument("--process-pool", action="store_true")
+    parser.add_argument("--update-baselines", action="store_true")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    arguments = parser.parse_args()
+    latency = arguments.latency / 1000
+
+    if arguments.child:
+        page_size, batches = (int(value) for value in arguments.child.split("x"))
+        result = run_scenario(page_size, batches, latency, arguments.process_pool)
+        print(json.dumps(result))
+        return 0
+
+    baselines = {}
+    if os.path.exists(BASELINES_PATH):
+        with open(BASELINES_PATH, encoding="utf-8") as baselines_file:
+            baselines = json.load(baselines_file)
+
+    print(
+        f"{'scenario':>16} {'features':>9} {'max ms':>8} {'p99 ms':>8} "
+        f"{'first s':>8} {'feat/s':>9} {'rss MB':>8}"
+    )
+    failures = []
+    for scenario in arguments.scenarios:
+        key = baseline_key(scenario, latency, arguments.process_pool)
+        result = run_in_subprocess(scenario, latency, arguments.process_pool)
+        print(
+            f"{key:>16} {result['features']:>9} {result['max_latency_ms']:>8.1f} "
+            f"{result['p99_latency_ms']:>8.1f} {result['first_feature_s']:>8.2f} "
+            f"{result['features_per_s']:>9.0f} {result['peak_rss_mb']:>8.1f}"
+        )
+        if arguments.update_baselines:
+            baselines[key] = result
+        elif key in baselines:
+            failures.extend(
+                f"{key}: {regression}"
+                for regression in regressions(result, baselines[key])
+            )
+        else:
+            failures.append(f"{key}: no baseline; store one with --update-baselines")
+
+    if arguments.update_baselines:
+        os.makedirs(os.path.dirname(BASELINES_PATH), exist_ok=True)
+        with open(BASELINES_PATH, "w", encoding="utf-8") as baselines_file:
+            json.dump(baselines, baselines_file, indent=2, sort_keys=True)
+            baselines_file.write("\n")
+        print(f"Baselines written to {BASELINES_PATH}")
+        return 0
+
+    for failure in failures:
+        print(f"FAILED {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+"""
+Compare the per-feature and WKB paths for adding observations to a layer.
+
+Run from the plugin directory with a Python that can import qgis:
+
+    python tests/benchmarks/benchmark_layer_ingestion.py [sizes...]
+
+The wkb step compares packing each point with strided bulk encoding of
+a batch, the layer step the QgsPointXY path with the plugin's WKB one.
+Without qgis only the pure WKB encoding step is measured.
+"""
+
+import importlib
+import os
+import random
+import sys
+import time
+
+PLUGIN_DIR = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+DEFAULT_SIZES = (10_000, 100_000)
+
+
+def load_plugin_module(name):
+    """Import a plugin module as part of its package so relative imports work."""
+    sys.path.insert(0, os.path.dirname(PLUGIN_DIR))
+    return importlib.import_module(f"{os.path.basename(PLUGIN_DIR)}.{name}")
+
+
+def load_pure_module(name):
+    """Import a plugin module without Qt dependencies on its own."""
+    sys.path.insert(0, PLUGIN_DIR)
+    return importlib.import_module(name)
+
+
+def make_records(record_class, size):
+    random.seed(size)
+    return [
+        record_class(
+            observation_id=index,
+            lat=random.uniform(-90, 90),
+            lon=random.uniform(-180, 180),
+            species="Strix aluco",
+            taxon_id=19898,
+            observed_on="2024-05-01",
+            photo_url="https://static.inaturalist.org/photos/1/medium.jpg",
+            photo_id=1,
+            user_login="observer",
+            location="Somewhere",
+        )
+        for index in range(size)
+    ]
+
+
+def timed(function, *args):
+    started_at = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - started_at
+
+
+def benchmark_wkb(wkb, records):
+    def per_point():
+        return [wkb.encode_point(record.lon, record.lat) for record in records]
+
+    def bulk():
+        # Strided bulk encoding then splitting, measured slower than per_point.
+        data = bytes(
+            wkb.encode_points(
+                wkb.pack_coordinates((record.lon, record.lat) for record in records)
+            )
+        )
+        return [
+            data[start : start + wkb.WKB_POINT_SIZE]
+            for start in range(0, len(data), wkb.WKB_POINT_SIZE)
+        ]
+
+    return timed(per_point), timed(bulk)
+
+
+def benchmark_layers(layer_helper_module, records):
+    from qgis.core import QgsFeature, QgsGeometry, QgsPointXY
+
+    helper = layer_helper_module.QgisLayerHelper()
+
+    def per_feature():
+        # The ingestion path before the WKB one.
+        layer, provider = helper.create_layer_and_provider()
+        features = []
+        for observation in records:
+            parsed = observation.as_dict()
+            feature = QgsFeature()
+            feature.setGeometry(
+                QgsGeometry.fromPointXY(QgsPointXY(parsed["lon"], parsed["lat"]))
+            )
+            feature.setAttributes(
+                [
+                    parsed["species"],
+                    parsed["date"],
+                    parsed["location"],
+                    parsed["photo_url"],
+                    parsed["observation_url"],
+                    parsed["wikipedia_url"],
+                    parsed["author_url"],
+                    parsed["positional_accuracy"],
+                ]
+            )
+            features.append(feature)
+        provider.addFeatures(features)
+        layer.updateExtents()
+
+    def bulk():
+        layer, provider = helper.create_layer_and_provider()
+        helper.add_observations_to_layer(records, layer, provider)
+
+    return timed(per_feature), timed(bulk)
+
+
+def main(sizes):
+    wkb = load_pure_module("wkb")
+    record_class = load_pure_module("observation_parser").ObservationRecord
+
+    try:
+        from qgis.core import QgsApplication
+    except ImportError:
+        QgsApplication = None
+
+    application = None
+    layer_helper_module = None
+    if QgsApplication is not None:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        application = QgsApplication([], False)
+        application.initQgis()
+        layer_helper_module = load_plugin_module("qgis_layer_helper")
+
+    print(f"{'features':>10} {'step':>10} {'per-feature s':>14} {'bulk s':>10}")
+    for size in sizes:
+        records = make_records(record_class, size)
+        per_point, bulk = benchmark_wkb(wkb, records)
+        print(f"{size:>10} {'wkb':>10} {per_point:>14.3f} {bulk:>10.3f}")
+        if layer_helper_module is not None:
+            per_feature, bulk = benchmark_layers(layer_helper_module, records)
+            print(f"{size:>10} {'layer':>10} {per_feature:>14.3f} {bulk:>10.3f}")
+
+    if application is not None:
+        application.exitQgis()
+
+
+if __name__ == "__main__":
+    main([int(size) for size in sys.argv[1:]] or DEFAULT_SIZES)
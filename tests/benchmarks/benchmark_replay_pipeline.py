@@ -0,0 +1,169 @@
+"""
+Profile the fetch-to-layer pipeline on recorded API responses, without network.
+
+Record the pages of a real query once, then replay them as often as needed.
+Run from the plugin directory:
+
+    python tests/benchmarks/benchmark_replay_pipeline.py record owls.jsonl.gz \\
+        taxon_id=19350 place_id=6857 --pages 10
+    python tests/benchmarks/benchmark_replay_pipeline.py replay owls.jsonl.gz \\
+        [--latency 1.0]
+
+Replay times each stage per page: the transport (with the recorded latency
+scaled by --latency), JSON decoding, parsing, WKB encoding and, with a
+Python that can import qgis, adding the features to a memory layer. The
+plugin itself replays cassettes when INATURALIST_REPLAY_CASSETTE is set.
+"""
+
+import argparse
+import importlib
+import os
+import sys
+import time
+
+PLUGIN_DIR = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+OBSERVATIONS_URL = "https://api.inaturalist.org/v1/observations"
+REQUEST_INTERVAL = 1.1
+
+
+def load_plugin_module(name):
+    """Import a plugin module as part of its package so relative imports work."""
+    sys.path.insert(0, os.path.dirname(PLUGIN_DIR))
+    return importlib.import_module(f"{os.path.basename(PLUGIN_DIR)}.{name}")
+
+
+def load_pure_module(name):
+    """Import a plugin module without Qt dependencies on its own."""
+    sys.path.insert(0, PLUGIN_DIR)
+    return importlib.import_module(name)
+
+
+def record(path, query, pages, per_page):
+    transport_module = load_pure_module("transport")
+    transport = transport_module.Transport("https://api.inaturalist.org")
+    recorder = transport_module.RecordingTransport(transport, path)
+    for page in range(1, pages + 1):
+        params = {**query, "page": page, "per_page": per_page}
+        results = recorder.get(OBSERVATIONS_URL, params=params).json()["results"]
+        print(f"page {page}: {len(results)} observations")
+        if len(results) < per_page:
+            break
+        time.sleep(REQUEST_INTERVAL)
+    transport.close()
+
+
+def replay(path, latency_scale):
+    transport_module = load_pure_module("transport")
+    parser_module = load_pure_module("observation_parser")
+    wkb = load_pure_module("wkb")
+
+    try:
+        from qgis.core import QgsApplication
+    except ImportError:
+        QgsApplication = None
+
+    application = None
+    helper = None
+    if QgsApplication is not None:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        application = QgsApplication([], False)
+        application.initQgis()
+        helper = load_plugin_module("qgis_layer_helper").QgisLayerHelper()
+        layer, provider = helper.create_layer_and_provider()
+
+    transport = transport_module.ReplayTransport(path, latency_scale=latency_scale)
+    interactions = [
+        interaction
+        for interaction in transport_module.read_cassette(path)
+        if interaction["url"] == OBSERVATIONS_URL
+    ]
+    pool = parser_module.StringPool()
+    stages = ("transport", "decode", "parse", "wkb", "layer")
+    totals = dict.fromkeys(stages, 0.0)
+    observations = 0
+
+    print(f"{'page':>6} {'records':>8} " + " ".join(f"{s:>10}" for s in stages))
+    for index, interaction in enumerate(interactions, start=1):
+        params = dict(interaction["params"])
+        timings = {}
+
+        started_at = time.perf_counter()
+        response = transport.get(OBSERVATIONS_URL, params=params)
+        timings["transport"] = time.perf_counter() - started_at
+
+        started_at = time.perf_counter()
+        results = response.json()["results"]
+        timings["decode"] = time.perf_counter() - started_at
+
+        started_at = time.perf_counter()
+        records = parser_module.ObservationParser.parse_records(results, pool)
+        timings["parse"] = time.perf_counter() - started_at
+
+        started_at = time.perf_counter()
+        [wkb.encode_point(record.lon, record.lat) for record in records]
+        timings["wkb"] = time.perf_counter() - started_at
+
+        timings["layer"] = 0.0
+        if helper is not None:
+            started_at = time.perf_counter()
+            helper.add_observations_to_layer(records, layer, provider)
+            timings["layer"] = time.perf_counter() - started_at
+
+        observations += len(records)
+        for stage in stages:
+            totals[stage] += timings[stage]
+        print(
+            f"{index:>6} {len(records):>8} "
+            + " ".join(f"{timings[stage]:>10.4f}" for stage in stages)
+        )
+
+    print(
+        f"{'total':>6} {observations:>8} "
+        + " ".join(f"{totals[stage]:>10.4f}" for stage in stages)
+    )
+    if application is not None:
+        application.exitQgis()
+
+
+def parse_query(pairs):
+    query = {}
+    for pair in pairs:
+        key, separator, value = pair.partition("=")
+        if not separator:
+            raise SystemExit(f"Query parameters must look like key=value: {pair}")
+        query[key] = value
+    return query
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = commands.add_parser("record", help="record the pages of a query")
+    record_parser.add_argument("cassette")
+    record_parser.add_argument("query", nargs="*", help="API parameters as key=value")
+    record_parser.add_argument("--pages", type=int, default=5)
+    record_parser.add_argument("--per-page", type=int, default=200)
+
+    replay_parser = commands.add_parser("replay", help="profile a recorded query")
+    replay_parser.add_argument("cassette")
+    replay_parser.add_argument(
+        "--latency", type=float, default=0.0, help="scale of the recorded latency"
+    )
+
+    arguments = parser.parse_args()
+    if arguments.command == "record":
+        record(
+            arguments.cassette,
+            parse_query(arguments.query),
+            arguments.pages,
+            arguments.per_page,
+        )
+    else:
+        replay(arguments.cassette, arguments.latency)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+import unittest
+
+from batching import chunked
+
+
+class TestChunked(unittest.TestCase):
+    """Test cases for chunked."""
+
+    def test_splits_into_bounded_chunks(self):
+        """Test that the last chunk holds the remainder."""
+        self.assertEqual(list(chunked(range(5), 2)), [[0, 1], [2, 3], [4]])
+
+    def test_empty_input(self):
+        """Test that nothing is yielded for no items."""
+        self.assertEqual(list(chunked([], 3)), [])
+
+    def test_rejects_invalid_size(self):
+        """Test that a non-positive size is refused."""
+        with self.assertRaises(ValueError):
+            list(chunked([1], 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import threading
+import time
+import unittest
+
+from cancellation import CancellationToken
+
+
+class TestCancellationToken(unittest.TestCase):
+    """Test cases for CancellationToken."""
+
+    def test_new_token_is_not_cancelled(self):
+        """Test that a fresh token is not cancelled."""
+        token = CancellationToken()
+
+        self.assertFalse(token.is_cancelled)
+        self.assertFalse(token.wait(0))
+
+    def test_cancel_runs_callbacks_once(self):
+        """Test that callbacks run on the first cancel only."""
+        token = CancellationToken()
+        calls = []
+        token.add_callback(lambda: calls.append("called"))
+
+        token.cancel()
+        token.cancel()
+
+        self.assertTrue(token.is_cancelled)
+        self.assertEqual(calls, ["called"])
+
+    def test_callback_added_after_cancel_runs_immediately(self):
+        """Test that late callbacks are invoked right away."""
+        token = CancellationToken()
+        token.cancel()
+        calls = []
+
+        token.add_callback(lambda: calls.append("called"))
+
+        self.assertEqual(calls, ["called"])
+
+    def test_removed_callback_is_not_run(self):
+        """Test that removed callbacks are not invoked on cancel."""
+        token = CancellationToken()
+        calls = []
+
+        def callback():
+            calls.append("called")
+
+        token.add_callback(callback)
+        token.remove_callback(callback)
+        token.cancel()
+
+        self.assertEqual(calls, [])
+
+    def test_wait_returns_promptly_on_cancel(self):
+        """Test that a long wait is interrupted by cancellation from another thread."""
+        token = CancellationToken()
+        threading.Timer(0.01, token.cancel).start()
+
+        started = time.monotonic()
+        cancelled = token.wait(10)
+
+        self.assertTrue(cancelled)
+        self.assertLess(time.monotonic() - started, 0.1)
+
+
+if __name__ == "__main__":
+    unittest.main()
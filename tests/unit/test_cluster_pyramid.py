@@ -0,0 +1,67 @@
+import unittest
+
+from cluster_pyramid import ZOOM_0_SCALE, ClusterPyramid
+
+
+class TestClusterPyramid(unittest.TestCase):
+    """Test cases for ClusterPyramid incremental clustering."""
+
+    def test_points_are_added_to_every_level(self):
+        """Test that each point contributes to one cluster per level."""
+        pyramid = ClusterPyramid(max_level=3)
+
+        pyramid.add(10.0, 10.0)
+
+        for level in range(4):
+            clusters = list(pyramid.clusters(level))
+            self.assertEqual(len(clusters), 1)
+            self.assertEqual(clusters[0].count, 1)
+
+    def test_nearby_points_split_at_deeper_levels(self):
+        """Test that close points merge when zoomed out and split when zoomed in."""
+        pyramid = ClusterPyramid(max_level=8)
+
+        pyramid.add(10.0, 10.0)
+        pyramid.add(11.0, 11.0)
+
+        self.assertEqual(len(list(pyramid.clusters(0))), 1)
+        self.assertEqual(len(list(pyramid.clusters(8))), 2)
+
+    def test_cluster_position_is_mean_of_points(self):
+        """Test that clusters are placed at the centroid of their points."""
+        pyramid = ClusterPyramid(max_level=0)
+
+        pyramid.add(10.0, 20.0)
+        pyramid.add(20.0, 30.0)
+
+        cluster = next(pyramid.clusters(0))
+        self.assertEqual(cluster.count, 2)
+        self.assertAlmostEqual(cluster.x, 15.0)
+        self.assertAlmostEqual(cluster.y, 25.0)
+
+    def test_pop_dirty_returns_only_changed_clusters(self):
+        """Test that dirty clusters are reported once per change."""
+        pyramid = ClusterPyramid(max_level=2)
+
+        pyramid.add(10.0, 10.0)
+        first = list(pyramid.pop_dirty())
+        second = list(pyramid.pop_dirty())
+        pyramid.add(10.0, 10.0)
+        third = list(pyramid.pop_dirty())
+
+        self.assertEqual(len(first), 3)
+        self.assertEqual(second, [])
+        self.assertEqual([cluster.count for cluster in third], [2, 2, 2])
+
+    def test_level_scale_range_halves_per_level(self):
+        """Test that every level covers half the scale of the previous one."""
+        self.assertEqual(
+            ClusterPyramid.level_scale_range(0), (ZOOM_0_SCALE, ZOOM_0_SCALE / 2)
+        )
+        self.assertEqual(
+            ClusterPyramid.level_scale_range(2), (ZOOM_0_SCALE / 4, ZOOM_0_SCALE / 8)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
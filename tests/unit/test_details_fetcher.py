@@ -0,0 +1,118 @@
+import importlib
+import importlib.machinery
+import importlib.util
+import os
+import sys
+import tempfile
+import unittest
+
+from persistent_cache import PersistentCache
+
+PLUGIN_DIR = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+PLUGIN_PACKAGE = "inaturalist_plugin"
+
+
+def load_plugin_module(name):
+    """Import a plugin module with relative imports, without the plugin entry point."""
+    if PLUGIN_PACKAGE not in sys.modules:
+        spec = importlib.machinery.ModuleSpec(PLUGIN_PACKAGE, None, is_package=True)
+        package = importlib.util.module_from_spec(spec)
+        package.__path__ = [PLUGIN_DIR]
+        sys.modules[PLUGIN_PACKAGE] = package
+    return importlib.import_module(f"{PLUGIN_PACKAGE}.{name}")
+
+
+details_fetcher = load_plugin_module("details_fetcher")
+
+# Ids from this one on are deleted or hidden on the fake observations endpoint.
+HIDDEN_OBSERVATION_ID = 1000
+
+
+class FakeObservationsClient:
+    """Answers id-list observation requests with one photo per known id."""
+
+    def __init__(self):
+        self.requested_ids = []
+
+    def get(self, url, params=None):
+        ids = [int(id_) for id_ in params["id"].split(",")]
+        self.requested_ids.append(ids)
+        return {
+            "results": [
+                {
+                    "id": observation_id,
+                    "photos": [
+                        {
+                            "id": observation_id,
+                            "url": f"https://example.org/{observation_id}.jpg",
+                        }
+                    ],
+                }
+                for observation_id in ids
+                if observation_id < HIDDEN_OBSERVATION_ID
+            ]
+        }
+
+
+class TestDetailsFetcher(unittest.TestCase):
+    """Test cases for DetailsFetcher."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.temp_dir.name, "cache.sqlite")
+        self.client = FakeObservationsClient()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def fetch(self, observation_ids, before_request=None):
+        batches = []
+        fetcher = details_fetcher.DetailsFetcher(
+            PersistentCache(self.cache_path, ttl=60)
+        )
+        fetcher.fetch(self.client, observation_ids, batches.append, before_request)
+        return batches
+
+    def test_details_are_fetched_once_across_runs(self):
+        """Test that a second fetcher on the same cache makes no requests."""
+        first = self.fetch([3, 1, 2, 1])
+        second = self.fetch([1, 2, 3])
+
+        self.assertEqual(self.client.requested_ids, [[1, 2, 3]])
+        self.assertEqual(second, first)
+        self.assertEqual(sorted(first[0]), [1, 2, 3])
+
+    def test_cached_details_are_passed_before_requests(self):
+        """Test that cached details come in their own batch before fetched ones."""
+        self.fetch([1, 2])
+        batches = self.fetch([2, 3])
+
+        self.assertEqual(self.client.requested_ids, [[1, 2], [3]])
+        self.assertEqual([sorted(batch) for batch in batches], [[2], [3]])
+
+    def test_requests_are_batched_by_the_api_limit(self):
+        """Test that missing details are requested 200 ids at a time."""
+        calls = []
+
+        batches = self.fetch(range(1, 451), lambda: calls.append(1))
+
+        self.assertEqual(
+            [len(ids) for ids in self.client.requested_ids], [200, 200, 50]
+        )
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(sum(len(batch) for batch in batches), 450)
+
+    def test_hidden_observations_are_cached_empty(self):
+        """Test that observations the API does not return are not requested again."""
+        first = self.fetch([HIDDEN_OBSERVATION_ID])
+        second = self.fetch([HIDDEN_OBSERVATION_ID])
+
+        self.assertEqual(len(self.client.requested_ids), 1)
+        self.assertEqual(first, [{HIDDEN_OBSERVATION_ID: {}}])
+        self.assertEqual(second, first)
+
+
+if __name__ == "__main__":
+    unittest.main()
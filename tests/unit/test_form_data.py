@@ -287,6 +287,140 @@ class TestFormData(unittest.TestCase):
 
         self.assertNotIn("acc_below", result)
 
+    def test_build_with_resolved_taxon_id(self):
+        """Test that a resolved taxon id replaces the taxon name filter."""
+        form_data = FormData(
+            username="",
+            species="Strix aluco",
+            date_from=None,
+            date_to=None,
+            country_id=None,
+            bbox=None,
+            taxon_id=19898,
+        )
+
+        result = form_data.build()
+
+        self.assertEqual(result["taxon_id"], 19898)
+        self.assertNotIn("taxon_name", result)
+
+    def test_build_with_resolved_user_id(self):
+        """Test that a resolved numeric user id replaces the login."""
+        form_data = FormData(
+            username="johndoe",
+            species="",
+            date_from=None,
+            date_to=None,
+            country_id=None,
+            bbox=None,
+            user_numeric_id=1392017,
+        )
+
+        result = form_data.build()
+
+        self.assertEqual(result["user_id"], 1392017)
+
+    def test_build_always_requires_coordinates(self):
+        """Test that observations without coordinates are filtered server-side."""
+        form_data = FormData(
+            username="",
+            species="",
+            date_from=None,
+            date_to=None,
+            country_id=None,
+            bbox=None,
+        )
+
+        result = form_data.build()
+
+        self.assertEqual(result["geo"], "true")
+        for key in ("quality_grade", "photos", "iconic_taxa", "captive", "geoprivacy"):
+            self.assertNotIn(key, result)
+
+    def test_build_with_server_side_filters(self):
+        """Test that quality, photo, taxon group, captivity and privacy map to params."""
+        form_data = FormData(
+            username="",
+            species="",
+            date_from=None,
+            date_to=None,
+            country_id=None,
+            bbox=None,
+            quality_grade="research",
+            photos=True,
+            iconic_taxa=["Aves", "Plantae"],
+            captive=False,
+            geoprivacy="open,obscured",
+        )
+
+        result = form_data.build()
+
+        self.assertEqual(result["quality_grade"], "research")
+        self.assertEqual(result["photos"], "true")
+        self.assertEqual(result["iconic_taxa"], "Aves,Plantae")
+        self.assertEqual(result["captive"], "false")
+        self.assertEqual(result["geoprivacy"], "open,obscured")
+
+    def test_build_with_id_lists(self):
+        """Test that id lists replace the single species, user and country."""
+        form_data = FormData(
+            username="johndoe",
+            species="Canis lupus",
+            date_from=None,
+            date_to=None,
+            country_id=123,
+            bbox=None,
+            taxon_id=42,
+            taxon_ids=[1, 2],
+            user_ids=[3],
+            place_ids=[4, 5, 6],
+        )
+
+        result = form_data.build()
+
+        self.assertEqual(result["taxon_id"], "1,2")
+        self.assertEqual(result["user_id"], "3")
+        self.assertEqual(result["place_id"], "4,5,6")
+        self.assertNotIn("taxon_name", result)
+
+    def test_build_queries_packs_lists(self):
+        """Test that long lists are packed and every combination is queried."""
+        form_data = FormData(
+            username="",
+            species="",
+            date_from=None,
+            date_to=None,
+            country_id=None,
+            bbox=None,
+            quality_grade="research",
+            taxon_ids=[1, 2, 3, 4, 5],
+            place_ids=[7, 8],
+        )
+
+        queries = form_data.build_queries(max_ids=2)
+
+        self.assertEqual(
+            [(query["taxon_id"], query["place_id"]) for query in queries],
+            [("1,2", "7,8"), ("3,4", "7,8"), ("5", "7,8")],
+        )
+        self.assertTrue(all(query["quality_grade"] == "research" for query in queries))
+        self.assertTrue(all("user_id" not in query for query in queries))
+
+    def test_build_queries_without_lists(self):
+        """Test that a form without lists is a single query."""
+        form_data = FormData(
+            username="johndoe",
+            species="",
+            date_from=None,
+            date_to=None,
+            country_id=None,
+            bbox=None,
+        )
+
+        self.assertEqual(form_data.build_queries(max_ids=200), [form_data.build()])
+        with self.assertRaises(ValueError):
+            form_data.build_queries(max_ids=0)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+
+from grid_aggregator import GridAggregator
+
+
+class TestGridAggregator(unittest.TestCase):
+    """Test cases for GridAggregator binning and per-cell counters."""
+
+    def test_invalid_cell_size(self):
+        """Test that a non-positive cell size is rejected."""
+        with self.assertRaises(ValueError):
+            GridAggregator(cell_size=0)
+
+    def test_invalid_shape(self):
+        """Test that unknown grid shapes are rejected."""
+        with self.assertRaises(ValueError):
+            GridAggregator(cell_size=1, shape="triangle")
+
+    def test_square_cell_key(self):
+        """Test that square cells are keyed by floor division."""
+        aggregator = GridAggregator(cell_size=10, shape="square")
+
+        self.assertEqual(aggregator.cell_key(5, 5), (0, 0))
+        self.assertEqual(aggregator.cell_key(-0.1, 19.9), (-1, 1))
+
+    def test_square_cell_polygon(self):
+        """Test that square cell polygons are closed rings of the cell size."""
+        aggregator = GridAggregator(cell_size=10, shape="square")
+
+        polygon = aggregator.cell_polygon((1, -1))
+
+        self.assertEqual(polygon[0], polygon[-1])
+        self.assertEqual(polygon[0], (10, -10))
+        self.assertEqual(polygon[2], (20, 0))
+
+    def test_hex_points_share_cell_with_center(self):
+        """Test that points near a hex center fall in the same cell."""
+        aggregator = GridAggregator(cell_size=10, shape="hex")
+
+        self.assertEqual(aggregator.cell_key(0, 0), (0, 0))
+        self.assertEqual(aggregator.cell_key(2, -2), (0, 0))
+        self.assertEqual(aggregator.cell_key(10, 0), (1, 0))
+
+    def test_hex_cell_polygon_contains_center(self):
+        """Test that hexagon rings have six corners around the cell center."""
+        aggregator = GridAggregator(cell_size=10, shape="hex")
+
+        polygon = aggregator.cell_polygon((1, 0))
+
+        self.assertEqual(len(polygon), 7)
+        self.assertEqual(polygon[0], polygon[-1])
+        xs = [x for x, _ in polygon]
+        self.assertAlmostEqual((min(xs) + max(xs)) / 2, 10)
+
+    def test_counters_are_aggregated_per_cell(self):
+        """Test count, distinct species and date range per cell."""
+        aggregator = GridAggregator(cell_size=10, shape="square")
+
+        aggregator.add(1, 1, "Strix aluco", "2021-04-11")
+        aggregator.add(2, 2, "Strix aluco", "2020-01-05")
+        aggregator.add(3, 3, "Bubo bubo", "N/A")
+        aggregator.add(15, 15, None, None)
+
+        cells = {tuple(cell.polygon[0]): cell for cell in aggregator.cells()}
+
+        self.assertEqual(len(aggregator), 2)
+        self.assertEqual(aggregator.observation_count, 4)
+        first = cells[(0, 0)]
+        self.assertEqual(first.count, 3)
+        self.assertEqual(first.species_count, 2)
+        self.assertEqual(first.date_from, "2020-01-05")
+        self.assertEqual(first.date_to, "2021-04-11")
+        second = cells[(10, 10)]
+        self.assertEqual(second.count, 1)
+        self.assertEqual(second.species_count, 0)
+        self.assertIsNone(second.date_from)
+        self.assertIsNone(second.date_to)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import os
+import tempfile
+import unittest
+
+from id_list import (
+    csv_columns,
+    parse_id,
+    parse_ids,
+    parse_values,
+    read_csv_ids,
+    read_csv_values,
+)
+
+
+class TestParseIds(unittest.TestCase):
+    """Test cases for reading observation ids from cell values."""
+
+    def test_parse_id_formats(self):
+        """Test that numbers, numeric text and observation URLs are read."""
+        self.assertEqual(parse_id(123), 123)
+        self.assertEqual(parse_id(123.0), 123)
+        self.assertEqual(parse_id(" 456 "), 456)
+        self.assertEqual(parse_id("789.0"), 789)
+        self.assertEqual(
+            parse_id("https://www.inaturalist.org/observations/1011/"), 1011
+        )
+
+    def test_parse_id_rejects_other_text(self):
+        """Test that values that only contain digits are refused."""
+        for value in ("abc123", "12a", "https://www.inaturalist.org/people/12"):
+            with self.subTest(value=value):
+                with self.assertRaises(ValueError):
+                    parse_id(value)
+
+    def test_parse_ids_skips_empty_and_duplicates(self):
+        """Test that empty cells are skipped and the first occurrence is kept."""
+        self.assertEqual(
+            parse_ids(["3", None, "", "NULL", 1, "3", "2"]),
+            [3, 1, 2],
+        )
+
+
+class TestParseValues(unittest.TestCase):
+    """Test cases for reading lists of names from text."""
+
+    def test_split_on_commas_semicolons_and_lines(self):
+        """Test that every separator splits and blanks are skipped."""
+        self.assertEqual(
+            parse_values("Bubo bubo, Strix aluco;\nAthene noctua,, "),
+            ["Bubo bubo", "Strix aluco", "Athene noctua"],
+        )
+
+    def test_duplicates_are_kept_once_ignoring_case(self):
+        """Test that repeated names keep their first spelling."""
+        self.assertEqual(parse_values("alice, Bob, ALICE, bob"), ["alice", "Bob"])
+
+    def test_single_name(self):
+        """Test that text without separators is one name."""
+        self.assertEqual(parse_values(" Canis lupus "), ["Canis lupus"])
+        self.assertEqual(parse_values(""), [])
+
+
+class TestReadCsvIds(unittest.TestCase):
+    """Test cases for reading observation ids from CSV files."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write_csv(self, content):
+        path = os.path.join(self.temp_dir.name, "ids.csv")
+        with open(path, "w", encoding="utf-8", newline="") as csv_file:
+            csv_file.write(content)
+        return path
+
+    def test_read_column(self):
+        """Test that the ids of the chosen column are read."""
+        path = self.write_csv("name,observation_id\nOwl,10\nFox,11\nOwl,10\n")
+
+        self.assertEqual(csv_columns(path), ["name", "observation_id"])
+        self.assertEqual(read_csv_ids(path, "observation_id"), [10, 11])
+
+    def test_read_semicolon_separated(self):
+        """Test that semicolon separated exports are detected."""
+        path = self.write_csv("id;url\n1;a\n2;b\n")
+
+        self.assertEqual(read_csv_ids(path, "id"), [1, 2])
+
+    def test_missing_column(self):
+        """Test that an unknown column raises a ValueError."""
+        path = self.write_csv("id\n1\n")
+
+        with self.assertRaises(ValueError):
+            read_csv_ids(path, "observation_id")
+        with self.assertRaises(ValueError):
+            read_csv_values(path, "species")
+
+    def test_read_values(self):
+        """Test that the distinct names of a column are read in order."""
+        path = self.write_csv("species;user\nBubo bubo;ana\n;ana\nStrix aluco;\n")
+
+        self.assertEqual(read_csv_values(path, "species"), ["Bubo bubo", "Strix aluco"])
+        self.assertEqual(read_csv_values(path, "user"), ["ana"])
+
+
+if __name__ == "__main__":
+    unittest.main()
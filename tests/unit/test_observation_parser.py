@@ -1,8 +1,20 @@
 import json
+import multiprocessing
 import os
+import pickle
 import unittest
+from concurrent.futures import ProcessPoolExecutor
 
-from observation_parser import ObservationParser
+from observation_parser import (
+    ObservationColumns,
+    ObservationParser,
+    ObservationRecord,
+    ObservationSources,
+    StringPool,
+    batch_values,
+    decode_page,
+    wikipedia_article,
+)
 
 
 class TestObservationParser(unittest.TestCase):
@@ -179,6 +191,21 @@ class TestObservationParser(unittest.TestCase):
 
         self.assertEqual(photo_url, "N/A")
 
+    def test_extract_photo_id_with_photos(self):
+        """Test extracting the id of the first photo."""
+        photo = {"photo": {"id": 42, "url": "https://example.org/42/square.jpg"}}
+        observation = {"observation_photos": [{"photo": {"id": 7}}, photo]}
+
+        photo_id = ObservationParser.extract_photo_id(observation)
+
+        self.assertEqual(photo_id, 42)
+
+    def test_extract_photo_id_no_photos(self):
+        """Test extracting photo id when no photos exist."""
+        photo_id = ObservationParser.extract_photo_id({"observation_photos": []})
+
+        self.assertIsNone(photo_id)
+
     def test_extract_wikipedia_url_with_taxon(self):
         """Test extracting Wikipedia URL when present."""
         observation = {"taxon": self.real_observation.get("taxon", {})}
@@ -262,6 +289,235 @@ class TestObservationParser(unittest.TestCase):
         self.assertIsNotNone(result)
         self.assertEqual(result["positional_accuracy"], 1000.5)
 
+    def test_parse_record_uses_none_for_missing_values(self):
+        """Test that compact records store None instead of sentinel strings."""
+        observation = {"geojson": self.real_observation.get("geojson")}
+
+        record = ObservationParser.parse_record(observation)
+
+        self.assertIsNotNone(record)
+        self.assertIsNone(record.species)
+        self.assertIsNone(record.observed_on)
+        self.assertIsNone(record.photo_url)
+        self.assertIsNone(record.observation_url)
+        self.assertIsNone(record.author_url)
+        self.assertIsNone(record.positional_accuracy)
+
+    def test_parse_record_derives_urls_from_ids(self):
+        """Test that observation and author URLs are derived from stored ids."""
+        record = ObservationParser.parse_record(self.real_observation)
+
+        self.assertEqual(record.observation_id, self.real_observation["id"])
+        self.assertEqual(record.taxon_id, self.real_observation["taxon"]["id"])
+        self.assertEqual(record.observation_url, self.real_observation["uri"])
+        self.assertEqual(
+            record.author_url,
+            "https://www.inaturalist.org/people/"
+            + self.real_observation["user"]["login"],
+        )
+
+    def test_wikipedia_article_from_url(self):
+        """Test that only Wikipedia article URLs give an article name."""
+        self.assertEqual(
+            wikipedia_article("http://en.wikipedia.org/wiki/Tawny_owl"), "Tawny_owl"
+        )
+        self.assertEqual(
+            wikipedia_article("https://de.wikipedia.org/wiki/Waldkauz"), "de:Waldkauz"
+        )
+        self.assertIsNone(wikipedia_article(None))
+        self.assertIsNone(wikipedia_article("https://example.org/wiki/Tawny_owl"))
+        self.assertIsNone(wikipedia_article("https://en.wikipedia.org/wiki/"))
+
+    def test_record_without_wikipedia_url_has_no_article(self):
+        """Test that no article is invented for taxa without a Wikipedia link."""
+        record = ObservationRecord(1, 41.0, 2.0, species="Strix aluco", taxon_id=7)
+
+        self.assertIsNone(record.wikipedia_article)
+
+    def test_parse_record_as_dict_matches_parse_observation(self):
+        """Test that the dictionary view keeps the parse_observation format."""
+        record = ObservationParser.parse_record(self.real_observation)
+
+        self.assertEqual(
+            record.as_dict(), ObservationParser.parse_observation(self.real_observation)
+        )
+
+    def test_parse_records_interns_repeated_strings(self):
+        """Test that records parsed with one pool share repeated strings."""
+        first = self.real_observation.copy()
+        second = self.real_observation.copy()
+        second["taxon"] = dict(self.real_observation["taxon"])
+        second["taxon"]["name"] = "".join(self.real_observation["taxon"]["name"])
+        pool = StringPool()
+
+        records = ObservationParser.parse_records([first, second], pool)
+
+        self.assertIs(records[0].species, records[1].species)
+
+    def test_parse_records_skips_observations_without_coordinates(self):
+        """Test that observations without coordinates are dropped from batches."""
+        without_coordinates = self.real_observation.copy()
+        without_coordinates.pop("geojson", None)
+
+        records = ObservationParser.parse_records(
+            [self.real_observation, without_coordinates]
+        )
+
+        self.assertEqual(len(records), 1)
+
+    def test_parse_details_extracts_on_demand_fields(self):
+        """Test that detail fields match the full record."""
+        details = ObservationParser.parse_details(self.real_observation)
+        record = ObservationParser.parse_record(self.real_observation)
+
+        self.assertEqual(details["location"], record.location)
+        self.assertEqual(details["user_login"], record.user_login)
+        self.assertEqual(details["photo_url"], record.photo_url)
+        self.assertEqual(details["wikipedia_url"], record.wikipedia_url)
+
+    def test_parse_details_without_coordinates_or_optional_fields(self):
+        """Test that details do not depend on coordinates and default to None."""
+        details = ObservationParser.parse_details({"id": 1})
+
+        self.assertEqual(
+            details,
+            {
+                "location": None,
+                "user_login": None,
+                "photo_url": None,
+                "wikipedia_url": None,
+            },
+        )
+
+
+class TestObservationSources(unittest.TestCase):
+    """Test cases for labelling observations with the list entries they match."""
+
+    @classmethod
+    def setUpClass(cls):
+        test_data_path = os.path.join(
+            os.path.dirname(__file__), "../data/observation_with_coordinates.json"
+        )
+        with open(test_data_path, "r", encoding="utf-8") as test_data_file:
+            cls.observation = json.load(test_data_file)["results"][0]
+
+    def test_label_matches_taxon_ancestors_user_and_places(self):
+        """Test that requested ancestors, the observer and places are named."""
+        sources = ObservationSources(
+            taxa={19350: "Strigiformes", 3: "Aves", 47126: "Plantae"},
+            users={1392017: "javikalsan", 1: "someone"},
+            places={6774: "Spain", 1: "Elsewhere"},
+        )
+
+        self.assertEqual(
+            sources.label(self.observation), "Aves, Strigiformes, javikalsan, Spain"
+        )
+
+    def test_label_without_match_is_none(self):
+        """Test that observations matching no entry get no label."""
+        sources = ObservationSources(taxa={47126: "Plantae"})
+
+        self.assertIsNone(sources.label(self.observation))
+        self.assertIsNone(sources.label({"id": 1}))
+
+    def test_parse_records_sets_interned_source(self):
+        """Test that parsed records carry the label and share its string."""
+        sources = ObservationSources(users={1392017: "javikalsan"})
+
+        records = ObservationParser.parse_records(
+            [self.observation, self.observation], StringPool(), sources
+        )
+
+        self.assertEqual(records[0].source, "javikalsan")
+        self.assertIs(records[0].source, records[1].source)
+        self.assertIsNone(ObservationParser.parse_record(self.observation).source)
+
+
+class TestObservationColumns(unittest.TestCase):
+    """Test cases for columnar page decoding."""
+
+    @classmethod
+    def setUpClass(cls):
+        test_data_path = os.path.join(
+            os.path.dirname(__file__), "../data/observation_with_coordinates.json"
+        )
+        with open(test_data_path, "rb") as test_data_file:
+            cls.content = test_data_file.read()
+        cls.results = json.loads(cls.content)["results"]
+
+    def assertRecordsEqual(self, actual, expected):
+        self.assertEqual(len(actual), len(expected))
+        for actual_record, expected_record in zip(actual, expected):
+            for name in ObservationRecord.__slots__:
+                self.assertEqual(
+                    getattr(actual_record, name), getattr(expected_record, name), name
+                )
+
+    def test_round_trip_keeps_values_and_missing_values(self):
+        """Test that records rebuilt from columns equal the parsed records."""
+        sparse = {"id": 2, "geojson": {"coordinates": [1.5, 2.5]}}
+        records = ObservationParser.parse_records([*self.results, sparse])
+
+        columns = pickle.loads(pickle.dumps(ObservationColumns.from_records(records)))
+
+        self.assertEqual(len(columns), 2)
+        self.assertRecordsEqual(columns.records(), records)
+
+    def test_repeated_strings_are_stored_once(self):
+        """Test that the string table holds each distinct value once."""
+        records = ObservationParser.parse_records(self.results * 3)
+
+        columns = ObservationColumns.from_records(records)
+        rebuilt = columns.records(StringPool())
+
+        self.assertEqual(len(columns.strings), len(set(columns.strings)))
+        self.assertIs(rebuilt[0].species, rebuilt[2].species)
+
+    def test_values_match_record_fields(self):
+        """Test that each column, stored or derived, equals the record field."""
+        sparse = {"id": 2, "geojson": {"coordinates": [1.5, 2.5]}}
+        records = ObservationParser.parse_records([*self.results, sparse])
+        columns = ObservationColumns.from_records(records)
+
+        for name in (
+            *ObservationRecord.__slots__,
+            "observation_url",
+            "author_url",
+            "wikipedia_article",
+        ):
+            self.assertEqual(columns.values(name), batch_values(records, name), name)
+            self.assertEqual(batch_values(columns, name), batch_values(records, name))
+
+    def test_unknown_column(self):
+        """Test that asking for a field records do not have fails."""
+        with self.assertRaises(AttributeError):
+            ObservationColumns().values("missing")
+
+    def test_decode_page(self):
+        """Test that raw response bytes decode to result ids and columns."""
+        page = decode_page(self.content)
+
+        self.assertEqual(list(page.result_ids), [self.results[0]["id"]])
+        self.assertRecordsEqual(
+            page.columns.records(), ObservationParser.parse_records(self.results)
+        )
+
+    def test_decode_page_with_sources(self):
+        """Test that source labels survive decoding into columns."""
+        sources = ObservationSources(taxa={19898: "Scops owl"})
+
+        page = pickle.loads(pickle.dumps(decode_page(self.content, sources)))
+
+        self.assertEqual(page.columns.records()[0].source, "Scops owl")
+
+    def test_decode_page_in_worker_process(self):
+        """Test that pages can be decoded by a spawned worker process."""
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            page = pool.submit(decode_page, self.content).result(timeout=60)
+
+        self.assertEqual(list(page.result_ids), [self.results[0]["id"]])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,173 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from contextlib import closing
+
+from observation_parser import ObservationRecord
+from observation_warehouse import (
+    GPKG_HEADER,
+    IdSegment,
+    ObservationWarehouse,
+    encode_point,
+    merge_ranges,
+    plan_segments,
+    query_key,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_record(observation_id, species="Strix aluco", lat=41.0, lon=2.0):
+    return ObservationRecord(
+        observation_id, lat, lon, species=species, observed_on="2024-05-01"
+    )
+
+
+class TestWarehouseHelpers(unittest.TestCase):
+    """Test cases for the pure warehouse helpers."""
+
+    def test_query_key_ignores_parameter_order(self):
+        """Test that equal filters produce the same key."""
+        self.assertEqual(
+            query_key({"taxon_name": "Strix", "d1": "2024-01-01"}),
+            query_key({"d1": "2024-01-01", "taxon_name": "Strix"}),
+        )
+        self.assertNotEqual(
+            query_key({"taxon_name": "Strix"}), query_key({"taxon_name": "Bubo"})
+        )
+
+    def test_merge_ranges_joins_adjacent_and_keeps_newest_time(self):
+        """Test that overlapping and adjacent ranges collapse."""
+        self.assertEqual(
+            merge_ranges([(11, 20, 50.0), (1, 10, 40.0), (30, 40, 60.0)]),
+            [(1, 20, 50.0), (30, 40, 60.0)],
+        )
+
+    def test_plan_segments_without_coverage(self):
+        """Test that an empty warehouse fetches the whole id space."""
+        self.assertEqual(plan_segments([]), [IdSegment(0, None)])
+
+    def test_plan_segments_refreshes_held_ranges(self):
+        """Test that gaps are fetched and held ranges only refreshed."""
+        segments = plan_segments([(100, 200, 0.0)])
+
+        self.assertEqual(segments[0], IdSegment(0, 100))
+        self.assertEqual(segments[1].id_above, 99)
+        self.assertEqual(segments[1].id_below, 201)
+        self.assertEqual(segments[1].updated_since, "1970-01-01T00:00:00+00:00")
+        self.assertEqual(segments[2], IdSegment(200, None))
+
+    def test_encode_point_has_geopackage_header(self):
+        """Test that point blobs start with the GeoPackage header."""
+        blob = encode_point(2.0, 41.0)
+
+        self.assertTrue(blob.startswith(b"GP"))
+        self.assertEqual(blob[: len(GPKG_HEADER)], GPKG_HEADER)
+        self.assertEqual(len(blob), len(GPKG_HEADER) + 21)
+
+
+class TestObservationWarehouse(unittest.TestCase):
+    """Test cases for ObservationWarehouse."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.clock = FakeClock()
+        self.path = os.path.join(self.temp_dir.name, "nested", "observations.gpkg")
+        self.warehouse = ObservationWarehouse(self.path, clock=self.clock)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_upsert_deduplicates_across_queries(self):
+        """Test that an observation is stored once but joined to each query."""
+        self.warehouse.upsert([make_record(1), make_record(2)], "a")
+        self.warehouse.upsert([make_record(2, species="Bubo bubo")], "b")
+
+        with closing(sqlite3.connect(self.path)) as connection:
+            rows = connection.execute(
+                "SELECT observation_id, species FROM observations ORDER BY fid"
+            ).fetchall()
+        self.assertEqual(rows, [(1, "Strix aluco"), (2, "Bubo bubo")])
+        self.assertEqual(self.warehouse.count("a"), 2)
+        self.assertEqual(self.warehouse.count("b"), 1)
+
+    def test_upsert_stores_wikipedia_article(self):
+        """Test that the article is stored and missing links stay NULL."""
+        linked = make_record(1)
+        linked.wikipedia_url = "http://en.wikipedia.org/wiki/Tawny_owl"
+        self.warehouse.upsert([linked, make_record(2)], "a")
+
+        with closing(sqlite3.connect(self.path)) as connection:
+            rows = connection.execute(
+                "SELECT wikipedia_article FROM observations ORDER BY fid"
+            ).fetchall()
+        self.assertEqual(rows, [("Tawny_owl",), (None,)])
+
+    def test_schema_adds_missing_wikipedia_article_column(self):
+        """Test that warehouses from before the column existed are migrated."""
+        with closing(sqlite3.connect(self.path)) as connection, connection:
+            connection.execute("ALTER TABLE observations DROP COLUMN wikipedia_article")
+
+        ObservationWarehouse(self.path, clock=self.clock).upsert([make_record(1)], "a")
+
+        self.assertEqual(self.warehouse.count("a"), 1)
+
+    def test_upsert_skips_records_without_id(self):
+        """Test that records without an id are ignored."""
+        self.warehouse.upsert([make_record(None)], "a")
+
+        self.assertEqual(self.warehouse.count("a"), 0)
+
+    def test_fresh_ranges_expire(self):
+        """Test that coverage older than max_age is ignored."""
+        self.warehouse.add_coverage("a", 1, 10)
+        self.clock.now += 50
+        self.warehouse.add_coverage("a", 11, 20)
+
+        self.assertEqual(self.warehouse.fresh_ranges("a", 100), [(1, 20, 1050.0)])
+        self.assertEqual(self.warehouse.fresh_ranges("a", 10), [(11, 20, 1050.0)])
+        self.assertEqual(self.warehouse.fresh_ranges("b", 100), [])
+
+    def test_prune_forgets_stale_queries(self):
+        """Test that queries past max_age lose members and unshared observations."""
+        self.warehouse.upsert([make_record(1), make_record(2)], "old")
+        self.warehouse.add_coverage("old", 1, 2)
+        self.clock.now += 100
+        self.warehouse.upsert([make_record(2), make_record(3)], "new")
+        self.warehouse.add_coverage("new", 2, 3)
+
+        self.warehouse.prune(50)
+
+        self.assertEqual(self.warehouse.count("old"), 0)
+        self.assertEqual(self.warehouse.count("new"), 2)
+        self.assertEqual(self.warehouse.fresh_ranges("old", 1000), [])
+        with closing(sqlite3.connect(self.path)) as connection:
+            fids = connection.execute(
+                "SELECT fid FROM observations ORDER BY fid"
+            ).fetchall()
+            rtree_ids = connection.execute(
+                "SELECT id FROM rtree_observations_geom ORDER BY id"
+            ).fetchall()
+        self.assertEqual(fids, [(2,), (3,)])
+        self.assertEqual(rtree_ids, [(2,), (3,)])
+
+    def test_subset_string_escapes_quotes(self):
+        """Test that a quote in the key cannot end the SQL string."""
+        self.assertIn("query_key = 'a''b'", ObservationWarehouse.subset_string("a'b"))
+
+    def test_add_coverage_ignores_empty_range(self):
+        """Test that inverted ranges are not recorded."""
+        self.warehouse.add_coverage("a", 10, 9)
+
+        self.assertEqual(self.warehouse.fresh_ranges("a", 100), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import os
+import tempfile
+import unittest
+
+from persistent_cache import PersistentCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestPersistentCache(unittest.TestCase):
+    """Test cases for PersistentCache."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.clock = FakeClock()
+        self.cache = PersistentCache(
+            os.path.join(self.temp_dir.name, "nested", "cache.sqlite"),
+            ttl=60,
+            clock=self.clock,
+        )
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_get_missing_key(self):
+        """Test that missing keys return None."""
+        self.assertIsNone(self.cache.get("taxa", "unknown"))
+
+    def test_set_and_get_value(self):
+        """Test that stored JSON values round-trip."""
+        self.cache.set("taxa", "strix aluco", {"id": 19898, "rank": "species"})
+
+        self.assertEqual(
+            self.cache.get("taxa", "strix aluco"), {"id": 19898, "rank": "species"}
+        )
+
+    def test_namespaces_are_isolated(self):
+        """Test that equal keys in different namespaces do not collide."""
+        self.cache.set("taxa", "key", 1)
+        self.cache.set("users", "key", 2)
+
+        self.assertEqual(self.cache.get("taxa", "key"), 1)
+        self.assertEqual(self.cache.get("users", "key"), 2)
+
+    def test_entries_expire_after_ttl(self):
+        """Test that entries older than the TTL are not returned."""
+        self.cache.set("taxa", "key", 1)
+
+        self.clock.now += 61
+
+        self.assertIsNone(self.cache.get("taxa", "key"))
+
+    def test_get_many_returns_only_fresh_entries(self):
+        """Test bulk lookups across fresh, stale and missing keys."""
+        self.cache.set("taxa", "old", 1)
+        self.clock.now += 61
+        self.cache.set_many("taxa", [("new", 2), ("other", 3)])
+
+        values = self.cache.get_many("taxa", ["old", "new", "other", "missing"])
+
+        self.assertEqual(values, {"new": 2, "other": 3})
+
+    def test_delete_expired(self):
+        """Test that expired entries are purged."""
+        self.cache.set("taxa", "old", 1)
+        self.clock.now += 61
+        self.cache.set("taxa", "new", 2)
+
+        deleted = self.cache.delete_expired()
+
+        self.assertEqual(deleted, 1)
+        self.assertEqual(self.cache.get("taxa", "new"), 2)
+
+    def test_cache_persists_across_instances(self):
+        """Test that a new cache instance reads existing entries."""
+        self.cache.set("taxa", "key", 1)
+
+        reopened = PersistentCache(self.cache.path, ttl=60, clock=self.clock)
+
+        self.assertEqual(reopened.get("taxa", "key"), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
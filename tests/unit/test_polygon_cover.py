@@ -0,0 +1,88 @@
+import unittest
+
+from polygon_cover import (
+    INSIDE,
+    OUTSIDE,
+    PARTIAL,
+    box_area,
+    box_params,
+    cover_boxes,
+    split_box,
+)
+
+
+def triangle_classify(box):
+    """Classify boxes against the triangle x >= 0, y >= 0, x + y <= 1."""
+    min_x, min_y, max_x, max_y = box
+    if max_x < 0 or max_y < 0 or min_x + min_y > 1:
+        return OUTSIDE
+    if min_x >= 0 and min_y >= 0 and max_x + max_y <= 1:
+        return INSIDE
+    return PARTIAL
+
+
+class TestPolygonCover(unittest.TestCase):
+    """Test cases for the polygon bbox cover decomposition."""
+
+    def test_split_box_into_quadrants(self):
+        """Test that quadrants tile the parent box."""
+        quadrants = split_box((0, 0, 2, 2))
+
+        self.assertEqual(len(quadrants), 4)
+        self.assertEqual(sum(box_area(box) for box in quadrants), 4)
+        self.assertIn((1, 1, 2, 2), quadrants)
+
+    def test_cover_drops_boxes_outside_shape(self):
+        """Test that the cover of a triangle is smaller than its extent."""
+        boxes = cover_boxes((0, 0, 1, 1), triangle_classify, max_boxes=16)
+
+        self.assertLessEqual(len(boxes), 16)
+        self.assertLess(sum(box_area(box) for box in boxes), 0.8)
+        self.assertNotIn((0.5, 0.5, 1, 1), boxes)
+        for box in boxes:
+            self.assertNotEqual(triangle_classify(box), OUTSIDE)
+
+    def test_cover_still_covers_shape(self):
+        """Test that sample points inside the triangle fall in some box."""
+        boxes = cover_boxes((0, 0, 1, 1), triangle_classify, max_boxes=16)
+
+        for x, y in [(0.05, 0.05), (0.9, 0.05), (0.05, 0.9), (0.45, 0.45)]:
+            self.assertTrue(
+                any(b[0] <= x <= b[2] and b[1] <= y <= b[3] for b in boxes),
+                (x, y),
+            )
+
+    def test_cover_boxes_do_not_overlap(self):
+        """Test that covering boxes only share edges."""
+        boxes = cover_boxes((0, 0, 1, 1), triangle_classify, max_boxes=16)
+
+        for i, a in enumerate(boxes):
+            for b in boxes[i + 1 :]:
+                overlap_x = min(a[2], b[2]) - max(a[0], b[0])
+                overlap_y = min(a[3], b[3]) - max(a[1], b[1])
+                self.assertFalse(overlap_x > 0 and overlap_y > 0, (a, b))
+
+    def test_cover_respects_box_budget(self):
+        """Test that a budget of one box keeps the whole extent."""
+        self.assertEqual(
+            cover_boxes((0, 0, 1, 1), triangle_classify, max_boxes=1), [(0, 0, 1, 1)]
+        )
+
+    def test_cover_respects_max_depth(self):
+        """Test that subdivision stops at max_depth."""
+        boxes = cover_boxes(
+            (0, 0, 1, 1), triangle_classify, max_boxes=1000, max_depth=2
+        )
+
+        self.assertTrue(all(box_area(box) >= 1 / 16 for box in boxes))
+
+    def test_box_params(self):
+        """Test conversion to iNaturalist bounding box parameters."""
+        self.assertEqual(
+            box_params((-3.0, 40.0, 3.5, 43.0)),
+            {"swlat": 40.0, "swlng": -3.0, "nelat": 43.0, "nelng": 3.5},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
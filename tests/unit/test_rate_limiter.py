@@ -0,0 +1,160 @@
+import os
+import tempfile
+import unittest
+
+from cancellation import CancellationToken
+from rate_limiter import RateLimiter, SharedQuota
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestRateLimiter(unittest.TestCase):
+    """Test cases for RateLimiter."""
+
+    def test_first_request_is_not_delayed(self):
+        """Test that the first request may start immediately."""
+        limiter = RateLimiter(min_interval=1.1, clock=FakeClock())
+
+        self.assertEqual(limiter.next_delay(), 0.0)
+
+    def test_delay_accounts_for_elapsed_time(self):
+        """Test that the delay shrinks as time passes since the last request."""
+        clock = FakeClock()
+        limiter = RateLimiter(min_interval=1.0, clock=clock)
+        limiter.wait()
+
+        clock.now += 0.25
+
+        self.assertAlmostEqual(limiter.next_delay(), 0.75)
+
+    def test_delay_is_never_negative(self):
+        """Test that no delay is needed once the interval has elapsed."""
+        clock = FakeClock()
+        limiter = RateLimiter(min_interval=1.0, clock=clock)
+        limiter.wait()
+
+        clock.now += 5
+
+        self.assertEqual(limiter.next_delay(), 0.0)
+
+    def test_jitter_extends_interval(self):
+        """Test that jitter only ever lengthens the interval."""
+        clock = FakeClock()
+        limiter = RateLimiter(min_interval=1.0, jitter=0.5, clock=clock)
+        limiter.wait()
+
+        for _ in range(20):
+            self.assertGreaterEqual(limiter.next_delay(), 1.0)
+            self.assertLessEqual(limiter.next_delay(), 1.5)
+
+    def test_wait_is_interrupted_by_cancellation(self):
+        """Test that a cancelled token aborts the wait."""
+        limiter = RateLimiter(min_interval=60)
+        token = CancellationToken()
+        limiter.wait(token)
+        token.cancel()
+
+        self.assertFalse(limiter.wait(token))
+
+
+class TestSharedQuota(unittest.TestCase):
+    """Test cases for SharedQuota."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "shared", "quota.sqlite")
+        self.clock = FakeClock()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_burst_then_refill_rate(self):
+        """Test that the burst is available at once and then refills at the rate."""
+        quota = SharedQuota(self.path, rate=2.0, burst=2, clock=self.clock)
+
+        self.assertEqual(quota.acquire(), 0.0)
+        self.assertEqual(quota.acquire(), 0.0)
+        self.assertAlmostEqual(quota.acquire(), 0.5)
+
+        self.clock.now += 0.5
+
+        self.assertEqual(quota.acquire(), 0.0)
+
+    def test_instances_share_one_bucket(self):
+        """Test that quotas opened on the same file draw from the same tokens."""
+        first = SharedQuota(self.path, rate=1.0, clock=self.clock)
+        second = SharedQuota(self.path, rate=1.0, clock=self.clock)
+
+        self.assertEqual(first.acquire(), 0.0)
+        self.assertAlmostEqual(second.acquire(), 1.0)
+
+    def test_clock_lag_does_not_refill(self):
+        """Test that a clock behind the last update adds no tokens."""
+        quota = SharedQuota(self.path, rate=1.0, clock=self.clock)
+        quota.acquire()
+
+        self.clock.now -= 10
+
+        self.assertAlmostEqual(quota.acquire(), 1.0)
+
+    def test_skewed_clocks_stay_within_rate(self):
+        """Test that alternating clocks with different offsets add no tokens."""
+        ahead = FakeClock()
+        ahead.now += 10
+        first = SharedQuota(self.path, rate=1.0, burst=5, clock=ahead, writer="a")
+        second = SharedQuota(self.path, rate=1.0, burst=5, clock=self.clock, writer="b")
+
+        granted = 0
+        for _ in range(20):
+            granted += first.acquire() == 0.0
+            granted += second.acquire() == 0.0
+            ahead.now += 1
+            self.clock.now += 1
+
+        self.assertLessEqual(granted, 5 + 20)
+
+    def test_idle_fast_clock_does_not_freeze_bucket(self):
+        """Test that a host behind an idle writer's clock still gets tokens."""
+        ahead = FakeClock()
+        ahead.now += 3600
+        fast = SharedQuota(self.path, rate=1.0, burst=2, clock=ahead, writer="fast")
+        slow = SharedQuota(
+            self.path, rate=1.0, burst=2, clock=self.clock, writer="slow"
+        )
+        fast.acquire()
+        fast.acquire()
+
+        granted = 0
+        for _ in range(120):
+            granted += slow.acquire() == 0.0
+            self.clock.now += 1
+
+        self.assertGreaterEqual(granted, 110)
+        self.assertLessEqual(granted, 2 + 120)
+
+    def test_rejects_invalid_rate(self):
+        """Test that a quota without a positive rate is refused."""
+        with self.assertRaises(ValueError):
+            SharedQuota(self.path, rate=0)
+
+    def test_limiter_waits_for_quota_token(self):
+        """Test that the limiter draws from the quota and is cancellable."""
+        quota = SharedQuota(self.path, rate=1 / 60)
+        limiter = RateLimiter(min_interval=0, quota=quota)
+        other = RateLimiter(min_interval=0, quota=quota)
+        token = CancellationToken()
+
+        self.assertTrue(limiter.wait(token))
+        token.cancel()
+
+        self.assertFalse(other.wait(token))
+
+
+if __name__ == "__main__":
+    unittest.main()
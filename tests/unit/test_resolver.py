@@ -0,0 +1,213 @@
+import importlib
+import importlib.machinery
+import importlib.util
+import os
+import sys
+import tempfile
+import unittest
+
+from persistent_cache import PersistentCache
+
+PLUGIN_DIR = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+PLUGIN_PACKAGE = "inaturalist_plugin"
+
+
+def load_plugin_module(name):
+    """Import a plugin module with relative imports, without the plugin entry point."""
+    if PLUGIN_PACKAGE not in sys.modules:
+        spec = importlib.machinery.ModuleSpec(PLUGIN_PACKAGE, None, is_package=True)
+        package = importlib.util.module_from_spec(spec)
+        package.__path__ = [PLUGIN_DIR]
+        sys.modules[PLUGIN_PACKAGE] = package
+    return importlib.import_module(f"{PLUGIN_PACKAGE}.{name}")
+
+
+resolver = load_plugin_module("resolver")
+value_lists = load_plugin_module("value_lists")
+exceptions = load_plugin_module("exceptions")
+form_data = load_plugin_module("form_data")
+
+
+class FakeClient:
+    """HTTP client answering autocomplete queries from canned results."""
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.queries = []
+
+    def __call__(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def get(self, url, params=None):
+        query = params["q"]
+        self.queries.append(query)
+        response = self.responses.get(query, [])
+        if isinstance(response, Exception):
+            raise response
+        return {"results": response}
+
+
+TAXA = {
+    "Strix": [
+        {"id": 19897, "name": "Strix Aluco Group", "matched_term": "Strix"},
+        {"id": 19898, "name": "Strix aluco", "matched_term": "Strix"},
+    ],
+    "Tawny owl": [{"id": 19898, "name": "Strix aluco", "matched_term": "Tawny Owl"}],
+    "owl": [
+        {"id": 19898, "name": "Strix aluco", "matched_term": "Tawny Owl"},
+        {"id": 19350, "name": "Tyto alba", "matched_term": "Barn Owl"},
+    ],
+    "Strix alu": [{"id": 19898, "name": "Strix aluco", "matched_term": "Strix aluco"}],
+}
+USERS = {
+    "javi": [
+        {"id": 2, "login": "javikalsan"},
+        {"id": 1, "login": "Javi"},
+    ],
+}
+PLACES = {
+    "Catalonia": [
+        {"id": 10, "name": "Catalonia Coast", "display_name": "Catalonia Coast, ES"},
+        {"id": 11, "name": "Catalunya", "display_name": "Catalonia"},
+    ],
+    "Barcelona": [{"id": 20, "name": "Barcelona Province"}],
+}
+
+
+class ResolverTestCase(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.temp_dir.name, "cache.sqlite")
+        self.client = FakeClient({**TAXA, **USERS, **PLACES})
+        self.resolver = self.make_resolver()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def make_resolver(self):
+        return resolver.IdResolver(
+            PersistentCache(self.cache_path, ttl=60), client_factory=self.client
+        )
+
+
+class TestIdResolver(ResolverTestCase):
+    """Test cases for IdResolver."""
+
+    def test_taxon_matches_scientific_or_common_name(self):
+        """Test that a taxon is chosen by its exact name or matched term."""
+        self.client.responses["STRIX ALUCO"] = TAXA["Strix"]
+
+        self.assertEqual(self.resolver.resolve_taxon(" STRIX ALUCO "), 19898)
+        self.assertEqual(self.resolver.resolve_taxon("Tawny owl"), 19898)
+
+    def test_ambiguous_taxon_name_takes_exact_match_only(self):
+        """Test that prefix matches are skipped and no match gives None."""
+        self.assertIsNone(self.resolver.resolve_taxon("Strix alu"))
+        self.assertIsNone(self.resolver.resolve_taxon("owl"))
+
+    def test_taxon_prefers_exact_name_over_earlier_results(self):
+        """Test that the exact match wins over the first result."""
+        self.client.responses["Strix aluco"] = TAXA["Strix"]
+
+        self.assertEqual(self.resolver.resolve_taxon("Strix aluco"), 19898)
+
+    def test_user_matches_exact_login(self):
+        """Test that users are matched by their whole login, ignoring case."""
+        self.assertEqual(self.resolver.resolve_user("javi"), 1)
+        self.assertIsNone(self.resolver.resolve_user("jav"))
+
+    def test_place_requires_exact_name(self):
+        """Test that places match by name or display name, never by prefix."""
+        self.assertEqual(self.resolver.resolve_place("Catalonia"), 11)
+        self.assertIsNone(self.resolver.resolve_place("Barcelona"))
+
+    def test_hits_and_misses_are_cached_across_instances(self):
+        """Test that resolved ids and missing names are not requested again."""
+        self.resolver.resolve_taxon("Tawny owl")
+        self.resolver.resolve_taxon("owl")
+
+        other = self.make_resolver()
+
+        self.assertEqual(other.resolve_taxon("tawny OWL"), 19898)
+        self.assertIsNone(other.resolve_taxon("owl"))
+        self.assertEqual(self.client.queries, ["Tawny owl", "owl"])
+
+    def test_api_errors_are_not_cached(self):
+        """Test that a failed lookup gives None and is retried later."""
+        self.client.responses["Tawny owl"] = exceptions.InaturalistAPIError("down")
+
+        self.assertIsNone(self.resolver.resolve_taxon("Tawny owl"))
+
+        self.client.responses["Tawny owl"] = TAXA["Tawny owl"]
+        self.assertEqual(self.resolver.resolve_taxon("Tawny owl"), 19898)
+        self.assertEqual(self.client.queries, ["Tawny owl", "Tawny owl"])
+
+    def test_blank_names_are_not_requested(self):
+        """Test that empty input resolves to None without a request."""
+        self.assertIsNone(self.resolver.resolve_taxon("  "))
+        self.assertEqual(self.client.queries, [])
+
+    def test_before_request_runs_only_for_uncached_lookups(self):
+        """Test that the pacing callback precedes each request."""
+        calls = []
+
+        self.resolver.resolve_taxon("Tawny owl", lambda: calls.append(1))
+        self.resolver.resolve_taxon("Tawny owl", lambda: calls.append(1))
+
+        self.assertEqual(calls, [1])
+
+    def test_resolve_list_passes_numeric_ids_through(self):
+        """Test that numeric entries are ids and duplicates keep the first entry."""
+        resolved, unresolved = self.resolver.resolve_list(
+            ["42", "Tawny owl", "Strix aluco", "owl"], self.resolver.resolve_taxon
+        )
+
+        self.assertEqual(resolved, {42: "42", 19898: "Tawny owl"})
+        self.assertEqual(unresolved, ["Strix aluco", "owl"])
+        self.assertNotIn("42", self.client.queries)
+
+
+class TestValueLists(ResolverTestCase):
+    """Test cases for ValueLists.resolve."""
+
+    def make_lists(self, **lists):
+        return value_lists.ValueLists(
+            form_data.FormData(None, None, None, None, None, None),
+            self.resolver,
+            **lists,
+        )
+
+    def test_resolves_lists_into_queries_and_sources(self):
+        """Test that the lists become id parameters and source labels."""
+        queries, sources = self.make_lists(
+            species=["Tawny owl", "19350"], users=["javi"], places=["Catalonia"]
+        ).resolve()
+
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(queries[0]["taxon_id"], "19898,19350")
+        self.assertEqual(queries[0]["user_id"], "1")
+        self.assertEqual(queries[0]["place_id"], "11")
+        self.assertEqual(sources.taxa, {19898: "Tawny owl", 19350: "19350"})
+        self.assertEqual(sources.users, {1: "javi"})
+        self.assertEqual(sources.places, {11: "Catalonia"})
+
+    def test_unknown_names_raise(self):
+        """Test that every name without an exact match is reported."""
+        lists = self.make_lists(species=["owl"], places=["Barcelona", "Catalonia"])
+
+        with self.assertRaises(ValueError) as raised:
+            lists.resolve()
+
+        self.assertEqual(str(raised.exception), "Could not find: owl, Barcelona.")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import random
+import unittest
+
+from sampling import SampleStratum, estimate_fetch_seconds, format_duration, plan_sample
+
+AREAS = [
+    {"swlat": 0.0, "swlng": 0.0, "nelat": 1.0, "nelng": 1.0},
+    {"swlat": 1.0, "swlng": 0.0, "nelat": 2.0, "nelng": 1.0},
+]
+
+
+class TestPlanSample(unittest.TestCase):
+    """Test cases for plan_sample."""
+
+    def test_strata_cross_id_ranges_with_areas(self):
+        """Test that every id range is requested in every area."""
+        strata = plan_sample(1, 100, 80, AREAS, time_strata=4)
+
+        self.assertEqual(len(strata), 8)
+        self.assertEqual([stratum.id_below for stratum in strata[:2]], [26, 26])
+        self.assertEqual([stratum.bbox for stratum in strata[:2]], AREAS)
+        self.assertTrue(all(stratum.per_page == 10 for stratum in strata))
+
+    def test_windows_start_inside_their_id_range(self):
+        """Test that every window starts within its range and holds an id."""
+        for seed in range(50):
+            strata = plan_sample(
+                1000, 5321, 400, AREAS[:1], time_strata=4, rng=random.Random(seed)
+            )
+
+            self.assertEqual(strata[-1].id_below, 5322)
+            range_above = 999
+            for stratum in strata:
+                self.assertGreaterEqual(stratum.id_above, range_above)
+                self.assertLess(stratum.id_above, stratum.id_below - 1)
+                range_above = stratum.id_below - 1
+
+    def test_windows_are_spread_within_their_range(self):
+        """Test that windows do not all start at the earliest uploads."""
+        rng = random.Random(7)
+        starts = [
+            plan_sample(1, 1000, 10, AREAS[:1], time_strata=1, rng=rng)[0].id_above
+            for _ in range(200)
+        ]
+
+        self.assertLess(min(starts), 100)
+        self.assertGreater(max(starts), 900)
+
+    def test_areas_get_their_own_offsets(self):
+        """Test that areas of one id range start at independent offsets."""
+        strata = plan_sample(1, 10**6, 80, AREAS, time_strata=1, rng=random.Random(3))
+
+        self.assertNotEqual(strata[0].id_above, strata[1].id_above)
+
+    def test_page_size_is_capped(self):
+        """Test that per-request page size stays within the API limit."""
+        strata = plan_sample(1, 10**6, 5000, AREAS[:1], max_per_page=200)
+
+        self.assertTrue(all(stratum.per_page == 200 for stratum in strata))
+
+    def test_small_id_range_reduces_strata(self):
+        """Test that a range narrower than the strata count is not over-split."""
+        strata = plan_sample(7, 8, 10, AREAS[:1], time_strata=4)
+
+        self.assertEqual(
+            strata, [SampleStratum(6, 8, AREAS[0], 5), SampleStratum(7, 9, AREAS[0], 5)]
+        )
+
+    def test_empty_inputs(self):
+        """Test that empty ranges, areas or sample sizes plan nothing."""
+        self.assertEqual(plan_sample(10, 5, 10, AREAS), [])
+        self.assertEqual(plan_sample(1, 5, 0, AREAS), [])
+        self.assertEqual(plan_sample(1, 5, 10, []), [])
+
+
+class TestEstimates(unittest.TestCase):
+    """Test cases for download time estimates."""
+
+    def test_estimate_uses_slower_of_interval_and_latency(self):
+        """Test that pages are paced by the rate limit or the latency."""
+        self.assertEqual(estimate_fetch_seconds(1000, 200, 1.5, 0.5), 7.5)
+        self.assertEqual(estimate_fetch_seconds(1000, 200, 1.5, 3.0), 15.0)
+
+    def test_format_duration(self):
+        """Test that durations are rounded up to minutes."""
+        self.assertEqual(format_duration(10), "1 min")
+        self.assertEqual(format_duration(59 * 60), "59 min")
+        self.assertEqual(format_duration(2 * 3600 + 5 * 60), "2 h 5 min")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+
+from summary_parser import (
+    HistogramBin,
+    SpeciesCount,
+    SummaryParser,
+    year_windows,
+    years_with_observations,
+)
+
+
+class TestSummaryParser(unittest.TestCase):
+    """Test cases for SummaryParser."""
+
+    def test_parse_species_counts(self):
+        """Test that taxon details and counts are extracted."""
+        results = [
+            {
+                "count": 42,
+                "taxon": {
+                    "id": 19898,
+                    "name": "Strix aluco",
+                    "preferred_common_name": "Tawny Owl",
+                    "rank": "species",
+                    "iconic_taxon_name": "Aves",
+                },
+            }
+        ]
+
+        self.assertEqual(
+            SummaryParser.parse_species_counts(results),
+            [SpeciesCount(19898, "Strix aluco", "Tawny Owl", "species", "Aves", 42)],
+        )
+
+    def test_parse_species_counts_with_missing_taxon(self):
+        """Test that results without taxon details are kept with empty fields."""
+        counts = SummaryParser.parse_species_counts([{"count": 3, "taxon": None}])
+
+        self.assertEqual(counts, [SpeciesCount(None, None, None, None, None, 3)])
+
+    def test_parse_histogram(self):
+        """Test that bins of the requested interval are returned in period order."""
+        results = {"month": {"2021-02-01": 5, "2021-01-01": 0, "2020-12-01": None}}
+
+        self.assertEqual(
+            SummaryParser.parse_histogram(results, "month"),
+            [
+                HistogramBin("month", "2020-12-01", 0),
+                HistogramBin("month", "2021-01-01", 0),
+                HistogramBin("month", "2021-02-01", 5),
+            ],
+        )
+        self.assertEqual(SummaryParser.parse_histogram(results, "week"), [])
+        self.assertEqual(SummaryParser.parse_histogram(None, "month"), [])
+
+
+class TestDayHistogramPlan(unittest.TestCase):
+    """Test cases for splitting day histograms into yearly requests."""
+
+    def test_years_with_observations(self):
+        """Test that only years with a non-zero bin are kept."""
+        bins = [
+            HistogramBin("month", "2019-05-01", 0),
+            HistogramBin("month", "2020-03-01", 2),
+            HistogramBin("month", "2020-04-01", 1),
+            HistogramBin("month", "2022-01-01", 7),
+        ]
+
+        self.assertEqual(years_with_observations(bins), [2020, 2022])
+
+    def test_year_windows_are_clipped_to_the_query_range(self):
+        """Test that the first and last windows start and end with the query."""
+        self.assertEqual(
+            year_windows([2020, 2021, 2022], "2020-06-15", "2022-03-01"),
+            [
+                ("2020-06-15", "2020-12-31"),
+                ("2021-01-01", "2021-12-31"),
+                ("2022-01-01", "2022-03-01"),
+            ],
+        )
+        self.assertEqual(
+            year_windows([2019, 2020], "2020-01-01", None),
+            [("2020-01-01", "2020-12-31")],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
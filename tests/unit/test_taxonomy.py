@@ -0,0 +1,131 @@
+import importlib
+import importlib.machinery
+import importlib.util
+import os
+import sys
+import tempfile
+import unittest
+
+from observation_parser import ObservationRecord
+from persistent_cache import PersistentCache
+
+PLUGIN_DIR = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+PLUGIN_PACKAGE = "inaturalist_plugin"
+
+
+def load_plugin_module(name):
+    """Import a plugin module with relative imports, without the plugin entry point."""
+    if PLUGIN_PACKAGE not in sys.modules:
+        spec = importlib.machinery.ModuleSpec(PLUGIN_PACKAGE, None, is_package=True)
+        package = importlib.util.module_from_spec(spec)
+        package.__path__ = [PLUGIN_DIR]
+        sys.modules[PLUGIN_PACKAGE] = package
+    return importlib.import_module(f"{PLUGIN_PACKAGE}.{name}")
+
+
+taxonomy = load_plugin_module("taxonomy")
+
+# Ids from this one on are unknown to the fake taxa endpoint.
+UNKNOWN_TAXON_ID = 1000
+
+
+class FakeTaxaClient:
+    """Answers /taxa/{ids} requests with a genus lineage per known id."""
+
+    def __init__(self):
+        self.requested_ids = []
+
+    def get(self, url, params=None):
+        ids = [int(id_) for id_ in url.rsplit("/", 1)[1].split(",")]
+        self.requested_ids.append(ids)
+        return {
+            "results": [
+                {
+                    "id": taxon_id,
+                    "rank": "species",
+                    "name": f"Genus{taxon_id} species",
+                    "ancestors": [
+                        {"rank": "kingdom", "name": "Animalia"},
+                        {"rank": "genus", "name": f"Genus{taxon_id}"},
+                    ],
+                }
+                for taxon_id in ids
+                if taxon_id < UNKNOWN_TAXON_ID
+            ]
+        }
+
+
+class TestTaxonomyResolver(unittest.TestCase):
+    """Test cases for TaxonomyResolver."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.temp_dir.name, "cache.sqlite")
+        self.client = FakeTaxaClient()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def make_resolver(self):
+        return taxonomy.TaxonomyResolver(PersistentCache(self.cache_path, ttl=60))
+
+    def test_lineages_are_fetched_once_across_runs(self):
+        """Test that a second resolver on the same cache makes no requests."""
+        first = self.make_resolver().resolve(self.client, [3, 1, 2, 1])
+        second = self.make_resolver().resolve(self.client, [1, 2, 3])
+
+        self.assertEqual(self.client.requested_ids, [[1, 2, 3]])
+        self.assertEqual(first, second)
+        self.assertEqual(first[2]["genus"], "Genus2")
+
+    def test_only_uncached_taxa_are_requested(self):
+        """Test that a later run requests just the taxa it has not seen."""
+        self.make_resolver().resolve(self.client, [1, 2])
+        self.make_resolver().resolve(self.client, [2, 3])
+
+        self.assertEqual(self.client.requested_ids, [[1, 2], [3]])
+
+    def test_requests_are_batched_by_the_api_limit(self):
+        """Test that missing taxa are requested 30 ids at a time."""
+        calls = []
+
+        lineages = self.make_resolver().resolve(
+            self.client, range(1, 66), lambda: calls.append(1)
+        )
+
+        self.assertEqual([len(ids) for ids in self.client.requested_ids], [30, 30, 5])
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(len(lineages), 65)
+
+    def test_unknown_taxa_are_cached_empty(self):
+        """Test that taxa the API does not return are not requested again."""
+        first = self.make_resolver().resolve(self.client, [UNKNOWN_TAXON_ID])
+        second = self.make_resolver().resolve(self.client, [UNKNOWN_TAXON_ID])
+
+        self.assertEqual(len(self.client.requested_ids), 1)
+        empty = {"kingdom": None, "order": None, "family": None, "genus": None}
+        self.assertEqual(first, {UNKNOWN_TAXON_ID: empty})
+        self.assertEqual(second, first)
+
+    def test_enrich_sets_ranks_of_records(self):
+        """Test that records get their lineage and records without taxon none."""
+        records = [
+            ObservationRecord(1, 0.0, 0.0, taxon_id=7),
+            ObservationRecord(2, 0.0, 0.0),
+            ObservationRecord(3, 0.0, 0.0, taxon_id=7),
+        ]
+
+        self.make_resolver().enrich(self.client, records)
+
+        self.assertEqual(self.client.requested_ids, [[7]])
+        self.assertEqual(
+            [record.genus for record in records], ["Genus7", None, "Genus7"]
+        )
+        self.assertEqual(records[0].kingdom, "Animalia")
+        self.assertIsNone(records[0].family)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+
+from taxonomy_parser import TAXONOMY_RANKS, TaxonomyParser
+
+
+class TestTaxonomyParser(unittest.TestCase):
+    """Test cases for TaxonomyParser."""
+
+    def test_parse_lineage_from_ancestors(self):
+        """Test that the kept ranks are taken from the ancestors."""
+        taxon = {
+            "id": 19898,
+            "name": "Strix aluco",
+            "rank": "species",
+            "ancestors": [
+                {"id": 1, "name": "Animalia", "rank": "kingdom"},
+                {"id": 3, "name": "Aves", "rank": "class"},
+                {"id": 19350, "name": "Strigiformes", "rank": "order"},
+                {"id": 19376, "name": "Strigidae", "rank": "family"},
+                {"id": 19897, "name": "Strix", "rank": "genus"},
+            ],
+        }
+
+        self.assertEqual(
+            TaxonomyParser.parse_lineage(taxon),
+            {
+                "kingdom": "Animalia",
+                "order": "Strigiformes",
+                "family": "Strigidae",
+                "genus": "Strix",
+            },
+        )
+
+    def test_parse_lineage_uses_own_rank(self):
+        """Test that a taxon of a kept rank fills that rank itself."""
+        taxon = {
+            "id": 19897,
+            "name": "Strix",
+            "rank": "genus",
+            "ancestors": [{"id": 1, "name": "Animalia", "rank": "kingdom"}],
+        }
+
+        lineage = TaxonomyParser.parse_lineage(taxon)
+
+        self.assertEqual(lineage["genus"], "Strix")
+        self.assertIsNone(lineage["family"])
+
+    def test_parse_lineage_without_ancestors(self):
+        """Test that every rank is None when nothing is known."""
+        self.assertEqual(
+            TaxonomyParser.parse_lineage({"id": 48460, "rank": "stateofmatter"}),
+            dict.fromkeys(TAXONOMY_RANKS),
+        )
+
+    def test_parse_lineages_keys_by_id(self):
+        """Test that taxa are keyed by id and taxa without id are skipped."""
+        taxa = [
+            {"id": 47125, "name": "Rosaceae", "rank": "family"},
+            {"name": "Orphan", "rank": "genus"},
+        ]
+
+        lineages = TaxonomyParser.parse_lineages(taxa)
+
+        self.assertEqual(list(lineages), [47125])
+        self.assertEqual(lineages[47125]["family"], "Rosaceae")
+
+
+if __name__ == "__main__":
+    unittest.main()
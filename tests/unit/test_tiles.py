@@ -0,0 +1,113 @@
+import unittest
+
+from tiles import Tile, TileCache, tile_for_point, tiles_for_bbox, zoom_for_bbox
+
+
+class TestTiles(unittest.TestCase):
+    """Test cases for z/x/y tile helpers."""
+
+    def test_zoom_zero_has_one_tile(self):
+        """Test that the whole world is a single tile at zoom 0."""
+        self.assertEqual(tile_for_point(-179.9, 80.0, 0), (0, 0))
+        self.assertEqual(tile_for_point(179.9, -80.0, 0), (0, 0))
+
+    def test_tile_for_point_quadrants(self):
+        """Test tile indices at zoom 1 for each quadrant."""
+        self.assertEqual(tile_for_point(-90.0, 45.0, 1), (0, 0))
+        self.assertEqual(tile_for_point(90.0, 45.0, 1), (1, 0))
+        self.assertEqual(tile_for_point(-90.0, -45.0, 1), (0, 1))
+        self.assertEqual(tile_for_point(90.0, -45.0, 1), (1, 1))
+
+    def test_tile_bbox_round_trip(self):
+        """Test that a tile bbox contains the point it was computed from."""
+        x, y = tile_for_point(-1.64, 42.81, 10)
+
+        bbox = Tile(10, x, y).bbox()
+
+        self.assertLessEqual(bbox["swlng"], -1.64)
+        self.assertGreaterEqual(bbox["nelng"], -1.64)
+        self.assertLessEqual(bbox["swlat"], 42.81)
+        self.assertGreaterEqual(bbox["nelat"], 42.81)
+
+    def test_tiles_for_bbox(self):
+        """Test that a bbox spanning two tiles returns both."""
+        bbox = {"swlat": 10.0, "swlng": -10.0, "nelat": 20.0, "nelng": 10.0}
+
+        tiles = tiles_for_bbox(bbox, 1)
+
+        self.assertEqual(tiles, [Tile(1, 0, 0), Tile(1, 1, 0)])
+
+    def test_zoom_for_bbox_limits_tile_count(self):
+        """Test that the chosen zoom keeps the tile count under the limit."""
+        bbox = {"swlat": 42.0, "swlng": -2.0, "nelat": 43.0, "nelng": -1.0}
+
+        zoom = zoom_for_bbox(bbox, max_tiles=4)
+
+        self.assertLessEqual(len(tiles_for_bbox(bbox, zoom)), 4)
+        self.assertGreater(len(tiles_for_bbox(bbox, zoom + 1)), 4)
+
+    def test_parent_tile(self):
+        """Test parent tile computation."""
+        self.assertEqual(Tile(3, 5, 6).parent(), Tile(2, 2, 3))
+        self.assertIsNone(Tile(0, 0, 0).parent())
+
+
+class TestTileCache(unittest.TestCase):
+    """Test cases for TileCache."""
+
+    def test_missing_tiles(self):
+        """Test that only tiles not loaded for the filters are missing."""
+        cache = TileCache(max_entries=10)
+        cache.add("filters", Tile(5, 1, 1))
+
+        missing = cache.missing("filters", [Tile(5, 1, 1), Tile(5, 1, 2)])
+
+        self.assertEqual(missing, [Tile(5, 1, 2)])
+
+    def test_filters_are_isolated(self):
+        """Test that tiles loaded for other filters are not reused."""
+        cache = TileCache(max_entries=10)
+        cache.add("species=a", Tile(5, 1, 1))
+
+        self.assertFalse(cache.is_loaded("species=b", Tile(5, 1, 1)))
+
+    def test_loaded_ancestor_covers_children(self):
+        """Test that a loaded parent tile covers its children."""
+        cache = TileCache(max_entries=10)
+        cache.add("filters", Tile(4, 2, 3))
+
+        self.assertTrue(cache.is_loaded("filters", Tile(5, 5, 7)))
+        self.assertFalse(cache.is_loaded("filters", Tile(3, 1, 1)))
+
+    def test_truncated_tile_does_not_cover_children(self):
+        """Test that a tile cut off at the page limit leaves its children missing."""
+        cache = TileCache(max_entries=10)
+        cache.add("filters", Tile(4, 2, 3), complete=False)
+
+        self.assertTrue(cache.is_loaded("filters", Tile(4, 2, 3)))
+        self.assertFalse(cache.is_loaded("filters", Tile(5, 5, 7)))
+        self.assertFalse(cache.is_loaded("filters", Tile(6, 10, 14)))
+
+    def test_complete_ancestor_above_truncated_tile_covers_it(self):
+        """Test that a complete ancestor still covers a truncated descendant."""
+        cache = TileCache(max_entries=10)
+        cache.add("filters", Tile(3, 1, 1))
+        cache.add("filters", Tile(4, 2, 3), complete=False)
+
+        self.assertTrue(cache.is_loaded("filters", Tile(5, 5, 7)))
+
+    def test_least_recently_used_tile_is_evicted(self):
+        """Test LRU eviction once the cache is full."""
+        cache = TileCache(max_entries=2)
+        cache.add("filters", Tile(5, 0, 0))
+        cache.add("filters", Tile(5, 0, 1))
+        cache.is_loaded("filters", Tile(5, 0, 0))
+        cache.add("filters", Tile(5, 0, 2))
+
+        self.assertEqual(len(cache), 2)
+        self.assertTrue(cache.is_loaded("filters", Tile(5, 0, 0)))
+        self.assertFalse(cache.is_loaded("filters", Tile(5, 0, 1)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,207 @@
+import gzip
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from transport import (
+    RecordingTransport,
+    ReplayTransport,
+    RequestHandle,
+    Transport,
+    TransportMetrics,
+    read_cassette,
+)
+
+ROOT_URL = "https://api.inaturalist.org"
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.path.startswith("/v1/hang"):
+            time.sleep(5)
+        body = json.dumps(
+            {
+                "path": self.path,
+                "user_agent": self.headers.get("User-Agent"),
+                "accept_encoding": self.headers.get("Accept-Encoding"),
+            }
+        ).encode("utf-8")
+        body = gzip.compress(body)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestTransport(unittest.TestCase):
+    """Test cases for Transport against a local stand-in server."""
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}/"
+        self.transport = Transport(
+            ROOT_URL, base_url=self.base_url, user_agent="test-agent"
+        )
+
+    def tearDown(self):
+        self.transport.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_url_redirects_api_root_to_base_url(self):
+        """Test that API URLs are rewritten and other URLs kept."""
+        self.assertEqual(
+            self.transport.url(f"{ROOT_URL}/v1/observations"),
+            f"{self.base_url.rstrip('/')}/v1/observations",
+        )
+        self.assertEqual(
+            self.transport.url("https://example.org/a"), "https://example.org/a"
+        )
+
+    def test_get_sends_headers_and_decodes_gzip(self):
+        """Test that requests carry the user agent and accept gzip."""
+        response = self.transport.get(
+            f"{ROOT_URL}/v1/observations", params={"taxon_id": 1}
+        )
+        data = response.json()
+
+        self.assertEqual(data["path"], "/v1/observations?taxon_id=1")
+        self.assertEqual(data["user_agent"], "test-agent")
+        self.assertIn("gzip", data["accept_encoding"])
+
+    def test_connections_are_reused(self):
+        """Test that sequential requests share one pooled connection."""
+        for _ in range(3):
+            self.transport.get(f"{ROOT_URL}/v1/observations").json()
+
+        metrics = self.transport.metrics()
+        self.assertEqual(metrics.requests, 3)
+        self.assertEqual(metrics.connections, 1)
+        self.assertAlmostEqual(metrics.reuse_rate, 2 / 3)
+
+    def test_abort_fails_request_in_flight(self):
+        """Test that aborting a hung request fails it at once and drops its socket."""
+        handle = RequestHandle()
+        threading.Timer(0.1, handle.abort).start()
+
+        started = time.monotonic()
+        with self.assertRaises(requests.ConnectionError):
+            self.transport.get(f"{ROOT_URL}/v1/hang", timeout=10, handle=handle)
+
+        self.assertLess(time.monotonic() - started, 2)
+        self.transport.get(f"{ROOT_URL}/v1/observations").json()
+        self.assertEqual(self.transport.metrics().connections, 2)
+
+    def test_abort_after_request_keeps_pooled_connection(self):
+        """Test that aborting a finished request leaves the connection reusable."""
+        handle = RequestHandle()
+        self.transport.get(f"{ROOT_URL}/v1/observations", handle=handle).json()
+
+        handle.abort()
+        self.transport.get(f"{ROOT_URL}/v1/observations").json()
+
+        self.assertEqual(self.transport.metrics(), TransportMetrics(2, 1))
+
+    def test_metrics_survive_close(self):
+        """Test that counters are kept after the pools are closed."""
+        self.transport.get(f"{ROOT_URL}/v1/observations").json()
+        self.transport.close()
+
+        self.assertEqual(self.transport.metrics(), TransportMetrics(1, 1))
+
+
+class TestTransportMetrics(unittest.TestCase):
+    """Test cases for TransportMetrics."""
+
+    def test_reuse_rate_without_requests(self):
+        """Test that an unused transport reports no reuse."""
+        self.assertEqual(TransportMetrics(0, 0).reuse_rate, 0.0)
+
+
+class TestCassettes(unittest.TestCase):
+    """Test cases for recording and replaying responses."""
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.transport = Transport(
+            ROOT_URL, base_url=f"http://127.0.0.1:{self.server.server_port}/"
+        )
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "cassette.jsonl.gz")
+
+    def tearDown(self):
+        self.transport.close()
+        self.server.shutdown()
+        self.server.server_close()
+        self.temp_dir.cleanup()
+
+    def record(self, *params_list):
+        recorder = RecordingTransport(self.transport, self.path)
+        return [
+            recorder.get(f"{ROOT_URL}/v1/observations", params=params).json()
+            for params in params_list
+        ]
+
+    def test_recording_keeps_metadata_and_timing(self):
+        """Test that each response is written with its request and duration."""
+        self.record({"page": 1, "taxon_id": 3})
+
+        (interaction,) = read_cassette(self.path)
+        self.assertEqual(interaction["url"], f"{ROOT_URL}/v1/observations")
+        self.assertEqual(interaction["params"], [["page", "1"], ["taxon_id", "3"]])
+        self.assertEqual(interaction["status"], 200)
+        self.assertGreaterEqual(interaction["elapsed"], 0)
+        self.assertIn("recorded_at", interaction)
+
+    def test_replay_serves_recorded_responses_offline(self):
+        """Test that replayed bodies equal the recorded ones after shutdown."""
+        recorded = self.record({"page": 1}, {"page": 2})
+        self.server.shutdown()
+
+        replay = ReplayTransport(self.path)
+        replayed = [
+            replay.get(f"{ROOT_URL}/v1/observations", params={"page": page}).json()
+            for page in (2, 1)
+        ]
+
+        self.assertEqual(replayed, [recorded[1], recorded[0]])
+        self.assertEqual(replay.metrics().requests, 2)
+
+    def test_replay_of_unrecorded_request_fails(self):
+        """Test that a request missing from the cassette fails like the network."""
+        self.record({"page": 1})
+
+        with self.assertRaises(requests.ConnectionError):
+            ReplayTransport(self.path).get(
+                f"{ROOT_URL}/v1/observations", params={"page": 9}
+            )
+
+    def test_replay_emulates_scaled_latency(self):
+        """Test that responses are delayed by the recorded duration times the scale."""
+        self.record({"page": 1})
+        elapsed = read_cassette(self.path)[0]["elapsed"]
+        delays = []
+
+        replay = ReplayTransport(self.path, latency_scale=2.0, sleep=delays.append)
+        replay.get(f"{ROOT_URL}/v1/observations", params={"page": 1})
+
+        self.assertEqual(delays, [elapsed * 2.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import struct
+import unittest
+
+from wkb import (
+    WKB_POINT_SIZE,
+    decode_multipoint,
+    encode_multipoint,
+    encode_point,
+    encode_points,
+    pack_coordinates,
+)
+
+
+class TestWkb(unittest.TestCase):
+    """Test cases for WKB point encoding."""
+
+    def test_pack_coordinates_interleaves_pairs(self):
+        """Test that pairs are packed as x, y doubles."""
+        self.assertEqual(
+            list(pack_coordinates([(1.5, 2.5), (-3.0, 4.0)])), [1.5, 2.5, -3.0, 4.0]
+        )
+
+    def test_encode_point(self):
+        """Test that a point is encoded as little-endian 2D WKB."""
+        blob = encode_point(2.1734, 41.3851)
+
+        self.assertEqual(blob, struct.pack("<BIdd", 1, 1, 2.1734, 41.3851))
+        self.assertEqual(len(blob), WKB_POINT_SIZE)
+
+    def test_encode_matches_per_point_wkb(self):
+        """Test that bulk encoding equals encoding each point separately."""
+        points = [(2.1734, 41.3851), (-180.0, -90.0), (179.999, 89.5)]
+
+        buffer = encode_points(pack_coordinates(points))
+
+        self.assertEqual(bytes(buffer), b"".join(encode_point(x, y) for x, y in points))
+
+    def test_encode_empty_batch(self):
+        """Test that an empty batch encodes to nothing."""
+        self.assertEqual(encode_points(pack_coordinates([])), bytearray())
+
+    def test_encode_multipoint_header(self):
+        """Test that the multipoint header precedes the encoded points."""
+        points = [(2.1734, 41.3851), (-3.0, 4.0)]
+
+        buffer = encode_multipoint(pack_coordinates(points))
+
+        self.assertEqual(buffer[:9], struct.pack("<BII", 1, 4, 2))
+        self.assertEqual(buffer[9:], encode_points(pack_coordinates(points)))
+
+    def test_decode_multipoint_round_trip(self):
+        """Test that decoding returns the encoded coordinates."""
+        coordinates = pack_coordinates([(500000.0, 4649776.2), (-1.5, 0.25)])
+
+        self.assertEqual(decode_multipoint(encode_multipoint(coordinates)), coordinates)
+
+    def test_decode_big_endian_multipoint(self):
+        """Test that big-endian points are read in the native byte order."""
+        buffer = struct.pack(">BII", 0, 4, 1) + struct.pack(">BIdd", 0, 1, 1.5, -2.5)
+
+        self.assertEqual(list(decode_multipoint(buffer)), [1.5, -2.5])
+
+    def test_decode_empty_multipoint(self):
+        """Test that an empty multipoint decodes to no coordinates."""
+        self.assertEqual(
+            list(decode_multipoint(encode_multipoint(pack_coordinates([])))), []
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import math
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+# Web Mercator cannot represent the poles; tiles stop at this latitude.
+MAX_LATITUDE = 85.0511287798
+
+
+@dataclass(frozen=True)
+class Tile:
+    z: int
+    x: int
+    y: int
+
+    def parent(self) -> Optional["Tile"]:
+        if self.z == 0:
+            return None
+        return Tile(self.z - 1, self.x // 2, self.y // 2)
+
+    def bbox(self) -> Dict[str, float]:
+        """Return the tile bounds as iNaturalist bounding box parameters."""
+        return {
+            "swlat": tile_latitude(self.y + 1, self.z),
+            "swlng": tile_longitude(self.x, self.z),
+            "nelat": tile_latitude(self.y, self.z),
+            "nelng": tile_longitude(self.x + 1, self.z),
+        }
+
+
+def tile_longitude(x: int, z: int) -> float:
+    return x / 2**z * 360.0 - 180.0
+
+
+def tile_latitude(y: int, z: int) -> float:
+    return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y / 2**z))))
+
+
+def tile_for_point(lon: float, lat: float, z: int) -> Tuple[int, int]:
+    """Return the (x, y) index of the tile containing a lon/lat point."""
+    lat = max(-MAX_LATITUDE, min(MAX_LATITUDE, lat))
+    lon = max(-180.0, min(180.0, lon))
+    n = 2**z
+    x = int((lon + 180.0) / 360.0 * n)
+    lat_radians = math.radians(lat)
+    y = int(
+        (1.0 - math.asinh(math.tan(lat_radians)) / math.pi) / 2.0 * n,
+    )
+    return (min(x, n - 1), min(y, n - 1))
+
+
+def tiles_for_bbox(bbox: Dict[str, float], z: int) -> List[Tile]:
+    """Return every tile of zoom level z intersecting the bounding box."""
+    min_x, min_y = tile_for_point(bbox["swlng"], bbox["nelat"], z)
+    max_x, max_y = tile_for_point(bbox["nelng"], bbox["swlat"], z)
+    return [
+        Tile(z, x, y) for x in range(min_x, max_x + 1) for y in range(min_y, max_y + 1)
+    ]
+
+
+def zoom_for_bbox(
+    bbox: Dict[str, float], max_tiles: int, min_zoom: int = 2, max_zoom: int = 14
+) -> int:
+    """Return the deepest zoom level covering the bbox with at most max_tiles."""
+    for z in range(max_zoom, min_zoom - 1, -1):
+        if len(tiles_for_bbox(bbox, z)) <= max_tiles:
+            return z
+    return min_zoom
+
+
+class TileCache:
+    """
+    Least-recently-used record of tiles already loaded for a set of filters.
+
+    A tile counts as loaded when it was fetched for the same filters, or
+    when one of its ancestors was fetched completely. Tiles cut off at the
+    page limit only count for themselves, so zooming in fetches their
+    children instead of leaving the missing observations out.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        # Whether each tile was fetched completely.
+        self._entries: "OrderedDict[Tuple[Hashable, Tile], bool]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, filters_key: Hashable, tile: Tile, complete: bool = True) -> None:
+        key = (filters_key, tile)
+        self._entries[key] = complete
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def is_loaded(self, filters_key: Hashable, tile: Tile) -> bool:
+        current: Optional[Tile] = tile
+        while current is not None:
+            key = (filters_key, current)
+            if key in self._entries and (current == tile or self._entries[key]):
+                self._entries.move_to_end(key)
+                return True
+            current = current.parent()
+        return False
+
+    def missing(self, filters_key: Hashable, tiles: Iterable[Tile]) -> List[Tile]:
+        return [tile for tile in tiles if not self.is_loaded(filters_key, tile)]
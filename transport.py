@@ -0,0 +1,340 @@
+import gzip
+import json
+import socket
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+# Handle of the request the current thread is sending, if any.
+_in_flight = threading.local()
+
+
+@dataclass(frozen=True)
+class TransportMetrics:
+    """Connection pool counters of a transport."""
+
+    requests: int
+    connections: int
+
+    @property
+    def reused_requests(self) -> int:
+        return max(self.requests - self.connections, 0)
+
+    @property
+    def reuse_rate(self) -> float:
+        """Share of requests sent on an already open connection."""
+        if self.requests == 0:
+            return 0.0
+        return self.reused_requests / self.requests
+
+
+class RequestHandle:
+    """
+    Lets another thread abort one request while it is in flight.
+
+    The transport attaches the pooled connection a request is sent on, and
+    aborting shuts its socket down, so the blocked request fails at once
+    and urllib3 discards the connection instead of returning it to the
+    pool. Once the request has finished, aborting does nothing.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._connection: Optional[HTTPConnection] = None
+        self.aborted = False
+
+    def attach(self, connection: HTTPConnection) -> None:
+        with self._lock:
+            self._connection = connection
+            if self.aborted:
+                shutdown_socket(connection)
+
+    def detach(self) -> None:
+        with self._lock:
+            self._connection = None
+
+    def abort(self) -> None:
+        with self._lock:
+            self.aborted = True
+            if self._connection is not None:
+                shutdown_socket(self._connection)
+
+
+def shutdown_socket(connection: HTTPConnection) -> None:
+    sock = connection.sock
+    if sock is None:
+        return
+    try:
+        sock.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        pass
+
+
+class AbortableConnectionMixin:
+    """Attaches the connection to the handle of the request being sent."""
+
+    def connect(self) -> None:
+        super().connect()  # type: ignore[misc]
+        handle: Optional[RequestHandle] = getattr(_in_flight, "handle", None)
+        if handle is not None and handle.aborted:
+            shutdown_socket(self)  # type: ignore[arg-type]
+
+    def request(self, *args: Any, **kwargs: Any) -> None:
+        handle: Optional[RequestHandle] = getattr(_in_flight, "handle", None)
+        if handle is not None:
+            handle.attach(self)  # type: ignore[arg-type]
+        super().request(*args, **kwargs)  # type: ignore[misc]
+
+
+class AbortableHTTPConnection(AbortableConnectionMixin, HTTPConnection):
+    pass
+
+
+class AbortableHTTPSConnection(AbortableConnectionMixin, HTTPSConnection):
+    pass
+
+
+class AbortableHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = AbortableHTTPConnection
+
+
+class AbortableHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = AbortableHTTPSConnection
+
+
+class AbortableAdapter(HTTPAdapter):
+    """HTTPAdapter whose pooled connections can be aborted by RequestHandle."""
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": AbortableHTTPConnectionPool,
+            "https": AbortableHTTPSConnectionPool,
+        }
+
+
+class Transport:
+    """
+    Long-lived pooled HTTP session shared by every API call.
+
+    Connections are kept alive between requests so only the first request
+    to a host pays for the TLS handshake. URLs under ``root_url`` can be
+    redirected to ``base_url``, which lets tests point the plugin at a
+    local stand-in server.
+    """
+
+    def __init__(
+        self,
+        root_url: str,
+        base_url: Optional[str] = None,
+        user_agent: Optional[str] = None,
+        pool_maxsize: int = 10,
+    ) -> None:
+        self.root_url = root_url.rstrip("/")
+        self.base_url = base_url.rstrip("/") if base_url else None
+
+        self.adapter = AbortableAdapter(
+            pool_connections=4, pool_maxsize=pool_maxsize, pool_block=False
+        )
+        self.session = requests.Session()
+        self.session.mount("https://", self.adapter)
+        self.session.mount("http://", self.adapter)
+        self.session.headers.update(
+            {"Accept-Encoding": "gzip, deflate", "Connection": "keep-alive"}
+        )
+        if user_agent:
+            self.session.headers["User-Agent"] = user_agent
+
+        self._lock = threading.Lock()
+        self._closed_requests = 0
+        self._closed_connections = 0
+
+    def url(self, url: str) -> str:
+        """Return the URL to request, redirected to base_url when set."""
+        if self.base_url and url.startswith(self.root_url):
+            return self.base_url + url[len(self.root_url) :]
+        return url
+
+    def get(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: float = 10,
+        handle: Optional[RequestHandle] = None,
+    ) -> requests.Response:
+        """Send a GET request; aborting the handle makes it fail at once."""
+        if handle is None:
+            return self.session.get(self.url(url), params=params, timeout=timeout)
+
+        _in_flight.handle = handle
+        try:
+            return self.session.get(self.url(url), params=params, timeout=timeout)
+        finally:
+            _in_flight.handle = None
+            handle.detach()
+
+    def metrics(self) -> TransportMetrics:
+        """Return request and connection counts across all host pools."""
+        requests_count = self._closed_requests
+        connections = self._closed_connections
+        pools = self.adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is not None:
+                requests_count += pool.num_requests
+                connections += pool.num_connections
+        return TransportMetrics(requests_count, connections)
+
+    def close(self) -> None:
+        with self._lock:
+            metrics = self.metrics()
+            self._closed_requests = metrics.requests
+            self._closed_connections = metrics.connections
+            self.session.close()
+
+
+def request_key(url: str, params: Optional[Dict[str, Any]]) -> Tuple[str, str]:
+    """Identify a request by URL and its sorted, stringified parameters."""
+    query = sorted((key, str(value)) for key, value in (params or {}).items())
+    return url, json.dumps(query)
+
+
+def read_cassette(path: str) -> List[Dict[str, Any]]:
+    """Read every recorded interaction of a gzip JSON Lines cassette."""
+    with gzip.open(path, "rt", encoding="utf-8") as cassette:
+        return [json.loads(line) for line in cassette if line.strip()]
+
+
+class RecordingTransport:
+    """
+    Transport wrapper appending every response to a cassette file.
+
+    Each interaction is one JSON line holding the request URL and
+    parameters, the response status, content type and body, when it was
+    recorded and how long it took. Lines are appended as gzip members, so
+    recordings from several runs can share one file.
+    """
+
+    def __init__(self, transport: Transport, path: str) -> None:
+        self.transport = transport
+        self.path = path
+        self._lock = threading.Lock()
+
+    def url(self, url: str) -> str:
+        return self.transport.url(url)
+
+    def get(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: float = 10,
+        handle: Optional[RequestHandle] = None,
+    ) -> requests.Response:
+        started_at = time.perf_counter()
+        response = self.transport.get(
+            url, params=params, timeout=timeout, handle=handle
+        )
+        elapsed = time.perf_counter() - started_at
+
+        interaction = {
+            "method": "GET",
+            "url": url,
+            "params": json.loads(request_key(url, params)[1]),
+            "status": response.status_code,
+            "content_type": response.headers.get("Content-Type", ""),
+            "body": response.text,
+            "elapsed": elapsed,
+            "recorded_at": datetime.now(timezone.utc).isoformat(),
+        }
+        line = json.dumps(interaction, ensure_ascii=False) + "\n"
+        with self._lock:
+            with gzip.open(self.path, "at", encoding="utf-8") as cassette:
+                cassette.write(line)
+        return response
+
+    def metrics(self) -> TransportMetrics:
+        return self.transport.metrics()
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+class ReplayTransport:
+    """
+    Transport serving recorded responses without network access.
+
+    Repeated requests are answered with their recordings in order, the
+    last one being reused once the others are spent. Requests that were
+    never recorded fail like an unreachable server. With a latency scale,
+    each response is delayed by its recorded duration times the scale.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        latency_scale: float = 0.0,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.path = path
+        self.latency_scale = latency_scale
+        self.sleep = sleep
+        self.interactions: Dict[Tuple[str, str], Deque[Dict[str, Any]]] = {}
+        for interaction in read_cassette(path):
+            key = (interaction["url"], json.dumps(interaction["params"]))
+            self.interactions.setdefault(key, deque()).append(interaction)
+
+        self._lock = threading.Lock()
+        self._requests = 0
+
+    def url(self, url: str) -> str:
+        return url
+
+    def get(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: float = 10,
+        handle: Optional[RequestHandle] = None,
+    ) -> requests.Response:
+        # Recorded responses never hang, so there is nothing to abort.
+        key = request_key(url, params)
+        with self._lock:
+            recordings = self.interactions.get(key)
+            if not recordings:
+                raise requests.ConnectionError(
+                    f"No recorded response for {url} with {key[1]}"
+                )
+            interaction = recordings.popleft() if len(recordings) > 1 else recordings[0]
+            self._requests += 1
+
+        if self.latency_scale > 0:
+            self.sleep(interaction.get("elapsed", 0.0) * self.latency_scale)
+        return self.build_response(interaction)
+
+    @staticmethod
+    def build_response(interaction: Dict[str, Any]) -> requests.Response:
+        response = requests.Response()
+        response.status_code = interaction["status"]
+        response.url = interaction["url"]
+        response.encoding = "utf-8"
+        response.headers["Content-Type"] = interaction.get("content_type", "")
+        response._content = interaction["body"].encode("utf-8")
+        return response
+
+    def metrics(self) -> TransportMetrics:
+        return TransportMetrics(self._requests, min(self._requests, 1))
+
+    def close(self) -> None:
+        pass
+
+
+# Anything HTTPClient can send requests through.
+AnyTransport = Union[Transport, RecordingTransport, ReplayTransport]
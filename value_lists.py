@@ -0,0 +1,69 @@
+from dataclasses import replace
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .constants import API_MAX_IDS_PER_FILTER
+from .form_data import FormData
+from .observation_parser import ObservationSources
+from .resolver import IdResolver
+
+
+class ValueLists:
+    """
+    Species, user and place lists fetched together as one union query.
+
+    Names are resolved to ids on the fetch thread, where lookups missing
+    from the resolver cache are paced like any other request, and packed
+    into comma-separated id parameters. Fetched observations are labelled
+    with the entries they match.
+    """
+
+    def __init__(
+        self,
+        form_data: FormData,
+        resolver: IdResolver,
+        species: Optional[List[str]] = None,
+        users: Optional[List[str]] = None,
+        places: Optional[List[str]] = None,
+    ) -> None:
+        self.form_data = form_data
+        self.resolver = resolver
+        self.species = species or []
+        self.users = users or []
+        self.places = places or []
+
+    def resolve(
+        self, before_request: Optional[Callable[[], None]] = None
+    ) -> Tuple[List[Dict], ObservationSources]:
+        """
+        Resolve the lists and return the packed queries and the source labels.
+
+        Args:
+            before_request: Called before each lookup request, e.g. to rate limit
+
+        Raises:
+            ValueError: If any name has no exact match, so a misspelled entry
+                is reported instead of fetching a different taxon or place
+        """
+        taxa, missing_taxa = self.resolver.resolve_list(
+            self.species, self.resolver.resolve_taxon, before_request
+        )
+        users, missing_users = self.resolver.resolve_list(
+            self.users, self.resolver.resolve_user, before_request
+        )
+        places, missing_places = self.resolver.resolve_list(
+            self.places, self.resolver.resolve_place, before_request
+        )
+        missing = missing_taxa + missing_users + missing_places
+        if missing:
+            raise ValueError(f"Could not find: {', '.join(missing)}.")
+
+        form_data = replace(
+            self.form_data,
+            taxon_ids=list(taxa) or None,
+            user_ids=list(users) or None,
+            place_ids=list(places) or None,
+        )
+        return (
+            form_data.build_queries(API_MAX_IDS_PER_FILTER),
+            ObservationSources(taxa, users, places),
+        )
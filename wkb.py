@@ -0,0 +1,78 @@
+import struct
+import sys
+from array import array
+from itertools import chain
+from typing import Iterable, Tuple
+
+WKB_POINT_SIZE = 21
+WKB_POINT_HEADER_SIZE = 5
+WKB_LITTLE_ENDIAN = 1
+WKB_POINT = 1
+WKB_MULTIPOINT = 4
+WKB_MULTIPOINT_HEADER_SIZE = 9
+WKB_POINT_STRUCT = struct.Struct("<BIdd")
+
+
+def pack_coordinates(points: Iterable[Tuple[float, float]]) -> array:
+    """Pack (x, y) pairs into one contiguous array of doubles."""
+    return array("d", chain.from_iterable(points))
+
+
+def encode_point(x: float, y: float) -> bytes:
+    """Encode one point as little-endian WKB."""
+    return WKB_POINT_STRUCT.pack(WKB_LITTLE_ENDIAN, WKB_POINT, x, y)
+
+
+def encode_points(coordinates: array) -> bytearray:
+    """
+    Encode packed coordinates as consecutive little-endian WKB points.
+
+    The buffer is filled with strided slice assignments, one per header or
+    coordinate byte, so the work per point happens in C rather than in a
+    Python loop.
+    """
+    count = len(coordinates) // 2
+    buffer = bytearray(count * WKB_POINT_SIZE)
+    if not count:
+        return buffer
+
+    if sys.byteorder != "little":
+        coordinates = array("d", coordinates)
+        coordinates.byteswap()
+    coordinate_bytes = coordinates.tobytes()
+
+    buffer[0::WKB_POINT_SIZE] = bytes([WKB_LITTLE_ENDIAN]) * count
+    buffer[1::WKB_POINT_SIZE] = bytes([WKB_POINT]) * count
+    for offset in range(16):
+        buffer[WKB_POINT_HEADER_SIZE + offset :: WKB_POINT_SIZE] = coordinate_bytes[
+            offset::16
+        ]
+    return buffer
+
+
+def encode_multipoint(coordinates: array) -> bytearray:
+    """Encode packed coordinates as one little-endian WKB multipoint."""
+    header = struct.pack(
+        "<BII", WKB_LITTLE_ENDIAN, WKB_MULTIPOINT, len(coordinates) // 2
+    )
+    return bytearray(header) + encode_points(coordinates)
+
+
+def decode_multipoint(buffer: bytes) -> array:
+    """
+    Unpack the coordinates of a 2D WKB multipoint into one array of doubles.
+
+    The inverse of encode_multipoint, again with strided slices instead of
+    a loop over the points. Points are assumed to share one byte order.
+    """
+    points = bytes(buffer)[WKB_MULTIPOINT_HEADER_SIZE:]
+    count = len(points) // WKB_POINT_SIZE
+    coordinate_bytes = bytearray(count * 16)
+    for offset in range(16):
+        coordinate_bytes[offset::16] = points[
+            WKB_POINT_HEADER_SIZE + offset :: WKB_POINT_SIZE
+        ]
+    coordinates = array("d", bytes(coordinate_bytes))
+    if count and (points[0] == WKB_LITTLE_ENDIAN) != (sys.byteorder == "little"):
+        coordinates.byteswap()
+    return coordinates